@@ -0,0 +1,91 @@
+"""
+Measures throughput and memory of the client against the local fake Cardlink API (benchmarks/fake_server.py):
+calls per second, decoded rows per second and peak memory per call of search_payment, get_bill_payments
+and create_bill, from one thread and from many threads sharing one client.
+
+Usage: PYTHONPATH=. python benchmarks/bench_client.py [--calls 200] [--rows 1000] [--threads 8]
+    [--latency 0] [--error-rate 0] [--no-validate]
+"""
+
+import time
+import argparse
+import itertools
+import tracemalloc
+import concurrent.futures
+from typing import Callable, List, Tuple, Any
+
+from cardlinky import Cardlinky
+from cardlinky.retry import Retry
+
+from fake_server import start_process
+
+
+def scenarios(client: Cardlinky) -> List[Tuple[str, Callable[[int], Any]]]:
+    return [
+        ("search_payment", lambda i: client.search_payment("SHOP")),
+        ("get_bill_payments", lambda i: client.get_bill_payments(f"BILL-{i}")),
+        ("create_bill", lambda i: client.create_bill(100, "SHOP", order_id=f"ORDER-{i}")),
+    ]
+
+
+def _rows(call: Callable[[int], Any], i: int) -> int:
+    # Failed calls count as -1, injected errors of POST requests are not retried
+    try:
+        result = call(i)
+    except Exception:
+        return -1
+    return len(result) if isinstance(result, list) else 1
+
+
+def run(call: Callable[[int], Any], calls: int, threads: int, offset: int) -> Tuple[float, int, int]:
+    started = time.perf_counter()
+    if threads == 1:
+        results = [_rows(call, offset + i) for i in range(calls)]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+            results = list(executor.map(lambda i: _rows(call, i), range(offset, offset + calls)))
+    elapsed = time.perf_counter() - started
+    return elapsed, sum(rows for rows in results if rows > 0), results.count(-1)
+
+
+def peak_memory(call: Callable[[int], Any], i: int) -> int:
+    tracemalloc.start()
+    try:
+        _rows(call, i)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--no-validate", action="store_true")
+    arguments = parser.parse_args()
+
+    server, url = start_process(latency=arguments.latency, error_rate=arguments.error_rate, rows=arguments.rows)
+    offsets = itertools.count(step=arguments.calls)
+    try:
+        client = Cardlinky("BENCHMARK-TOKEN", base_url=url, pool_maxsize=arguments.threads,
+                           validate=not arguments.no_validate, retry=Retry(backoff_factor=0.01))
+        print(f"rows per search: {arguments.rows}, calls: {arguments.calls}, validate: {not arguments.no_validate}")
+        print(f"{'scenario':<20} {'threads':>7} {'calls/s':>10} {'rows/s':>12} {'errors':>7} {'peak memory':>12}")
+        with client:
+            for name, call in scenarios(client):
+                _rows(call, next(offsets))  # Warm up the connection and caches
+                memory = peak_memory(call, next(offsets))
+                for threads in (1, arguments.threads):
+                    elapsed, rows, errors = run(call, arguments.calls, threads, next(offsets))
+                    print(f"{name:<20} {threads:>7} {arguments.calls / elapsed:>10,.0f} {rows / elapsed:>12,.0f} "
+                          f"{errors:>7} {memory / 2 ** 20:>9.2f} MiB")
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compares the speed of response decoding with and without pydantic validation.
+
+Usage: PYTHONPATH=. python benchmarks/bench_decode.py [rows]
+"""
+
+import sys
+import time
+
+from cardlinky.decoding import Decoder
+
+
+def make_payments(rows: int) -> dict:
+    return {
+        "success": True,
+        "data": [
+            {
+                "id": f"PAYMENT-{i}",
+                "bill_id": f"BILL-{i // 3}",
+                "status": ("SUCCESS", "FAIL", "NEW", "PROCESS")[i % 4],
+                "amount": 100.0 + i % 1000,
+                "commission": 4.0,
+                "currency_in": "RUB",
+                "account_amount": 96.0 + i % 1000,
+                "account_currency_code": "RUB",
+                "from_card": "220220******1234",
+                "created_at": f"2023-04-{1 + i % 28:02d} {i % 24:02d}:{i % 60:02d}:{(i * 7) % 60:02d}",
+                "error_code": None,
+                "error_message": None,
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+def bench(decoder: Decoder, response: dict, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decoder.decode_payments(response)
+        best = min(best, time.perf_counter() - started)
+    return len(response["data"]) / best
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    response = make_payments(rows)
+
+    validated = bench(Decoder(validate=True), response)
+    trusted = bench(Decoder(validate=False), response)
+    print(f"rows: {rows}")
+    print(f"validate=True:  {validated:12,.0f} rows/s")
+    print(f"validate=False: {trusted:12,.0f} rows/s ({trusted / validated:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
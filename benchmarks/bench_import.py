@@ -0,0 +1,55 @@
+"""
+Measures cold-start time of importing cardlinky in a fresh interpreter, in milliseconds.
+
+Each run starts an empty interpreter and one interpreter per statement, in a shuffled order, so that noise of
+the machine hits all of them alike. The import cost of a statement is its time minus the empty interpreter
+of the same run. The median cost and the interquartile range over all runs are printed.
+
+Usage: PYTHONPATH=. python benchmarks/bench_import.py [runs]
+"""
+
+import sys
+import time
+import random
+import statistics
+import subprocess
+from typing import Dict, List
+
+
+STATEMENTS = [
+    "import cardlinky",
+    "from cardlinky.types import Status, Currency",
+    "from cardlinky.types import Bill, Payment",
+    "from cardlinky import Cardlinky",
+]
+
+
+def start(statement: str) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def measure(runs: int) -> Dict[str, List[float]]:
+    costs: Dict[str, List[float]] = {statement: [] for statement in STATEMENTS}
+    for _ in range(runs):
+        order = ["pass", *STATEMENTS]
+        random.shuffle(order)
+        timings = {statement: start(statement) for statement in order}
+        for statement in STATEMENTS:
+            costs[statement].append(timings[statement] - timings["pass"])
+    return costs
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    costs = measure(runs)
+    print(f"runs: {runs}")
+    print(f"{'statement':<48} {'median':>9} {'IQR':>17}")
+    for statement, values in costs.items():
+        low, _, high = statistics.quantiles(values, n=4)
+        print(f"{statement:<48} {statistics.median(values):6.1f} ms {low:6.1f} .. {high:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Compares JSON backends on a large payment/search response: parsing from bytes as the clients do,
+against decoding the body to text first as response.json() does.
+
+Usage: PYTHONPATH=. python benchmarks/bench_json.py [rows]
+"""
+
+import sys
+import json
+import time
+
+from cardlinky import jsonlib
+from cardlinky.decoding import Decoder
+
+from bench_decode import make_payments
+
+
+def bench(function, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    response = make_payments(rows)
+    content = json.dumps(response).encode()
+    decoder = Decoder(validate=False)
+    print(f"rows: {rows}, payload: {len(content) / 2 ** 20:.1f} MiB")
+
+    baseline = bench(lambda: json.loads(content.decode("utf-8")))
+    print(f"{'json, via text':<16} parse {len(content) / baseline / 2 ** 20:8.1f} MiB/s")
+
+    for name in ("json", "ujson", "orjson"):
+        try:
+            jsonlib.set_backend(name)
+        except ImportError:
+            print(f"{name:<16} not installed")
+            continue
+
+        parse = bench(lambda: jsonlib.loads(content))
+        total = bench(lambda: decoder.decode_payments(jsonlib.loads(content)))
+        dump = bench(lambda: jsonlib.dumps(response))
+        print(f"{name + ', bytes':<16} parse {len(content) / parse / 2 ** 20:8.1f} MiB/s ({baseline / parse:.1f}x)"
+              f"  parse+decode {rows / total:12,.0f} rows/s  dump {len(content) / dump / 2 ** 20:8.1f} MiB/s")
+
+
+if __name__ == "__main__":
+    main()
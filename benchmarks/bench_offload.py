@@ -0,0 +1,61 @@
+"""
+Compares decoding of a large search response in the calling thread and in a process pool:
+the time of the call, and the longest stall of another thread of the process while it runs.
+
+Usage: PYTHONPATH=. python benchmarks/bench_offload.py [rows] [workers]
+"""
+
+import sys
+import time
+import threading
+import concurrent.futures
+from typing import Any, Tuple
+
+from cardlinky.decoding import Decoder
+from cardlinky.offload import OffloadDecoder
+
+from bench_decode import make_payments
+
+
+def measure(decoder: Any, response: dict) -> Tuple[float, float]:
+    # A ticker thread wakes up every millisecond, the longest gap between its ticks is the stall
+    stop, longest = threading.Event(), [0.0]
+
+    def tick() -> None:
+        last = time.perf_counter()
+        while not stop.wait(0.001):
+            now = time.perf_counter()
+            longest[0] = max(longest[0], now - last)
+            last = now
+
+    ticker = threading.Thread(target=tick)
+    ticker.start()
+    started = time.perf_counter()
+    decoder.decode_payments(response)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    ticker.join()
+    return elapsed, longest[0]
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    response = make_payments(rows)
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        decoders = [
+            ("in thread", Decoder()),
+            (f"{workers} processes", OffloadDecoder(Decoder(), executor)),
+        ]
+        decoders[1][1].decode_payments(make_payments(10_000))  # Start the workers
+
+        print(f"rows: {rows}")
+        print(f"{'decoder':<14} {'seconds':>8} {'rows/s':>10} {'longest stall':>14}")
+        for name, decoder in decoders:
+            elapsed, stall = measure(decoder, response)
+            print(f"{name:<14} {elapsed:>8.3f} {rows / elapsed:>10,.0f} {stall * 1000:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Measures how many postbacks per second PostbackHandler verifies, decodes and deduplicates.
+
+Usage: PYTHONPATH=. python benchmarks/bench_postback.py [postbacks]
+"""
+
+import sys
+import time
+import urllib.parse
+
+from cardlinky.postback import PostbackHandler, signature
+
+
+TOKEN = "BENCHMARK-TOKEN"
+
+
+def make_bodies(count: int) -> list:
+    bodies = []
+    for i in range(count):
+        out_sum, inv_id = f"{100 + i % 1000}.00", f"ORDER-{i}"
+        bodies.append(urllib.parse.urlencode({
+            "Status": "SUCCESS" if i % 10 else "FAIL",
+            "InvId": inv_id,
+            "Commission": "4.00",
+            "CurrencyIn": "RUB",
+            "OutSum": out_sum,
+            "TrsId": f"PAYMENT-{i}",
+            "custom": "",
+            "AccountNumber": "220220******1234",
+            "AccountType": "BANK_CARD",
+            "BalanceAmount": f"{96 + i % 1000}.00",
+            "BalanceCurrency": "RUB",
+            "SignatureValue": signature(out_sum, inv_id, TOKEN),
+        }).encode())
+    return bodies
+
+
+def bench(handler: PostbackHandler, bodies: list) -> float:
+    started = time.perf_counter()
+    for body in bodies:
+        handler.handle(body)
+    return len(bodies) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    bodies = make_bodies(count)
+
+    print(f"postbacks: {count}")
+    print(f"validate=True:  {bench(PostbackHandler(TOKEN), bodies):12,.0f} postbacks/s")
+    print(f"validate=False: {bench(PostbackHandler(TOKEN, validate=False), bodies):12,.0f} postbacks/s")
+
+
+if __name__ == "__main__":
+    main()
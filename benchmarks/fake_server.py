@@ -0,0 +1,252 @@
+"""
+Local stand-in for the Cardlink API. It answers every endpoint used by the clients with responses
+of the real shape, with configurable latency, error rate and number of rows in lists.
+
+Usage: PYTHONPATH=. python benchmarks/fake_server.py [--port 8080] [--latency 0.05] [--error-rate 0.01] [--rows 1000]
+Then create a client with Cardlinky("TOKEN", base_url="http://127.0.0.1:8080/").
+"""
+
+import json
+import time
+import zlib
+import random
+import argparse
+import itertools
+import threading
+import http.server
+import multiprocessing
+from typing import Optional, Callable, Dict, Tuple, Any
+
+
+STATUSES = ("SUCCESS", "FAIL", "NEW", "PROCESS")
+
+
+def _created_at(i: int) -> str:
+    return f"2023-04-{1 + i % 28:02d} {i % 24:02d}:{i % 60:02d}:{(i * 7) % 60:02d}"
+
+
+def make_bill(i: int) -> Dict[str, Any]:
+    return {
+        "id": f"BILL-{i}",
+        "status": STATUSES[i % 4],
+        "active": i % 4 in (2, 3),
+        "amount": 100.0 + i % 1000,
+        "type": "NORMAL" if i % 5 else "MULTI",
+        "currency_in": "RUB",
+        "created_at": _created_at(i),
+    }
+
+
+def make_payment(i: int) -> Dict[str, Any]:
+    return {
+        "id": f"PAYMENT-{i}",
+        "bill_id": f"BILL-{i // 3}",
+        "status": STATUSES[i % 4],
+        "amount": 100.0 + i % 1000,
+        "commission": 4.0,
+        "currency_in": "RUB",
+        "account_amount": 96.0 + i % 1000,
+        "account_currency_code": "RUB",
+        "from_card": f"{220220 + i % 7}******{i % 10000:04d}",
+        "created_at": _created_at(i),
+        "error_code": None,
+        "error_message": None,
+    }
+
+
+def make_payout(i: int) -> Dict[str, Any]:
+    return {
+        "id": f"PAYOUT-{i}",
+        "status": STATUSES[i % 4],
+        "amount": 1000.0 + i % 1000,
+        "commission": 20.0,
+        "account_identifier": f"220220******{i % 10000:04d}",
+        "currency": "RUB",
+        "created_at": _created_at(i),
+    }
+
+
+def _encode(response: Dict[str, Any]) -> bytes:
+    return json.dumps(response, separators=(",", ":")).encode()
+
+
+class _Responses:
+    """
+    Bodies of list endpoints are built once, other responses are cheap to build per request.
+    """
+
+    def __init__(self, rows: int):
+        self.bill_search: bytes = _encode({"success": True, "data": [make_bill(i) for i in range(rows)]})
+        self.payment_search: bytes = _encode({"success": True, "data": [make_payment(i) for i in range(rows)]})
+        self.payout_search: bytes = _encode({"success": True, "data": [make_payout(i) for i in range(rows)]})
+        self.balance: bytes = _encode({"success": True, "balances": [
+            {"currency": currency, "balance_available": 1000.0, "balance_locked": 10.0, "balance_hold": 5.0}
+            for currency in ("RUB", "USD", "EUR")
+        ]})
+        self._counter: Callable[[], int] = itertools.count().__next__
+
+    def build(self, path: str, body: Dict[str, Any]) -> Optional[bytes]:
+        if path == "bill/search":
+            return self.bill_search
+        if path in ("payment/search", "bill/payments"):
+            return self.payment_search
+        if path == "payout/search":
+            return self.payout_search
+        if path == "merchant/balance":
+            return self.balance
+        if path == "bill/create":
+            bill_id = f"BILL-{self._counter()}"
+            return _encode({
+                "success": True,
+                "link_url": f"https://cardlink.link/link/{bill_id}",
+                "link_page_url": f"https://cardlink.link/transfer/{bill_id}",
+                "bill_id": bill_id,
+            })
+        if path in ("bill/status", "bill/toggle_activity"):
+            bill = make_bill(zlib.crc32(str(body.get("id", "")).encode()) % 1000)
+            if "active" in body:
+                bill["active"] = bool(int(body["active"]))
+            return _encode({**bill, "id": body.get("id", bill["id"]), "success": True})
+        if path == "payment/status":
+            payment = make_payment(zlib.crc32(str(body.get("id", "")).encode()) % 1000)
+            return _encode({**payment, "id": body.get("id", payment["id"]), "success": True})
+        if path in ("payout/personal/create", "payout/regular/create"):
+            payout = make_payout(self._counter())
+            if "amount" in body:
+                payout["amount"] = body["amount"]
+            return _encode({"success": True, "data": [payout]})
+        if path == "payout/status":
+            payout = make_payout(self._counter())
+            payout["currency_in"] = payout.pop("currency")
+            return _encode({**payout, "id": body.get("id", payout["id"]), "success": True})
+        return None
+
+
+def _handler(responses: _Responses, latency: float, jitter: float, error_rate: float,
+             api_error_rate: float) -> type:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are sent in one packet, otherwise delayed ACKs add 40 ms to every response
+        wbufsize = 1 << 16
+        disable_nagle_algorithm = True
+
+        def _reply(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            if status == 503:
+                self.send_header("Retry-After", "0")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _handle(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            if latency or jitter:
+                time.sleep(max(0.0, random.gauss(latency, jitter)))
+
+            if random.random() < error_rate:
+                return self._reply(503, b"<html><body>503 Service Unavailable</body></html>", "text/html")
+            if random.random() < api_error_rate:
+                return self._reply(200, _encode({"success": False, "message": "Internal error"}))
+
+            path = self.path.split("?", 1)[0].strip("/")
+            if path.startswith("api/v1/"):
+                path = path[len("api/v1/"):]
+            body = json.loads(raw) if raw else {}
+            response = responses.build(path, body)
+            if response is None:
+                return self._reply(404, _encode({"success": False, "message": f"Unknown method {path}"}))
+            self._reply(200, response)
+
+        do_GET = do_POST = _handle
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+class FakeCardlink:
+    """
+    Fake Cardlink API served from a background thread of this process.
+
+    :param port: int - Port to listen on, 0 picks a free one. Default: 0
+    :param latency: float - Mean delay of a response in seconds. Default: 0
+    :param jitter: float - Standard deviation of the delay in seconds. Default: 0
+    :param error_rate: float - Share of requests answered with an HTML 503 page. Default: 0
+    :param api_error_rate: float - Share of requests answered with "success": false. Default: 0
+    :param rows: int - Number of rows in search responses. Default: 100
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0, jitter: float = 0, error_rate: float = 0,
+                 api_error_rate: float = 0, rows: int = 100):
+        handler = _handler(_Responses(rows), latency, jitter, error_rate, api_error_rate)
+        self._server: http.server.ThreadingHTTPServer = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/"
+
+    def start(self) -> "FakeCardlink":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeCardlink":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+
+def _serve(ready: Any, options: Dict[str, Any]) -> None:
+    server = FakeCardlink(**options)
+    ready.put(server.url)
+    server.serve_forever()
+
+
+def start_process(**options: Any) -> Tuple[multiprocessing.Process, str]:
+    """
+    Start a fake server in a separate process, so it does not compete with the benchmarked client for the GIL.
+    Arguments are the same as of FakeCardlink. Terminate the process when done.
+
+    :return: Tuple[multiprocessing.Process, str] - The process and the base url of the server
+    """
+
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(ready, options), daemon=True)
+    process.start()
+    return process, ready.get(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--api-error-rate", type=float, default=0)
+    parser.add_argument("--rows", type=int, default=100)
+    arguments = parser.parse_args()
+
+    server = FakeCardlink(arguments.port, arguments.latency, arguments.jitter, arguments.error_rate,
+                          arguments.api_error_rate, arguments.rows)
+    print(f"Serving a fake Cardlink API on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,43 @@
-from cardlinky.cardlinky import *
+import importlib
+from typing import Any, List
+
+from cardlinky._lazy import import_submodule
+
+
+# Public names are imported on first access, so `import cardlinky` does not load requests, aiohttp or pydantic
+_LAZY = {
+    "Cardlinky": "cardlinky.cardlinky",
+    "CardlinkyAPIError": "cardlinky.cardlinky",
+    "AsyncCardlinky": "cardlinky.async_cardlinky",
+    "Retry": "cardlinky.retry",
+    "RateLimiter": "cardlinky.ratelimit",
+    "IdempotencyLedger": "cardlinky.idempotency",
+    "Status": "cardlinky.types.enums.status",
+    "Currency": "cardlinky.types.enums.currency",
+    "BillType": "cardlinky.types.enums.bill_type",
+    "AccountType": "cardlinky.types.enums.account_type",
+    "Bill": "cardlinky.types.models.bill",
+    "BillCreate": "cardlinky.types.models.bill",
+    "BillStatus": "cardlinky.types.models.bill",
+    "BillToggleActivity": "cardlinky.types.models.bill",
+    "Payment": "cardlinky.types.models.payment",
+    "PaymentStatus": "cardlinky.types.models.payment",
+    "Payout": "cardlinky.types.models.payout",
+    "PayoutStatus": "cardlinky.types.models.payout",
+    "Balance": "cardlinky.types.models.balance",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        return import_submodule(__name__, name)
+
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,22 @@
+import importlib
+from types import ModuleType
+
+
+def import_submodule(package: str, name: str) -> ModuleType:
+    """
+    Import a submodule or subpackage for the module-level __getattr__ of a package, so that attribute access like
+    cardlinky.types.enums.status works after a plain `import cardlinky`. import_module also binds the submodule
+    as an attribute of the package.
+
+    :param package: str - Name of the package
+    :param name: str - Name of the attribute
+    :return: types.ModuleType
+    :raises AttributeError: If there is no such submodule
+    """
+
+    try:
+        return importlib.import_module(f"{package}.{name}")
+    except ModuleNotFoundError as e:
+        if e.name != f"{package}.{name}":
+            raise
+        raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
@@ -0,0 +1,656 @@
+import time
+import asyncio
+import datetime
+import concurrent.futures
+import requests
+from typing import Optional, MutableMapping, Mapping, Union, Any, List, Iterable, AsyncIterator, Dict, Tuple
+
+from cardlinky import bulk, columnar, decoding, jsonlib, pagination, singleflight
+from cardlinky import cache as caching
+from cardlinky.retry import Retry
+from cardlinky.ratelimit import RateLimiter
+from cardlinky.idempotency import IdempotencyLedger
+from cardlinky.instrumentation import Sink, ResponseEvent, TimedDecoder
+from cardlinky.offload import AsyncOffloadDecoder
+from cardlinky.cardlinky import CardlinkyAPIError, _BASE_URL, _handle_error, _bill_create_body, _search_body, \
+    _regular_payout_body, _bill_key, _payout_key, _idempotency_key
+from cardlinky.types.models.balance import Balance
+from cardlinky.types.models.payout import Payout, PayoutStatus
+from cardlinky.types.models.payment import Payment, PaymentStatus
+from cardlinky.types.models.bill import Bill, BillCreate, BillStatus, BillToggleActivity
+from cardlinky.types.enums.currency import Currency
+from cardlinky.types.enums.bill_type import BillType
+from cardlinky.types.enums.account_type import AccountType
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+def _is_ambiguous(error: BaseException) -> bool:
+    # Any failure except an API error or a failed connection may happen after the API has performed the request
+    return not isinstance(error, (CardlinkyAPIError, aiohttp.ClientConnectorError))
+
+
+class AsyncCardlinky:
+    """
+    Asynchronous version of Cardlinky built on aiohttp. Requires `pip install cardlinky[async]`.
+    The client keeps one connection pool for all its requests, so many of them can be in flight at once.
+
+    :param token: str - Your API token
+    :param base_url: Optional[str] - Custom base url. Default: https://cardlink.link/api/v1/
+    :param limit: int - Maximum number of simultaneous connections. Default: 100
+    :param limit_per_host: int - Maximum number of simultaneous connections to one host. 0 is unlimited. Default: 0
+    :param timeout: Optional[float] - Total timeout of one request in seconds. Default: 30
+    :param session: Optional[aiohttp.ClientSession] - Existing session to use. It is not closed by the client
+    :param validate: bool - Validate responses with pydantic. Disable it to build models faster from trusted
+        responses without type checks. Default: True
+    :param tz: Optional[datetime.tzinfo] - Timezone attached to timestamps of responses. Default: naive datetimes
+    :param cache: Optional[cache.Cache] - Cache for responses of read endpoints, for example cache.MemoryCache().
+        Default: no cache
+    :param cache_ttl: Optional[Mapping[str, float]] - Seconds to cache responses by endpoint path, like
+        {"merchant/balance": 5}. Endpoints that are not listed are not cached. Default: cache.DEFAULT_TTL
+    :param coalesce: bool - Share one request between identical concurrent read requests. Default: True
+    :param retry: Optional[Retry] - Retry policy for transient failures. Only GET requests are retried by default.
+        Pass Retry(total=0) to disable retries. Default: Retry()
+    :param rate_limit: Optional[Union[float, RateLimiter]] - Maximum number of requests per second, or a limiter
+        shared with other clients. Default: unlimited
+    :param idempotency: Optional[IdempotencyLedger] - Ledger of created bills and payouts. Bills with the same
+        shop_id and order_id and payouts with the same idempotency_key are created only once.
+        Share one ledger between clients of one token. Default: a new in-memory ledger
+    :param instrumentation: Optional[instrumentation.Sink] - Receives timings, sizes and errors of every call,
+        for example instrumentation.Metrics(). Default: disabled
+    :param exact_amounts: bool - Decode amounts of models into decimal.Decimal, and amounts of columns into int64
+        minor units, like kopecks or cents. Default: False
+    :param decode_executor: Optional[concurrent.futures.Executor] - Executor, preferably a ProcessPoolExecutor,
+        to build models of large search responses in, without blocking the event loop. It is not shut down
+        by the client. Default: event loop thread
+    :param offload_min_rows: int - Minimum number of rows of a search response to decode in decode_executor.
+        Default: 2000
+    """
+
+    def __init__(self, token: str, base_url: Optional[str] = None, limit: int = 100, limit_per_host: int = 0,
+                 timeout: Optional[float] = 30, session: Optional["aiohttp.ClientSession"] = None,
+                 validate: bool = True, tz: Optional[datetime.tzinfo] = None,
+                 cache: Optional[caching.Cache] = None, cache_ttl: Optional[Mapping[str, float]] = None,
+                 coalesce: bool = True, retry: Optional[Retry] = None,
+                 rate_limit: Optional[Union[float, RateLimiter]] = None,
+                 idempotency: Optional[IdempotencyLedger] = None, instrumentation: Optional[Sink] = None,
+                 exact_amounts: bool = False, decode_executor: Optional[concurrent.futures.Executor] = None,
+                 offload_min_rows: int = 2000):
+        if aiohttp is None:
+            raise ImportError("AsyncCardlinky requires aiohttp. Install it with `pip install cardlinky[async]`")
+
+        self.__token: str = token
+        self._base_url: str = base_url if base_url is not None else _BASE_URL
+        self._headers: Dict[str, str] = {
+            "Authorization": f"Bearer {self.__token}",
+            "Content-Type": "application/json",
+        }
+        self._limit: int = limit
+        self._limit_per_host: int = limit_per_host
+        self._timeout: Optional[float] = timeout
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session: bool = session is None
+        self._instrumentation: Optional[Sink] = instrumentation
+        self._decoder: decoding.Decoder = decoding.Decoder(validate=validate, tz=tz, exact_amounts=exact_amounts)
+        self._offload: Optional[AsyncOffloadDecoder] = (
+            AsyncOffloadDecoder(self._decoder, decode_executor, offload_min_rows)
+            if decode_executor is not None else None
+        )
+        if instrumentation is not None:
+            self._decoder = TimedDecoder(self._decoder, instrumentation)
+        self._retry: Retry = retry if retry is not None else Retry()
+        self._rate_limiter: Optional[RateLimiter] = (
+            RateLimiter(rate_limit) if isinstance(rate_limit, (int, float)) else rate_limit
+        )
+        self._cache: Optional[caching.Cache] = cache
+        self._cache_ttl: Mapping[str, float] = cache_ttl if cache_ttl is not None else caching.DEFAULT_TTL
+        self._cache_namespace: str = caching.token_namespace(token)
+        self._idempotency: IdempotencyLedger = idempotency if idempotency is not None else IdempotencyLedger()
+        self._single_flight: Optional[singleflight.AsyncSingleFlight] = (
+            singleflight.AsyncSingleFlight() if coalesce else None
+        )
+
+    async def __aenter__(self) -> "AsyncCardlinky":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        # The session is created lazily because aiohttp binds it to the running event loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._limit, limit_per_host=self._limit_per_host),
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Close the connection pool. The client can still be used after closing, a new pool will be created.
+        """
+
+        # A session passed by the caller is neither closed nor dropped, it stays in use after closing
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def tz(self) -> Optional[datetime.tzinfo]:
+        """
+        Timezone attached to timestamps of responses.
+        """
+
+        return self._decoder.tz
+
+    @property
+    def cache_namespace(self) -> str:
+        """
+        Namespace of the token, used in cache and idempotency keys. Prefix your own keys of data of this token
+        with it, so that clients with different tokens never share them. The token itself is not in it.
+        """
+
+        return self._cache_namespace
+
+    async def get_raw(self, path: str, params: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        """
+        Send a read request and return the decoded JSON response without building models.
+        It is cached, coalesced and retried like the other read requests.
+
+        :param path: str - Endpoint path, like "payment/status"
+        :param params: MutableMapping[str, Any] - Body of the request
+        :return: MutableMapping[str, Any] - Response in the format of the API
+        """
+
+        return await self._get(path, params)
+
+    async def _send(self, method: str, path: str, json: MutableMapping[str, Any]) -> Tuple[int, str, bytes]:
+        body, attempt, instrumentation = jsonlib.dumps(json), 0, self._instrumentation
+        while True:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire_async()
+
+            if instrumentation is not None:
+                instrumentation.on_request(method, path, body, attempt)
+                started = time.perf_counter()
+            try:
+                async with self._get_session().request(
+                    method,
+                    url=self._base_url + path,
+                    headers=self._headers,
+                    data=body,
+                ) as response:
+                    if instrumentation is not None:
+                        headers_seconds = time.perf_counter() - started
+                    status, reason, retry_after = response.status, response.reason, response.headers.get("Retry-After")
+                    content = await response.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if instrumentation is not None:
+                    instrumentation.on_error(method, path, e)
+                if not self._retry.allows(method, attempt):
+                    raise
+                await asyncio.sleep(self._retry.delay(attempt))
+            else:
+                if instrumentation is not None:
+                    instrumentation.on_response(ResponseEvent(
+                        method, path, status, attempt, len(body), len(content), headers_seconds,
+                        time.perf_counter() - started,
+                    ))
+                if status not in self._retry.statuses or not self._retry.allows(method, attempt):
+                    return status, reason, content
+                await asyncio.sleep(self._retry.delay(attempt, retry_after))
+            attempt += 1
+
+    async def _request(self, method: str, path: str, json: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        status, reason, body = await self._send(method, path, json)
+        instrumentation = self._instrumentation
+        started = time.perf_counter() if instrumentation is not None else 0.0
+        try:
+            try:
+                json = jsonlib.loads(body)
+            except ValueError:
+                # Proxies and the API itself return HTML pages on some errors
+                raise requests.exceptions.HTTPError(f"{status} {reason} for url {self._base_url + path}") from None
+            if instrumentation is not None:
+                instrumentation.on_parse(path, len(body), time.perf_counter() - started)
+            _handle_error(json)
+        except requests.exceptions.HTTPError as e:
+            if instrumentation is not None:
+                instrumentation.on_error(method, path, e)
+            raise
+
+        return json
+
+    async def _fetch(self, key: str, path: str, json: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        if self._single_flight is None:
+            return await self._request("GET", path, json)
+        return await self._single_flight.do(key, lambda: self._request("GET", path, json))
+
+    async def _get(self, path: str, json: MutableMapping[str, Any], cached: bool = True) -> MutableMapping[str, Any]:
+        key = caching.make_key(self._cache_namespace, path, json)
+        if not cached or self._cache is None or path not in self._cache_ttl:
+            return await self._fetch(key, path, json)
+
+        response = self._cache.get(key)
+        if response is None:
+            response = await self._fetch(key, path, json)
+            self._cache.set(key, response, self._cache_ttl[path])
+
+        return response
+
+    async def _decode_list(self, name: str, response: Mapping[str, Any]) -> List[Any]:
+        # name is "bills", "payments" or "payouts"
+        if self._offload is None:
+            return getattr(self._decoder, "decode_" + name)(response)
+
+        started = time.perf_counter()
+        result = await getattr(self._offload, "decode_" + name)(response)
+        if self._instrumentation is not None:
+            self._instrumentation.on_decode(name, len(result), time.perf_counter() - started)
+        return result
+
+    async def _post(self, path: str, json: MutableMapping[str, Union[str, int, bool]]) -> MutableMapping[str, Any]:
+        return await self._request("POST", path, json)
+
+    async def _post_once(self, path: str, json: MutableMapping[str, Union[str, int, bool]],
+                         key: Optional[str]) -> MutableMapping[str, Any]:
+        if key is None:
+            return await self._post(path, json)
+        return await self._idempotency.run_async(self._cache_namespace + ":" + key, lambda: self._post(path, json),
+                                                 _is_ambiguous, json)
+
+    def forget_idempotency_key(self, idempotency_key: Optional[str] = None, shop_id: Optional[str] = None,
+                               order_id: Optional[str] = None) -> None:
+        """
+        Forget a payout or a bill in the idempotency ledger, so the next request with its key is sent again.
+        Use it after AmbiguousResultError, once you checked in your Cardlink account that it was not performed.
+
+        :param idempotency_key: Optional[str] - idempotency_key of a payout
+        :param shop_id: Optional[str] - shop_id of a bill, together with order_id
+        :param order_id: Optional[str] - order_id of a bill, together with shop_id
+        """
+
+        self._idempotency.forget(self._cache_namespace + ":" + _idempotency_key(idempotency_key, shop_id, order_id))
+
+    async def create_bill(self, amount: float, shop_id: str, order_id: Optional[str] = None,
+                          description: Optional[str] = None, bill_type: Optional[BillType] = None,
+                          currency_in: Optional[Currency] = None, custom: Optional[str] = None,
+                          name: Optional[str] = None, payer_pays_commission: Optional[bool] = False) -> BillCreate:
+        """
+        How to create a bill.
+        https://cardlink.link/en/reference/api#bill-create
+
+        :param amount: float - Payment amount
+        :param shop_id: str - Unique shop ID
+        :param order_id: Optional[str] - Unique order ID. Will be sent within Postback
+        :param description: Optional[str] - Description of payment
+        :param bill_type: Optional[enums.BillType] - Type of payment link shows how many payments it could receive
+        :param currency_in: Optional[enums.Currency] - Currency that customer sees during payment process
+        :param custom: str - You can send any string value in this field, and it will be returned within postback
+        :param name: str - Please specify the purpose of the payment. It will be shown on the payment form
+        :param payer_pays_commission: bool - Is payer pays commission or not
+        :return: models.BillCreate
+        :raises idempotency.AmbiguousResultError: If an earlier request with this order_id failed with
+            an unknown result
+        """
+
+        response = await self._post_once("bill/create", _bill_create_body(
+            amount, shop_id, order_id, description, bill_type, currency_in, custom, name, payer_pays_commission,
+        ), _bill_key(shop_id, order_id) if order_id is not None else None)
+
+        return self._decoder.decode_bill_create(response)
+
+    def create_bills_many(self, bills: Iterable[Mapping[str, Any]], concurrency: int = 10,
+                          rate_limit: Optional[float] = None,
+                          stats: Optional[bulk.BulkStats] = None) -> AsyncIterator[bulk.BulkResult]:
+        """
+        Create many bills concurrently and yield results as they complete.
+        An error for one bill is returned in its result and does not stop the others.
+        Bills are read from the iterable lazily, so it can be a generator.
+
+        :param bills: Iterable[Mapping[str, Any]] - Keyword arguments of create_bill for every bill
+        :param concurrency: int - Maximum number of simultaneous requests. Default: 10
+        :param rate_limit: Optional[float] - Maximum number of requests per second. Default: unlimited
+        :param stats: Optional[bulk.BulkStats] - Updated with the number of created bills, errors and throughput
+        :return: AsyncIterator[bulk.BulkResult] - Results with models.BillCreate, in the order of completion
+        """
+
+        return bulk.gather_as_completed(lambda bill: self.create_bill(**bill), bills, concurrency, rate_limit, stats)
+
+    async def toggle_bill_activity(self, bill_id: str, active: bool) -> BillToggleActivity:
+        """
+        You can deactivate and activate bills using this APO.
+        https://cardlink.link/en/reference/api#bill-toggle
+
+        :param bill_id: str - Unique bill id
+        :param active: bool - Deactivate or activate bill
+        :return: models.BillToggleActivity
+        """
+
+        response = await self._post("bill/toggle_activity", {
+            "id": bill_id,
+            "active": int(active),
+        })
+        if self._cache is not None:
+            self._cache.delete(caching.make_key(self._cache_namespace, "bill/status", {"id": bill_id}))
+
+        return self._decoder.decode_bill_toggle_activity(response)
+
+    async def get_bill_payments(self, bill_id: str) -> List[Payment]:
+        """
+        Get information about payments for one bill.
+        https://cardlink.link/en/reference/api#bill-payments
+
+        :param bill_id: str - Unique bill id
+        :return: List[models.Payment]
+        """
+
+        response = await self._get("bill/payments", {
+            "id": bill_id,
+        })
+
+        return await self._decode_list("payments", response)
+
+    async def search_bill(self, shop_id: str, start_date: Optional[datetime.datetime] = None,
+                          finish_date: Optional[datetime.datetime] = None) -> List[Bill]:
+        """
+        Search by bills.
+        https://cardlink.link/en/reference/api#bill-search
+
+        :param shop_id: str - Unique shop ID
+        :param start_date: Optional[datetime.datetime] - Start date
+        :param finish_date: Optional[datetime.datetime] - End date
+        :return: List[models.Bill]
+        """
+
+        response = await self._get("bill/search", _search_body(shop_id, start_date, finish_date))
+
+        return await self._decode_list("bills", response)
+
+    async def search_bill_columns(self, shop_id: str,
+                                  start_date: Optional[datetime.datetime] = None,
+                                  finish_date: Optional[datetime.datetime] = None) -> columnar.Columns:
+        """
+        Search bills and decode them straight into columns, without building models.
+        Use to_numpy(), to_pandas() or to_arrow() of the result for analytics.
+
+        :param shop_id: str - Unique shop ID
+        :param start_date: Optional[datetime.datetime] - Start date
+        :param finish_date: Optional[datetime.datetime] - End date
+        :return: columnar.Columns
+        """
+
+        response = await self._get("bill/search", _search_body(shop_id, start_date, finish_date))
+
+        return columnar.to_columns(response["data"], columnar.BILL_SCHEMA, self._decoder.tz,
+                                   self._decoder.exact_amounts)
+
+    def iter_bills(self, shop_id: str, start_date: datetime.date, finish_date: datetime.date,
+                   window_days: int = 1, max_rows: Optional[int] = None) -> AsyncIterator[Bill]:
+        """
+        Lazily iterate over bills of the date range. The range is fetched in windows of `window_days` days,
+        so only one window is held in memory at a time. Windows bypass the response cache.
+
+        :param shop_id: str - Unique shop ID
+        :param start_date: datetime.date - Start date
+        :param finish_date: datetime.date - End date, inclusive
+        :param window_days: int - Number of days fetched with one request. Default: 1
+        :param max_rows: Optional[int] - If a window returns at least this many rows, it is split in half and
+            fetched again. Default: never split
+        :return: AsyncIterator[models.Bill]
+        """
+
+        async def fetch(window_start: datetime.date, window_finish: datetime.date) -> List[Mapping[str, Any]]:
+            body = _search_body(shop_id, window_start, window_finish)
+            response = await self._get("bill/search", body, cached=False)
+            return response["data"]
+
+        return pagination.aiter_windows(fetch, self._decoder.decode_bill, start_date, finish_date,
+                                        window_days, max_rows)
+
+    async def get_bill_status(self, bill_id: str) -> BillStatus:
+        """
+        Get bill info and status.
+        https://cardlink.link/en/reference/api#bill-status
+
+        :param bill_id: str - Unique bill ID
+        :return: models.BillStatus
+        """
+
+        response = await self._get("bill/status", {
+            "id": bill_id,
+        })
+
+        return self._decoder.decode_bill_status(response)
+
+    async def get_bill_status_many(self, bill_ids: Iterable[str], concurrency: int = 10,
+                                   rate_limit: Optional[float] = None) -> Dict[str, Union[BillStatus, Exception]]:
+        """
+        Get statuses of many bills concurrently.
+        An error for one bill is returned in place of its status and does not stop the others.
+
+        :param bill_ids: Iterable[str] - Unique bill IDs
+        :param concurrency: int - Maximum number of simultaneous requests. Default: 10
+        :param rate_limit: Optional[float] - Maximum number of requests per second. Default: unlimited
+        :return: Dict[str, Union[models.BillStatus, Exception]] - Status or error by bill ID
+        """
+
+        return await bulk.gather_concurrently(self.get_bill_status, bill_ids, concurrency, rate_limit)
+
+    async def search_payment(self, shop_id: str, start_date: Optional[datetime.datetime] = None,
+                             finish_date: Optional[datetime.datetime] = None) -> List[Payment]:
+        """
+        Search payment.
+        https://cardlink.link/en/reference/api#payment-search
+
+        :param shop_id: str - Unique shop ID
+        :param start_date: Optional[datetime.datetime] - Start date
+        :param finish_date: Optional[datetime.datetime] - End date
+        :return: List[models.Payment]
+        """
+
+        response = await self._get("payment/search", _search_body(shop_id, start_date, finish_date))
+
+        return await self._decode_list("payments", response)
+
+    async def search_payment_columns(self, shop_id: str,
+                                     start_date: Optional[datetime.datetime] = None,
+                                     finish_date: Optional[datetime.datetime] = None) -> columnar.Columns:
+        """
+        Search payments and decode them straight into columns, without building models.
+        Use to_numpy(), to_pandas() or to_arrow() of the result for analytics.
+
+        :param shop_id: str - Unique shop ID
+        :param start_date: Optional[datetime.datetime] - Start date
+        :param finish_date: Optional[datetime.datetime] - End date
+        :return: columnar.Columns
+        """
+
+        response = await self._get("payment/search", _search_body(shop_id, start_date, finish_date))
+
+        return columnar.to_columns(response["data"], columnar.PAYMENT_SCHEMA, self._decoder.tz,
+                                   self._decoder.exact_amounts)
+
+    def iter_payments(self, shop_id: str, start_date: datetime.date, finish_date: datetime.date,
+                      window_days: int = 1, max_rows: Optional[int] = None) -> AsyncIterator[Payment]:
+        """
+        Lazily iterate over payments of the date range. The range is fetched in windows of `window_days` days,
+        so only one window is held in memory at a time. Windows bypass the response cache.
+
+        :param shop_id: str - Unique shop ID
+        :param start_date: datetime.date - Start date
+        :param finish_date: datetime.date - End date, inclusive
+        :param window_days: int - Number of days fetched with one request. Default: 1
+        :param max_rows: Optional[int] - If a window returns at least this many rows, it is split in half and
+            fetched again. Default: never split
+        :return: AsyncIterator[models.Payment]
+        """
+
+        async def fetch(window_start: datetime.date, window_finish: datetime.date) -> List[Mapping[str, Any]]:
+            body = _search_body(shop_id, window_start, window_finish)
+            response = await self._get("payment/search", body, cached=False)
+            return response["data"]
+
+        return pagination.aiter_windows(fetch, self._decoder.decode_payment, start_date, finish_date,
+                                        window_days, max_rows)
+
+    async def get_payment_status(self, payment_id: str) -> PaymentStatus:
+        """
+        Get status of payment.
+        https://cardlink.link/en/reference/api#payment-status
+
+        :param payment_id: str - Unique payment ID
+        :return: models.PaymentStatus
+        """
+
+        response = await self._get("payment/status", {
+            "id": payment_id,
+        })
+
+        return self._decoder.decode_payment_status(response)
+
+    async def get_payment_status_many(self, payment_ids: Iterable[str], concurrency: int = 10,
+                                      rate_limit: Optional[float] = None) -> Dict[str, Union[PaymentStatus, Exception]]:
+        """
+        Get statuses of many payments concurrently.
+        An error for one payment is returned in place of its status and does not stop the others.
+
+        :param payment_ids: Iterable[str] - Unique payment IDs
+        :param concurrency: int - Maximum number of simultaneous requests. Default: 10
+        :param rate_limit: Optional[float] - Maximum number of requests per second. Default: unlimited
+        :return: Dict[str, Union[models.PaymentStatus, Exception]] - Status or error by payment ID
+        """
+
+        return await bulk.gather_concurrently(self.get_payment_status, payment_ids, concurrency, rate_limit)
+
+    async def get_balance(self) -> List[Balance]:
+        """
+        You can request information about your current balance state using this API.
+        https://cardlink.link/en/reference/api#merchant-balance
+
+        :return: List[models.Balance]
+        """
+
+        response = await self._get("merchant/balance", {})
+
+        return self._decoder.decode_balances(response)
+
+    async def create_personal_payout(self, amount: float, payout_account_id: str,
+                                     idempotency_key: Optional[str] = None) -> List[Payout]:
+        """
+        In order to withdraw money you need to create a payout.
+        The amount of payout can be split depending on payout account type.
+        In this case you will get a list with payouts.
+        https://cardlink.link/en/reference/api#personal-payout-create
+
+        :param amount: float - Payout amount
+        :param payout_account_id: str - Unique ID of payout account. Money will be sent to this account
+        :param idempotency_key: Optional[str] - Your unique ID of this payout. A payout with a known key is not
+            created again, the stored result is returned instead
+        :return: List[Payout]
+        :raises idempotency.AmbiguousResultError: If an earlier request with this key failed with an unknown result
+        """
+
+        response = await self._post_once("payout/personal/create", {
+            "amount": amount,
+            "payout_account_id": payout_account_id,
+        }, _payout_key(idempotency_key) if idempotency_key is not None else None)
+
+        return await self._decode_list("payouts", response)
+
+    async def create_regular_payout(self, amount: float, currency: Currency, account_type: AccountType,
+                                    account_identifier: str, card_holder: str,
+                                    idempotency_key: Optional[str] = None) -> List[Payout]:
+        """
+        Attention: You need to request access to this API method from Support Team.
+        Payout to cards using your account balance.
+        https://cardlink.link/en/reference/api#regular-payout-create
+
+        :param amount: float - Payout amount
+        :param currency: models.Currency - Currency
+        :param account_type: models.AccountType - Account type for payout
+        :param account_identifier: str - Account ID
+        :param card_holder: str - Cardholder name. Only for account_type=models.AccountType.CREDIT_CARD.
+        :param idempotency_key: Optional[str] - Your unique ID of this payout. A payout with a known key is not
+            created again, the stored result is returned instead
+        :return: List[Payout]
+        :raises idempotency.AmbiguousResultError: If an earlier request with this key failed with an unknown result
+        """
+
+        response = await self._post_once("payout/regular/create", _regular_payout_body(
+            amount, currency, account_type, account_identifier, card_holder,
+        ), _payout_key(idempotency_key) if idempotency_key is not None else None)
+
+        return await self._decode_list("payouts", response)
+
+    async def search_payout(self, start_date: Optional[datetime.datetime] = None,
+                            finish_date: Optional[datetime.datetime] = None) -> List[Payout]:
+        """
+        You can request all your payouts using this method.
+        https://cardlink.link/en/reference/api#payout-search
+
+        :param start_date: Optional[datetime.datetime] - Start date for search
+        :param finish_date: Optional[datetime.datetime] - End date for search
+        :return: List[models.Payout]
+        """
+
+        response = await self._get("payout/search", _search_body(None, start_date, finish_date))
+
+        return await self._decode_list("payouts", response)
+
+    async def search_payout_columns(self, start_date: Optional[datetime.datetime] = None,
+                                    finish_date: Optional[datetime.datetime] = None) -> columnar.Columns:
+        """
+        Search payouts and decode them straight into columns, without building models.
+        Use to_numpy(), to_pandas() or to_arrow() of the result for analytics.
+
+        :param start_date: Optional[datetime.datetime] - Start date
+        :param finish_date: Optional[datetime.datetime] - End date
+        :return: columnar.Columns
+        """
+
+        response = await self._get("payout/search", _search_body(None, start_date, finish_date))
+
+        return columnar.to_columns(response["data"], columnar.PAYOUT_SCHEMA, self._decoder.tz,
+                                   self._decoder.exact_amounts)
+
+    def iter_payouts(self, start_date: datetime.date, finish_date: datetime.date,
+                     window_days: int = 1, max_rows: Optional[int] = None) -> AsyncIterator[Payout]:
+        """
+        Lazily iterate over payouts of the date range. The range is fetched in windows of `window_days` days,
+        so only one window is held in memory at a time. Windows bypass the response cache.
+
+        :param start_date: datetime.date - Start date
+        :param finish_date: datetime.date - End date, inclusive
+        :param window_days: int - Number of days fetched with one request. Default: 1
+        :param max_rows: Optional[int] - If a window returns at least this many rows, it is split in half and
+            fetched again. Default: never split
+        :return: AsyncIterator[models.Payout]
+        """
+
+        async def fetch(window_start: datetime.date, window_finish: datetime.date) -> List[Mapping[str, Any]]:
+            body = _search_body(None, window_start, window_finish)
+            response = await self._get("payout/search", body, cached=False)
+            return response["data"]
+
+        return pagination.aiter_windows(fetch, self._decoder.decode_payout, start_date, finish_date,
+                                        window_days, max_rows)
+
+    async def get_payout_status(self, payout_id: str) -> PayoutStatus:
+        """
+        You can request a status of any payout operation.
+        https://cardlink.link/en/reference/api#payout-status
+
+        :param payout_id: str - Unique payout ID
+        :return: PayoutStatus
+        """
+
+        response = await self._get("payout/status", {
+            "id": payout_id,
+        })
+
+        return self._decoder.decode_payout_status(response)
@@ -0,0 +1,223 @@
+import time
+import asyncio
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Callable, Awaitable, Iterable, Iterator, AsyncIterator, Dict, Union, Optional, TypeVar, \
+    NamedTuple, Any
+
+from cardlinky.ratelimit import RateLimiter
+
+
+_K = TypeVar("_K")
+_T = TypeVar("_T")
+
+
+def map_concurrently(function: Callable[[_K], _T], keys: Iterable[_K], max_workers: int = 10,
+                     rate_limit: Optional[float] = None) -> Dict[_K, Union[_T, Exception]]:
+    """
+    Call `function` for every key in a thread pool.
+    An exception raised for one key is stored as its result and does not stop the others.
+
+    :param function: Callable - Function that is called with one key
+    :param keys: Iterable - Keys. Duplicates are requested once
+    :param max_workers: int - Maximum number of simultaneous calls. Default: 10
+    :param rate_limit: Optional[float] - Maximum number of calls per second. Default: unlimited
+    :return: Dict - Result or exception for every key, in the order of keys
+    """
+
+    limiter = RateLimiter(rate_limit) if rate_limit is not None else None
+
+    def call(key: _K) -> Union[_T, Exception]:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return function(key)
+        except Exception as e:
+            return e
+
+    keys = list(dict.fromkeys(keys))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(keys, executor.map(call, keys)))
+
+
+async def gather_concurrently(function: Callable[[_K], Awaitable[_T]], keys: Iterable[_K], concurrency: int = 10,
+                              rate_limit: Optional[float] = None) -> Dict[_K, Union[_T, Exception]]:
+    """
+    Asynchronous version of map_concurrently.
+
+    :param function: Callable - Coroutine function that is called with one key
+    :param keys: Iterable - Keys. Duplicates are requested once
+    :param concurrency: int - Maximum number of simultaneous calls. Default: 10
+    :param rate_limit: Optional[float] - Maximum number of calls per second. Default: unlimited
+    :return: Dict - Result or exception for every key, in the order of keys
+    """
+
+    limiter = RateLimiter(rate_limit) if rate_limit is not None else None
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(key: _K) -> Union[_T, Exception]:
+        async with semaphore:
+            if limiter is not None:
+                await limiter.acquire_async()
+            try:
+                return await function(key)
+            except Exception as e:
+                return e
+
+    keys = list(dict.fromkeys(keys))
+    return dict(zip(keys, await asyncio.gather(*(call(key) for key in keys))))
+
+
+class BulkResult(NamedTuple):
+    """
+    :param index: int - Position of the item in the input
+    :param item: Any - Input item
+    :param result: Any - Result of the call, None if it failed
+    :param error: Optional[Exception] - Error of the call, None if it succeeded
+    """
+
+    index: int
+    item: Any
+    result: Any
+    error: Optional[Exception]
+
+
+class BulkStats:
+    """
+    Progress and throughput of a bulk operation. It is updated while results are consumed.
+    """
+
+    def __init__(self):
+        self.succeeded: int = 0
+        self.failed: int = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Seconds since the start, or the total duration if the operation is finished.
+        """
+
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at if self.finished_at is not None else time.monotonic()) - self.started_at
+
+    @property
+    def per_second(self) -> float:
+        """
+        Completed calls per second.
+        """
+
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def _record(self, error: Optional[Exception]) -> None:
+        with self._lock:
+            if error is None:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+    def __repr__(self) -> str:
+        return f"BulkStats(succeeded={self.succeeded}, failed={self.failed}, elapsed={self.elapsed:.2f}, " \
+               f"per_second={self.per_second:.1f})"
+
+
+def run_as_completed(function: Callable[[_K], _T], items: Iterable[_K], max_workers: int = 10,
+                     rate_limit: Optional[float] = None, stats: Optional[BulkStats] = None) -> Iterator[BulkResult]:
+    """
+    Call `function` for every item in a thread pool and yield results as they complete.
+    Items are read lazily, at most 2 * max_workers calls are queued at a time.
+
+    :param function: Callable - Function that is called with one item
+    :param items: Iterable - Items
+    :param max_workers: int - Maximum number of simultaneous calls. Default: 10
+    :param rate_limit: Optional[float] - Maximum number of calls per second. Default: unlimited
+    :param stats: Optional[BulkStats] - Updated with progress and throughput
+    :return: Iterator[BulkResult] in the order of completion
+    """
+
+    limiter = RateLimiter(rate_limit) if rate_limit is not None else None
+    stats = stats if stats is not None else BulkStats()
+
+    def call(item: _K) -> _T:
+        if limiter is not None:
+            limiter.acquire()
+        return function(item)
+
+    def result(future: "Future[_T]") -> BulkResult:
+        index, item = pending.pop(future)
+        error = future.exception()
+        stats._record(error)
+        return BulkResult(index, item, future.result() if error is None else None, error)
+
+    items = enumerate(items)
+    pending: Dict["Future[_T]", Any] = {}
+    stats.started_at = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for index, item in itertools.islice(items, 2 * max_workers):
+                pending[executor.submit(call, item)] = (index, item)
+
+            while pending:
+                done, _ = wait(tuple(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield result(future)
+                    for index, item in itertools.islice(items, 1):
+                        pending[executor.submit(call, item)] = (index, item)
+        finally:
+            # Calls that have not started yet are dropped if the caller stops early
+            for future in pending:
+                future.cancel()
+    stats.finished_at = time.monotonic()
+
+
+async def gather_as_completed(function: Callable[[_K], Awaitable[_T]], items: Iterable[_K], concurrency: int = 10,
+                              rate_limit: Optional[float] = None,
+                              stats: Optional[BulkStats] = None) -> AsyncIterator[BulkResult]:
+    """
+    Asynchronous version of run_as_completed.
+
+    :param function: Callable - Coroutine function that is called with one item
+    :param items: Iterable - Items
+    :param concurrency: int - Maximum number of simultaneous calls. Default: 10
+    :param rate_limit: Optional[float] - Maximum number of calls per second. Default: unlimited
+    :param stats: Optional[BulkStats] - Updated with progress and throughput
+    :return: AsyncIterator[BulkResult] in the order of completion
+    """
+
+    limiter = RateLimiter(rate_limit) if rate_limit is not None else None
+    stats = stats if stats is not None else BulkStats()
+
+    async def call(item: _K) -> _T:
+        if limiter is not None:
+            await limiter.acquire_async()
+        return await function(item)
+
+    items = enumerate(items)
+    pending: Dict["asyncio.Task[_T]", Any] = {}
+    stats.started_at = time.monotonic()
+    try:
+        for index, item in itertools.islice(items, concurrency):
+            pending[asyncio.ensure_future(call(item))] = (index, item)
+
+        while pending:
+            done, _ = await asyncio.wait(tuple(pending), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index, item = pending.pop(task)
+                error = task.exception()
+                stats._record(error)
+                yield BulkResult(index, item, task.result() if error is None else None, error)
+                for index, item in itertools.islice(items, 1):
+                    pending[asyncio.ensure_future(call(item))] = (index, item)
+    finally:
+        for task in pending:
+            task.cancel()
+    stats.finished_at = time.monotonic()
@@ -0,0 +1,142 @@
+import abc
+import json
+import hashlib
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Mapping, Any, Tuple
+
+
+# Seconds to keep responses of read endpoints. Endpoints that are not listed are never cached
+DEFAULT_TTL: Mapping[str, float] = {
+    "merchant/balance": 5,
+    "bill/status": 5,
+    "bill/payments": 5,
+    "bill/search": 30,
+    "payment/status": 5,
+    "payment/search": 30,
+    "payout/status": 5,
+    "payout/search": 30,
+}
+
+
+def make_key(namespace: str, path: str, params: Mapping[str, Any]) -> str:
+    """
+    Cache key of a request: the namespace, the path and its parameters in a stable order.
+    """
+
+    return namespace + ":" + path + "?" + json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def token_namespace(token: str) -> str:
+    """
+    Namespace of a token, so clients with different tokens never share responses in one cache.
+    The token itself is not stored in keys.
+    """
+
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+class Cache(abc.ABC):
+    """
+    Interface of a response cache. Implement it to share responses between processes, for example in Redis.
+    Values are decoded JSON responses and must not be modified by the caller.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """
+        :param key: str - Cache key
+        :return: Cached value or None if it is missing or expired
+        """
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        """
+        :param key: str - Cache key
+        :param value: Any - Value to store
+        :param ttl: Optional[float] - Seconds to keep the value. None keeps it until it is evicted
+        """
+
+    def add(self, key: str, value: Any, ttl: Optional[float]) -> bool:
+        """
+        Store a value only if the key is missing. Used to reserve idempotency keys and postbacks before handling
+        them. This default is not atomic: override it with an atomic operation, like SET NX in Redis,
+        for a backend shared between processes.
+
+        :param key: str - Cache key
+        :param value: Any - Value to store
+        :param ttl: Optional[float] - Seconds to keep the value. None keeps it until it is evicted
+        :return: bool - True if the value was stored, False if the key already had a value
+        """
+
+        if self.get(key) is not None:
+            return False
+        self.set(key, value, ttl)
+        return True
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        :param key: str - Cache key. Missing keys are ignored
+        """
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """
+        Remove all values.
+        """
+
+
+class MemoryCache(Cache):
+    """
+    In-process cache with expiration and least recently used eviction. Safe to use from many threads.
+
+    :param maxsize: int - Maximum number of stored values. Default: 1024
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._maxsize: int = maxsize
+        self._data: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def _put(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        # Must be called with the lock held
+        self._data[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        with self._lock:
+            self._put(key, value, ttl)
+
+    def add(self, key: str, value: Any, ttl: Optional[float]) -> bool:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and (item[0] is None or item[0] > time.monotonic()):
+                return False
+            self._put(key, value, ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
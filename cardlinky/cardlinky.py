@@ -1,12 +1,23 @@
+import time
 import datetime
+import concurrent.futures
+import urllib3
 import requests
-from typing import Optional, MutableMapping, Mapping, Union, Any, List
-
+import requests.adapters
+from typing import Optional, MutableMapping, Mapping, Union, Any, List, Iterable, Iterator, Dict, Tuple
+
+from cardlinky import bulk, columnar, decoding, jsonlib, pagination, singleflight
+from cardlinky import cache as caching
+from cardlinky.retry import Retry
+from cardlinky.ratelimit import RateLimiter
+from cardlinky.idempotency import IdempotencyLedger
+from cardlinky.instrumentation import Sink, ResponseEvent, TimedDecoder
+from cardlinky.offload import OffloadDecoder
 from cardlinky.types.models.balance import Balance
 from cardlinky.types.models.payout import Payout, PayoutStatus
 from cardlinky.types.models.payment import Payment, PaymentStatus
 from cardlinky.types.models.bill import Bill, BillCreate, BillStatus, BillToggleActivity
-from cardlinky.types.enums.status import Status
+from cardlinky.types.enums.status import Status  # noqa: F401 - re-exported, `from cardlinky.cardlinky import Status`
 from cardlinky.types.enums.currency import Currency
 from cardlinky.types.enums.bill_type import BillType
 from cardlinky.types.enums.account_type import AccountType
@@ -15,51 +26,318 @@ from cardlinky.types.enums.account_type import AccountType
 _BASE_URL: str = "https://cardlink.link/api/v1/"
 
 
+class CardlinkyAPIError(requests.exceptions.HTTPError):
+    """
+    Error returned by the Cardlink API in a response with "success": false.
+    """
+
+
+def _handle_error(json: Mapping[str, Any]) -> None:
+    if not json["success"]:
+        if "errors" in tuple(json.keys()):
+            error = tuple(json["errors"].values())[0][0]
+        else:
+            error = json["message"]
+        raise CardlinkyAPIError(error)
+
+
+def _invalid_response(response: requests.Response) -> requests.exceptions.HTTPError:
+    # Proxies and the API itself return HTML pages on some errors
+    return requests.exceptions.HTTPError(
+        f"{response.status_code} {response.reason} for url {response.url}", response=response,
+    )
+
+
+def _is_ambiguous(error: BaseException) -> bool:
+    # Any failure except an API error or a failed connection may happen after the API has performed the request
+    if isinstance(error, (CardlinkyAPIError, requests.exceptions.ConnectTimeout)):
+        return False
+    if isinstance(error, requests.exceptions.ConnectionError):
+        # Refused connections and failed name lookups are wrapped in MaxRetryError by urllib3
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return not isinstance(reason, urllib3.exceptions.NewConnectionError)
+    return True
+
+
+def _bill_key(shop_id: str, order_id: str) -> str:
+    return f"bill/create:{shop_id}:{order_id}"
+
+
+def _payout_key(idempotency_key: str) -> str:
+    return f"payout:{idempotency_key}"
+
+
+def _idempotency_key(idempotency_key: Optional[str], shop_id: Optional[str], order_id: Optional[str]) -> str:
+    if idempotency_key is not None and shop_id is None and order_id is None:
+        return _payout_key(idempotency_key)
+    if idempotency_key is None and shop_id is not None and order_id is not None:
+        return _bill_key(shop_id, order_id)
+    raise ValueError("Pass either idempotency_key of a payout, or shop_id and order_id of a bill")
+
+
+def _bill_create_body(amount: float, shop_id: str, order_id: Optional[str], description: Optional[str],
+                      bill_type: Optional[BillType], currency_in: Optional[Currency], custom: Optional[str],
+                      name: Optional[str], payer_pays_commission: Optional[bool]) -> MutableMapping[str, Any]:
+    body = {
+        "amount": amount,
+        "order_id": order_id,
+        "description": description,
+        "shop_id": shop_id,
+        "custom": custom,
+        "name": name,
+        "payer_pays_commission": payer_pays_commission,
+    }
+    if bill_type is not None:
+        body["type"] = bill_type.value
+    if currency_in is not None:
+        body["currency_in"] = currency_in.value
+    return body
+
+
+def _search_body(shop_id: Optional[str], start_date: Optional[datetime.datetime],
+                 finish_date: Optional[datetime.datetime]) -> MutableMapping[str, Any]:
+    body = {}
+    if shop_id is not None:
+        body["shop_id"] = shop_id
+    if start_date is not None:
+        body["start_date"] = start_date.strftime("%Y-%m-%d")
+    if finish_date is not None:
+        body["finish_date"] = finish_date.strftime("%Y-%m-%d")
+    return body
+
+
+def _regular_payout_body(amount: float, currency: Currency, account_type: AccountType,
+                         account_identifier: str, card_holder: str) -> MutableMapping[str, Any]:
+    return {
+        "amount": amount,
+        "currency": currency.value,
+        "account_type": account_type.value,
+        "account_identifier": account_identifier,
+        "card_holder": card_holder,
+    }
+
+
 class Cardlinky:
     """
     To get started, you need to create a store and get an API token on https://cardlink.link/
+    The client keeps a session with a pool of keep-alive connections. Close it with `close()` or use it as a
+    context manager.
 
     :param token: str - Your API token
     :param base_url: Optional[str] - Custom base url. Default: https://cardlink.link/api/v1/
+    :param timeout: Optional[Union[float, Tuple[float, float]]] - Timeout of one request in seconds,
+        or (connect, read) timeouts. None waits forever. Default: 30
+    :param pool_connections: int - Number of connection pools to cache (one per host). Default: 10
+    :param pool_maxsize: int - Maximum number of connections kept per host. Default: 10
+    :param keep_alive: bool - Reuse connections between requests. Default: True
+    :param session: Optional[requests.Session] - Existing session to use. It is not closed by the client
+    :param validate: bool - Validate responses with pydantic. Disable it to build models faster from trusted
+        responses without type checks. Default: True
+    :param tz: Optional[datetime.tzinfo] - Timezone attached to timestamps of responses. Default: naive datetimes
+    :param cache: Optional[cache.Cache] - Cache for responses of read endpoints, for example cache.MemoryCache().
+        Default: no cache
+    :param cache_ttl: Optional[Mapping[str, float]] - Seconds to cache responses by endpoint path, like
+        {"merchant/balance": 5}. Endpoints that are not listed are not cached. Default: cache.DEFAULT_TTL
+    :param coalesce: bool - Share one request between identical concurrent read requests. Default: True
+    :param retry: Optional[Retry] - Retry policy for transient failures. Only GET requests are retried by default.
+        Pass Retry(total=0) to disable retries. Default: Retry()
+    :param rate_limit: Optional[Union[float, RateLimiter]] - Maximum number of requests per second, or a limiter
+        shared with other clients. Default: unlimited
+    :param idempotency: Optional[IdempotencyLedger] - Ledger of created bills and payouts. Bills with the same
+        shop_id and order_id and payouts with the same idempotency_key are created only once.
+        Share one ledger between clients of one token. Default: a new in-memory ledger
+    :param instrumentation: Optional[instrumentation.Sink] - Receives timings, sizes and errors of every call,
+        for example instrumentation.Metrics(). Default: disabled
+    :param exact_amounts: bool - Decode amounts of models into decimal.Decimal, and amounts of columns into int64
+        minor units, like kopecks or cents. Default: False
+    :param decode_executor: Optional[concurrent.futures.Executor] - Executor, preferably a ProcessPoolExecutor,
+        to build models of large search responses in. It is not shut down by the client. Default: calling thread
+    :param offload_min_rows: int - Minimum number of rows of a search response to decode in decode_executor.
+        Default: 2000
     """
 
-    def __init__(self, token: str, base_url: Optional[str] = None):
+    def __init__(self, token: str, base_url: Optional[str] = None,
+                 timeout: Optional[Union[float, Tuple[float, float]]] = 30, pool_connections: int = 10,
+                 pool_maxsize: int = 10, keep_alive: bool = True, session: Optional[requests.Session] = None,
+                 validate: bool = True, tz: Optional[datetime.tzinfo] = None,
+                 cache: Optional[caching.Cache] = None, cache_ttl: Optional[Mapping[str, float]] = None,
+                 coalesce: bool = True, retry: Optional[Retry] = None,
+                 rate_limit: Optional[Union[float, RateLimiter]] = None,
+                 idempotency: Optional[IdempotencyLedger] = None, instrumentation: Optional[Sink] = None,
+                 exact_amounts: bool = False, decode_executor: Optional[concurrent.futures.Executor] = None,
+                 offload_min_rows: int = 2000):
         self.__token: str = token
         self._base_url: str = base_url if base_url is not None else _BASE_URL
-        self._headers: Mapping = {
-            "Authorization": f"Bearer {self.__token}"
+        self._headers: Dict[str, str] = {
+            "Authorization": f"Bearer {self.__token}",
+            "Content-Type": "application/json",
         }
+        if not keep_alive:
+            self._headers["Connection"] = "close"
+        self._timeout: Optional[Union[float, Tuple[float, float]]] = timeout
+        self._owns_session: bool = session is None
+        self._instrumentation: Optional[Sink] = instrumentation
+        self._decoder: decoding.Decoder = decoding.Decoder(validate=validate, tz=tz, exact_amounts=exact_amounts)
+        if decode_executor is not None:
+            self._decoder = OffloadDecoder(self._decoder, decode_executor, offload_min_rows)
+        if instrumentation is not None:
+            self._decoder = TimedDecoder(self._decoder, instrumentation)
+        self._retry: Retry = retry if retry is not None else Retry()
+        self._rate_limiter: Optional[RateLimiter] = (
+            RateLimiter(rate_limit) if isinstance(rate_limit, (int, float)) else rate_limit
+        )
+        self._cache: Optional[caching.Cache] = cache
+        self._cache_ttl: Mapping[str, float] = cache_ttl if cache_ttl is not None else caching.DEFAULT_TTL
+        self._cache_namespace: str = caching.token_namespace(token)
+        self._idempotency: IdempotencyLedger = idempotency if idempotency is not None else IdempotencyLedger()
+        self._single_flight: Optional[singleflight.SingleFlight] = singleflight.SingleFlight() if coalesce else None
+
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self._session: requests.Session = session
+
+    def __enter__(self) -> "Cardlinky":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close all pooled connections. A session passed to the constructor is left open.
+        """
 
-    @staticmethod
-    def __handle_error(json: Mapping[str, Any]) -> None:
-        if not json["success"]:
-            if "errors" in tuple(json.keys()):
-                error = tuple(json["errors"].values())[0][0]
-            else:
-                error = json["message"]
-            raise requests.exceptions.HTTPError(error)
+        if self._owns_session:
+            self._session.close()
+
+    @property
+    def tz(self) -> Optional[datetime.tzinfo]:
+        """
+        Timezone attached to timestamps of responses.
+        """
+
+        return self._decoder.tz
 
-    def _get(self, path: str, json: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
-        response = requests.get(
+    @property
+    def cache_namespace(self) -> str:
+        """
+        Namespace of the token, used in cache and idempotency keys. Prefix your own keys of data of this token
+        with it, so that clients with different tokens never share them. The token itself is not in it.
+        """
+
+        return self._cache_namespace
+
+    def get_raw(self, path: str, params: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        """
+        Send a read request and return the decoded JSON response without building models.
+        It is cached, coalesced and retried like the other read requests.
+
+        :param path: str - Endpoint path, like "payment/status"
+        :param params: MutableMapping[str, Any] - Body of the request
+        :return: MutableMapping[str, Any] - Response in the format of the API
+        """
+
+        return self._get(path, params)
+
+    def _send_once(self, method: str, path: str, body: bytes) -> requests.Response:
+        # One HTTP attempt, _send retries it
+        return self._session.request(
+            method,
             url=self._base_url + path,
             headers=self._headers,
-            json=json,
+            data=body,
+            timeout=self._timeout,
         )
-        json = response.json()
-        self.__handle_error(json)
+
+    def _send(self, method: str, path: str, json: MutableMapping[str, Any]) -> requests.Response:
+        body, attempt, instrumentation = jsonlib.dumps(json), 0, self._instrumentation
+        while True:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+
+            if instrumentation is not None:
+                instrumentation.on_request(method, path, body, attempt)
+                started = time.perf_counter()
+            try:
+                response = self._send_once(method, path, body)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if instrumentation is not None:
+                    instrumentation.on_error(method, path, e)
+                if not self._retry.allows(method, attempt):
+                    raise
+                time.sleep(self._retry.delay(attempt))
+            else:
+                if instrumentation is not None:
+                    instrumentation.on_response(ResponseEvent(
+                        method, path, response.status_code, attempt, len(body), len(response.content),
+                        response.elapsed.total_seconds(), time.perf_counter() - started,
+                    ))
+                if response.status_code not in self._retry.statuses or not self._retry.allows(method, attempt):
+                    return response
+                time.sleep(self._retry.delay(attempt, response.headers.get("Retry-After")))
+            attempt += 1
+
+    def _request(self, method: str, path: str, json: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        response = self._send(method, path, json)
+        instrumentation = self._instrumentation
+        started = time.perf_counter() if instrumentation is not None else 0.0
+        try:
+            try:
+                json = jsonlib.loads(response.content)
+            except ValueError:
+                raise _invalid_response(response) from None
+            if instrumentation is not None:
+                instrumentation.on_parse(path, len(response.content), time.perf_counter() - started)
+            _handle_error(json)
+        except requests.exceptions.HTTPError as e:
+            if instrumentation is not None:
+                instrumentation.on_error(method, path, e)
+            raise
 
         return json
 
+    def _fetch(self, key: str, path: str, json: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        if self._single_flight is None:
+            return self._request("GET", path, json)
+        return self._single_flight.do(key, lambda: self._request("GET", path, json))
+
+    def _get(self, path: str, json: MutableMapping[str, Any], cached: bool = True) -> MutableMapping[str, Any]:
+        key = caching.make_key(self._cache_namespace, path, json)
+        if not cached or self._cache is None or path not in self._cache_ttl:
+            return self._fetch(key, path, json)
+
+        response = self._cache.get(key)
+        if response is None:
+            response = self._fetch(key, path, json)
+            self._cache.set(key, response, self._cache_ttl[path])
+
+        return response
+
     def _post(self, path: str, json: MutableMapping[str, Union[str, int, bool]]) -> MutableMapping[str, Any]:
-        response = requests.post(
-            url=self._base_url + path,
-            headers=self._headers,
-            json=json,
-        )
-        json = response.json()
-        self.__handle_error(json)
+        return self._request("POST", path, json)
 
-        return json
+    def _post_once(self, path: str, json: MutableMapping[str, Union[str, int, bool]],
+                   key: Optional[str]) -> MutableMapping[str, Any]:
+        if key is None:
+            return self._post(path, json)
+        return self._idempotency.run(self._cache_namespace + ":" + key, lambda: self._post(path, json), _is_ambiguous,
+                                     json)
+
+    def forget_idempotency_key(self, idempotency_key: Optional[str] = None, shop_id: Optional[str] = None,
+                               order_id: Optional[str] = None) -> None:
+        """
+        Forget a payout or a bill in the idempotency ledger, so the next request with its key is sent again.
+        Use it after AmbiguousResultError, once you checked in your Cardlink account that it was not performed.
+
+        :param idempotency_key: Optional[str] - idempotency_key of a payout
+        :param shop_id: Optional[str] - shop_id of a bill, together with order_id
+        :param order_id: Optional[str] - order_id of a bill, together with shop_id
+        """
+
+        self._idempotency.forget(self._cache_namespace + ":" + _idempotency_key(idempotency_key, shop_id, order_id))
 
     def create_bill(self, amount: float, shop_id: str, order_id: Optional[str] = None,
                     description: Optional[str] = None, bill_type: Optional[BillType] = None,
@@ -79,20 +357,33 @@ class Cardlinky:
         :param name: str - Please specify the purpose of the payment. It will be shown on the payment form
         :param payer_pays_commission: bool - Is payer pays commission or not
         :return: models.BillCreate
+        :raises idempotency.AmbiguousResultError: If an earlier request with this order_id failed with
+            an unknown result
         """
 
-        response = self._post("bill/create", {
-            "amount": amount,
-            "order_id": order_id,
-            "description": description,
-            "shop_id": shop_id,
-            "custom": custom,
-            "name": name,
-            "payer_pays_commission": payer_pays_commission,
-        } | ({"type": bill_type.value} if bill_type is not None else {})
-                              | ({"currency_in": currency_in.value} if currency_in is not None else {}))
+        response = self._post_once("bill/create", _bill_create_body(
+            amount, shop_id, order_id, description, bill_type, currency_in, custom, name, payer_pays_commission,
+        ), _bill_key(shop_id, order_id) if order_id is not None else None)
+
+        return self._decoder.decode_bill_create(response)
 
-        return BillCreate(**response)
+    def create_bills_many(self, bills: Iterable[Mapping[str, Any]], max_workers: int = 10,
+                          rate_limit: Optional[float] = None,
+                          stats: Optional[bulk.BulkStats] = None) -> Iterator[bulk.BulkResult]:
+        """
+        Create many bills concurrently and yield results as they complete.
+        An error for one bill is returned in its result and does not stop the others.
+        Bills are read from the iterable lazily, so it can be a generator.
+
+        :param bills: Iterable[Mapping[str, Any]] - Keyword arguments of create_bill for every bill
+        :param max_workers: int - Maximum number of simultaneous requests. Keep it within pool_maxsize of the
+            client to reuse connections. Default: 10
+        :param rate_limit: Optional[float] - Maximum number of requests per second. Default: unlimited
+        :param stats: Optional[bulk.BulkStats] - Updated with the number of created bills, errors and throughput
+        :return: Iterator[bulk.BulkResult] - Results with models.BillCreate, in the order of completion
+        """
+
+        return bulk.run_as_completed(lambda bill: self.create_bill(**bill), bills, max_workers, rate_limit, stats)
 
     def toggle_bill_activity(self, bill_id: str, active: bool) -> BillToggleActivity:
         """
@@ -109,12 +400,10 @@ class Cardlinky:
             "id": bill_id,
             "active": int(active),
         })
-        response["status"] = Status.from_value(response["status"])
-        response["type"] = BillType.from_value(response["type"])
-        response["created_at"] = datetime.datetime.strptime(response["created_at"], "%Y-%m-%d %H:%M:%S")
-        response["currency_in"] = Currency.from_value(response["currency_in"])
+        if self._cache is not None:
+            self._cache.delete(caching.make_key(self._cache_namespace, "bill/status", {"id": bill_id}))
 
-        return BillToggleActivity(**response)
+        return self._decoder.decode_bill_toggle_activity(response)
 
     def get_bill_payments(self, bill_id: str) -> List[Payment]:
         """
@@ -129,14 +418,7 @@ class Cardlinky:
             "id": bill_id,
         })
 
-        for i, payment in enumerate(response["data"]):
-            payment["status"] = Status.from_value(payment["status"])
-            payment["created_at"] = datetime.datetime.strptime(payment["created_at"], "%Y-%m-%d %H:%M:%S")
-            payment["currency_in"] = Currency.from_value(payment["currency_in"])
-            payment["account_currency_code"] = Currency.from_value(payment["account_currency_code"])
-            response["data"][i] = Payment(**payment)
-
-        return response["data"]
+        return self._decoder.decode_payments(response)
 
     def search_bill(self, shop_id: str, start_date: Optional[datetime.datetime] = None,
                     finish_date: Optional[datetime.datetime] = None) -> List[Bill]:
@@ -150,19 +432,49 @@ class Cardlinky:
         :return: List[models.Bill]
         """
 
-        response = self._get("bill/search", {
-            "shop_id": shop_id,
-        } | ({"start_date": start_date.strftime("%Y-%m-%d")} if start_date is not None else {})
-                             | ({"finish_date": finish_date.strftime("%Y-%m-%d")} if finish_date is not None else {}))
+        response = self._get("bill/search", _search_body(shop_id, start_date, finish_date))
+
+        return self._decoder.decode_bills(response)
 
-        for i, bill in enumerate(response["data"]):
-            bill["status"] = Status.from_value(bill["status"])
-            bill["type"] = BillType.from_value(bill["type"])
-            bill["created_at"] = datetime.datetime.strptime(bill["created_at"], "%Y-%m-%d %H:%M:%S")
-            bill["currency_in"] = Currency.from_value(bill["currency_in"])
-            response["data"][i] = Bill(**bill)
+    def search_bill_columns(self, shop_id: str,
+                            start_date: Optional[datetime.datetime] = None,
+                            finish_date: Optional[datetime.datetime] = None) -> columnar.Columns:
+        """
+        Search bills and decode them straight into columns, without building models.
+        Use to_numpy(), to_pandas() or to_arrow() of the result for analytics.
+
+        :param shop_id: str - Unique shop ID
+        :param start_date: Optional[datetime.datetime] - Start date
+        :param finish_date: Optional[datetime.datetime] - End date
+        :return: columnar.Columns
+        """
 
-        return response["data"]
+        response = self._get("bill/search", _search_body(shop_id, start_date, finish_date))
+
+        return columnar.to_columns(response["data"], columnar.BILL_SCHEMA, self._decoder.tz,
+                                   self._decoder.exact_amounts)
+
+    def iter_bills(self, shop_id: str, start_date: datetime.date, finish_date: datetime.date,
+                   window_days: int = 1, max_rows: Optional[int] = None) -> Iterator[Bill]:
+        """
+        Lazily iterate over bills of the date range. The range is fetched in windows of `window_days` days,
+        so only one window is held in memory at a time. Windows bypass the response cache.
+
+        :param shop_id: str - Unique shop ID
+        :param start_date: datetime.date - Start date
+        :param finish_date: datetime.date - End date, inclusive
+        :param window_days: int - Number of days fetched with one request. Default: 1
+        :param max_rows: Optional[int] - If a window returns at least this many rows, it is split in half and
+            fetched again. Default: never split
+        :return: Iterator[models.Bill]
+        """
+
+        def fetch(window_start: datetime.date, window_finish: datetime.date) -> List[Mapping[str, Any]]:
+            body = _search_body(shop_id, window_start, window_finish)
+            return self._get("bill/search", body, cached=False)["data"]
+
+        return pagination.iter_windows(fetch, self._decoder.decode_bill, start_date, finish_date,
+                                       window_days, max_rows)
 
     def get_bill_status(self, bill_id: str) -> BillStatus:
         """
@@ -176,12 +488,22 @@ class Cardlinky:
         response = self._get("bill/status", {
             "id": bill_id,
         })
-        response["status"] = Status.from_value(response["status"])
-        response["type"] = BillType.from_value(response["type"])
-        response["created_at"] = datetime.datetime.strptime(response["created_at"], "%Y-%m-%d %H:%M:%S")
-        response["currency_in"] = Currency.from_value(response["currency_in"])
 
-        return BillStatus(**response)
+        return self._decoder.decode_bill_status(response)
+
+    def get_bill_status_many(self, bill_ids: Iterable[str], max_workers: int = 10,
+                             rate_limit: Optional[float] = None) -> Dict[str, Union[BillStatus, Exception]]:
+        """
+        Get statuses of many bills concurrently.
+        An error for one bill is returned in place of its status and does not stop the others.
+
+        :param bill_ids: Iterable[str] - Unique bill IDs
+        :param max_workers: int - Maximum number of simultaneous requests. Default: 10
+        :param rate_limit: Optional[float] - Maximum number of requests per second. Default: unlimited
+        :return: Dict[str, Union[models.BillStatus, Exception]] - Status or error by bill ID
+        """
+
+        return bulk.map_concurrently(self.get_bill_status, bill_ids, max_workers, rate_limit)
 
     def search_payment(self, shop_id: str, start_date: Optional[datetime.datetime] = None,
                        finish_date: Optional[datetime.datetime] = None) -> List[Payment]:
@@ -195,19 +517,49 @@ class Cardlinky:
         :return: List[models.Payment]
         """
 
-        response = self._get("payment/search", {
-            "shop_id": shop_id,
-        } | ({"start_date": start_date.strftime("%Y-%m-%d")} if start_date is not None else {})
-                             | ({"finish_date": finish_date.strftime("%Y-%m-%d")} if finish_date is not None else {}))
+        response = self._get("payment/search", _search_body(shop_id, start_date, finish_date))
 
-        for i, payment in enumerate(response["data"]):
-            payment["status"] = Status.from_value(payment["status"])
-            payment["created_at"] = datetime.datetime.strptime(payment["created_at"], "%Y-%m-%d %H:%M:%S")
-            payment["currency_in"] = Currency.from_value(payment["currency_in"])
-            payment["account_currency_code"] = Currency.from_value(payment["account_currency_code"])
-            response["data"][i] = Payment(**payment)
+        return self._decoder.decode_payments(response)
 
-        return response["data"]
+    def search_payment_columns(self, shop_id: str,
+                               start_date: Optional[datetime.datetime] = None,
+                               finish_date: Optional[datetime.datetime] = None) -> columnar.Columns:
+        """
+        Search payments and decode them straight into columns, without building models.
+        Use to_numpy(), to_pandas() or to_arrow() of the result for analytics.
+
+        :param shop_id: str - Unique shop ID
+        :param start_date: Optional[datetime.datetime] - Start date
+        :param finish_date: Optional[datetime.datetime] - End date
+        :return: columnar.Columns
+        """
+
+        response = self._get("payment/search", _search_body(shop_id, start_date, finish_date))
+
+        return columnar.to_columns(response["data"], columnar.PAYMENT_SCHEMA, self._decoder.tz,
+                                   self._decoder.exact_amounts)
+
+    def iter_payments(self, shop_id: str, start_date: datetime.date, finish_date: datetime.date,
+                      window_days: int = 1, max_rows: Optional[int] = None) -> Iterator[Payment]:
+        """
+        Lazily iterate over payments of the date range. The range is fetched in windows of `window_days` days,
+        so only one window is held in memory at a time. Windows bypass the response cache.
+
+        :param shop_id: str - Unique shop ID
+        :param start_date: datetime.date - Start date
+        :param finish_date: datetime.date - End date, inclusive
+        :param window_days: int - Number of days fetched with one request. Default: 1
+        :param max_rows: Optional[int] - If a window returns at least this many rows, it is split in half and
+            fetched again. Default: never split
+        :return: Iterator[models.Payment]
+        """
+
+        def fetch(window_start: datetime.date, window_finish: datetime.date) -> List[Mapping[str, Any]]:
+            body = _search_body(shop_id, window_start, window_finish)
+            return self._get("payment/search", body, cached=False)["data"]
+
+        return pagination.iter_windows(fetch, self._decoder.decode_payment, start_date, finish_date,
+                                       window_days, max_rows)
 
     def get_payment_status(self, payment_id: str) -> PaymentStatus:
         """
@@ -221,11 +573,22 @@ class Cardlinky:
         response = self._get("payment/status", {
             "id": payment_id,
         })
-        response["status"] = Status.from_value(response["status"])
-        response["created_at"] = datetime.datetime.strptime(response["created_at"], "%Y-%m-%d %H:%M:%S")
-        response["currency_in"] = Currency.from_value(response["currency_in"])
 
-        return PaymentStatus(**response)
+        return self._decoder.decode_payment_status(response)
+
+    def get_payment_status_many(self, payment_ids: Iterable[str], max_workers: int = 10,
+                                rate_limit: Optional[float] = None) -> Dict[str, Union[PaymentStatus, Exception]]:
+        """
+        Get statuses of many payments concurrently.
+        An error for one payment is returned in place of its status and does not stop the others.
+
+        :param payment_ids: Iterable[str] - Unique payment IDs
+        :param max_workers: int - Maximum number of simultaneous requests. Default: 10
+        :param rate_limit: Optional[float] - Maximum number of requests per second. Default: unlimited
+        :return: Dict[str, Union[models.PaymentStatus, Exception]] - Status or error by payment ID
+        """
+
+        return bulk.map_concurrently(self.get_payment_status, payment_ids, max_workers, rate_limit)
 
     def get_balance(self) -> List[Balance]:
         """
@@ -238,13 +601,10 @@ class Cardlinky:
 
         response = self._get("merchant/balance", {})
 
-        for i, balance in enumerate(response["balances"]):
-            balance["currency"] = Currency.from_value(balance["currency"])
-            response["balances"][i] = Balance(**balance)
+        return self._decoder.decode_balances(response)
 
-        return response["balances"]
-
-    def create_personal_payout(self, amount: float, payout_account_id: str) -> List[Payout]:
+    def create_personal_payout(self, amount: float, payout_account_id: str,
+                               idempotency_key: Optional[str] = None) -> List[Payout]:
         """
         In order to withdraw money you need to create a payout.
         The amount of payout can be split depending on payout account type.
@@ -253,24 +613,22 @@ class Cardlinky:
 
         :param amount: float - Payout amount
         :param payout_account_id: str - Unique ID of payout account. Money will be sent to this account
+        :param idempotency_key: Optional[str] - Your unique ID of this payout. A payout with a known key is not
+            created again, the stored result is returned instead
         :return: List[Payout]
+        :raises idempotency.AmbiguousResultError: If an earlier request with this key failed with an unknown result
         """
 
-        response = self._post("payout/personal/create", {
+        response = self._post_once("payout/personal/create", {
             "amount": amount,
             "payout_account_id": payout_account_id,
-        })
-
-        for i, payout in enumerate(response["data"]):
-            payout["payout"] = Status.from_value(payout["payout"])
-            payout["currency"] = Currency.from_value(payout["currency"])
-            payout["created_at"] = datetime.datetime.strptime(payout["created_at"], "%Y-%m-%d %H:%M:%S")
-            response["balances"][i] = Balance(**payout)
+        }, _payout_key(idempotency_key) if idempotency_key is not None else None)
 
-        return response["data"]
+        return self._decoder.decode_payouts(response)
 
     def create_regular_payout(self, amount: float, currency: Currency, account_type: AccountType,
-                              account_identifier: str, card_holder: str) -> List[Payout]:
+                              account_identifier: str, card_holder: str,
+                              idempotency_key: Optional[str] = None) -> List[Payout]:
         """
         Attention: You need to request access to this API method from Support Team.
         Payout to cards using your account balance.
@@ -282,24 +640,17 @@ class Cardlinky:
         :param account_type: models.AccountType - Account type for payout
         :param account_identifier: str - Account ID
         :param card_holder: str - Cardholder name. Only for account_type=models.AccountType.CREDIT_CARD.
+        :param idempotency_key: Optional[str] - Your unique ID of this payout. A payout with a known key is not
+            created again, the stored result is returned instead
         :return: List[Payout]
+        :raises idempotency.AmbiguousResultError: If an earlier request with this key failed with an unknown result
         """
 
-        response = self._post("payout/regular/create", {
-            "amount": amount,
-            "currency": currency.value,
-            "account_type": account_type.value,
-            "account_identifier": account_identifier,
-            "card_holder": card_holder,
-        })
-
-        for i, payout in enumerate(response["data"]):
-            payout["payout"] = Status.from_value(payout["payout"])
-            payout["currency"] = Currency.from_value(payout["currency"])
-            payout["created_at"] = datetime.datetime.strptime(payout["created_at"], "%Y-%m-%d %H:%M:%S")
-            response["balances"][i] = Balance(**payout)
+        response = self._post_once("payout/regular/create", _regular_payout_body(
+            amount, currency, account_type, account_identifier, card_holder,
+        ), _payout_key(idempotency_key) if idempotency_key is not None else None)
 
-        return response["data"]
+        return self._decoder.decode_payouts(response)
 
     def search_payout(self, start_date: Optional[datetime.datetime] = None,
                       finish_date: Optional[datetime.datetime] = None) -> List[Payout]:
@@ -312,17 +663,46 @@ class Cardlinky:
         :return: List[models.Payout]
         """
 
-        response = self._get("payout/search", {}
-                             | ({"start_date": start_date.strftime("%Y-%m-%d")} if start_date is not None else {})
-                             | ({"finish_date": finish_date.strftime("%Y-%m-%d")} if finish_date is not None else {}))
+        response = self._get("payout/search", _search_body(None, start_date, finish_date))
+
+        return self._decoder.decode_payouts(response)
+
+    def search_payout_columns(self, start_date: Optional[datetime.datetime] = None,
+                              finish_date: Optional[datetime.datetime] = None) -> columnar.Columns:
+        """
+        Search payouts and decode them straight into columns, without building models.
+        Use to_numpy(), to_pandas() or to_arrow() of the result for analytics.
+
+        :param start_date: Optional[datetime.datetime] - Start date
+        :param finish_date: Optional[datetime.datetime] - End date
+        :return: columnar.Columns
+        """
+
+        response = self._get("payout/search", _search_body(None, start_date, finish_date))
+
+        return columnar.to_columns(response["data"], columnar.PAYOUT_SCHEMA, self._decoder.tz,
+                                   self._decoder.exact_amounts)
+
+    def iter_payouts(self, start_date: datetime.date, finish_date: datetime.date,
+                     window_days: int = 1, max_rows: Optional[int] = None) -> Iterator[Payout]:
+        """
+        Lazily iterate over payouts of the date range. The range is fetched in windows of `window_days` days,
+        so only one window is held in memory at a time. Windows bypass the response cache.
+
+        :param start_date: datetime.date - Start date
+        :param finish_date: datetime.date - End date, inclusive
+        :param window_days: int - Number of days fetched with one request. Default: 1
+        :param max_rows: Optional[int] - If a window returns at least this many rows, it is split in half and
+            fetched again. Default: never split
+        :return: Iterator[models.Payout]
+        """
 
-        for i, payout in enumerate(response["data"]):
-            payout["payout"] = Status.from_value(payout["payout"])
-            payout["currency"] = Currency.from_value(payout["currency"])
-            payout["created_at"] = datetime.datetime.strptime(payout["created_at"], "%Y-%m-%d %H:%M:%S")
-            response["balances"][i] = Balance(**payout)
+        def fetch(window_start: datetime.date, window_finish: datetime.date) -> List[Mapping[str, Any]]:
+            body = _search_body(None, window_start, window_finish)
+            return self._get("payout/search", body, cached=False)["data"]
 
-        return response["data"]
+        return pagination.iter_windows(fetch, self._decoder.decode_payout, start_date, finish_date,
+                                       window_days, max_rows)
 
     def get_payout_status(self, payout_id: str) -> PayoutStatus:
         """
@@ -336,8 +716,5 @@ class Cardlinky:
         response = self._get("payout/status", {
             "id": payout_id,
         })
-        response["status"] = Status.from_value(response["status"])
-        response["currency"] = Currency.from_value(response["currency_in"])
-        response["created_at"] = datetime.datetime.strptime(response["created_at"], "%Y-%m-%d %H:%M:%S")
 
-        return PayoutStatus(**response)
+        return self._decoder.decode_payout_status(response)
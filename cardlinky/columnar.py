@@ -0,0 +1,182 @@
+import array
+import datetime
+from typing import Mapping, Any, Dict, List, Sequence, Tuple, Type, Union, Optional
+
+from cardlinky import money
+from cardlinky.decoding import parse_datetime
+from cardlinky.types.enums.enum import Enum
+from cardlinky.types.enums.status import Status
+from cardlinky.types.enums.currency import Currency
+from cardlinky.types.enums.bill_type import BillType
+
+
+# Column kinds: str and Optional values are kept in lists, numbers in typed arrays,
+# enums as int8 codes into Columns.categories
+_STR = "str"
+_OBJECT = "object"
+_FLOAT = "float"
+_BOOL = "bool"
+_DATETIME = "datetime"
+
+_Kind = Union[str, Type[Enum]]
+_Schema = Sequence[Tuple[str, _Kind]]
+
+BILL_SCHEMA: _Schema = (
+    ("id", _STR),
+    ("status", Status),
+    ("active", _BOOL),
+    ("amount", _FLOAT),
+    ("type", BillType),
+    ("currency_in", Currency),
+    ("created_at", _DATETIME),
+)
+
+PAYMENT_SCHEMA: _Schema = (
+    ("id", _STR),
+    ("bill_id", _STR),
+    ("status", Status),
+    ("amount", _FLOAT),
+    ("commission", _FLOAT),
+    ("currency_in", Currency),
+    ("account_amount", _FLOAT),
+    ("account_currency_code", Currency),
+    ("from_card", _STR),
+    ("created_at", _DATETIME),
+    ("error_code", _OBJECT),
+    ("error_message", _OBJECT),
+)
+
+PAYOUT_SCHEMA: _Schema = (
+    ("id", _STR),
+    ("status", Status),
+    ("amount", _FLOAT),
+    ("commission", _FLOAT),
+    ("account_identifier", _STR),
+    ("currency", Currency),
+    ("created_at", _DATETIME),
+)
+
+
+def _enum_codes(enum: Type[Enum]) -> Dict[str, int]:
+    positions = {member: i for i, member in enumerate(enum)}
+    return {value: positions[member] for value, member in enum._index().items()}
+
+
+class Columns(Dict[str, Union[List[Any], array.array]]):
+    """
+    Search results as columns: a dict of column name to values.
+    Amounts are float64 arrays, or int64 arrays of minor units with exact amounts. Flags are int8 arrays,
+    timestamps are lists of datetime.datetime.
+    Enum columns are int8 arrays of codes into `categories[column]`, -1 means an unknown value.
+    """
+
+    def __init__(self, categories: Mapping[str, List[str]]):
+        super().__init__()
+        self.categories: Dict[str, List[str]] = dict(categories)
+
+    @property
+    def rows(self) -> int:
+        """
+        Number of rows.
+        """
+
+        return len(next(iter(self.values()))) if self else 0
+
+    def to_numpy(self) -> "numpy.ndarray":
+        """
+        Convert to a NumPy structured array. Enum columns keep their int8 codes. Requires numpy.
+        """
+
+        import numpy
+
+        dtypes = []
+        for name, values in self.items():
+            if isinstance(values, array.array):
+                dtypes.append((name, {"d": "f8", "q": "i8", "b": "i1"}[values.typecode]))
+            elif name == "created_at":
+                dtypes.append((name, "datetime64[s]"))
+            else:
+                dtypes.append((name, "O"))
+
+        result = numpy.empty(self.rows, dtype=dtypes)
+        for name, values in self.items():
+            result[name] = numpy.asarray(values, dtype=result.dtype[name])
+        return result
+
+    def to_pandas(self) -> "pandas.DataFrame":
+        """
+        Convert to a pandas DataFrame. Enum columns become categoricals. Requires pandas.
+        """
+
+        import numpy
+        import pandas
+
+        data = {}
+        for name, values in self.items():
+            if name in self.categories:
+                data[name] = pandas.Categorical.from_codes(numpy.asarray(values), self.categories[name])
+            elif isinstance(values, array.array) and values.typecode == "b":
+                data[name] = numpy.asarray(values, dtype=bool)
+            else:
+                data[name] = numpy.asarray(values) if isinstance(values, array.array) else values
+        return pandas.DataFrame(data)
+
+    def to_arrow(self) -> "pyarrow.Table":
+        """
+        Convert to a pyarrow Table. Enum columns become dictionary arrays. Requires pyarrow.
+        """
+
+        import pyarrow
+
+        data = {}
+        for name, values in self.items():
+            if name in self.categories:
+                indices = pyarrow.array([code if code >= 0 else None for code in values], type=pyarrow.int8())
+                data[name] = pyarrow.DictionaryArray.from_arrays(indices, self.categories[name])
+            elif isinstance(values, array.array) and values.typecode == "b":
+                data[name] = pyarrow.array(values, type=pyarrow.bool_())
+            else:
+                data[name] = pyarrow.array(values)
+        return pyarrow.table(data)
+
+
+def _currency_field(schema: _Schema, name: str) -> str:
+    # account_amount of payments is in the account currency, other amounts are in the currency of the row
+    if name == "account_amount":
+        return "account_currency_code"
+    return next(field for field, kind in schema if kind is Currency)
+
+
+def to_columns(rows: Sequence[Mapping[str, Any]], schema: _Schema,
+               tz: Optional[datetime.tzinfo] = None, minor_units: bool = False) -> Columns:
+    """
+    Decode raw rows of a search response straight into columns, without building models.
+
+    :param rows: Sequence[Mapping] - Rows of response["data"]
+    :param schema: Sequence[Tuple[str, kind]] - BILL_SCHEMA, PAYMENT_SCHEMA or PAYOUT_SCHEMA
+    :param tz: Optional[datetime.tzinfo] - Timezone attached to timestamps. Default: naive datetimes
+    :param minor_units: bool - Store amounts as exact integers in minor units of their currency. Default: False
+    :return: Columns
+    """
+
+    columns = Columns({name: [member.value for member in kind] for name, kind in schema if not isinstance(kind, str)})
+    for name, kind in schema:
+        if kind == _STR:
+            columns[name] = [row[name] for row in rows]
+        elif kind == _OBJECT:
+            columns[name] = [row.get(name) for row in rows]
+        elif kind == _FLOAT and minor_units:
+            currency = _currency_field(schema, name)
+            columns[name] = array.array("q", [money.to_minor(row[name], row[currency]) for row in rows])
+        elif kind == _FLOAT:
+            columns[name] = array.array("d", [row[name] for row in rows])
+        elif kind == _BOOL:
+            columns[name] = array.array("b", [bool(row[name]) for row in rows])
+        elif kind == _DATETIME:
+            columns[name] = [parse_datetime(row[name], tz) for row in rows]
+        else:
+            codes = _enum_codes(kind)
+            columns[name] = array.array("b", [
+                codes[row[name]] if row[name] in codes else codes.get(row[name].lower(), -1) for row in rows
+            ])
+    return columns
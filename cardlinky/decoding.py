@@ -0,0 +1,226 @@
+import datetime
+import functools
+from typing import Mapping, MutableMapping, Any, List, Type, TypeVar, Optional, Tuple, Callable
+from pydantic import BaseModel
+
+from cardlinky import money
+
+from cardlinky.types.models.balance import Balance
+from cardlinky.types.models.payout import Payout, PayoutStatus
+from cardlinky.types.models.payment import Payment, PaymentStatus
+from cardlinky.types.models.bill import Bill, BillCreate, BillStatus, BillToggleActivity
+from cardlinky.types.models.postback import Postback
+from cardlinky.types.enums.status import Status
+from cardlinky.types.enums.currency import Currency
+from cardlinky.types.enums.bill_type import BillType
+from cardlinky.types.enums.enum import Enum
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_datetime(value: str, tz: Optional[datetime.tzinfo] = None) -> datetime.datetime:
+    """
+    Parse a Cardlink timestamp like '2023-04-01 10:00:00'.
+    Results are cached, because payments of one bill and rows of one search often share timestamps.
+
+    :param value: str - Timestamp
+    :param tz: Optional[datetime.tzinfo] - Timezone to attach. Default: naive datetime
+    :return: datetime.datetime
+    """
+
+    # fromisoformat is implemented in C and is many times faster than strptime for this fixed format
+    if len(value) == 19 and value[10] == " ":
+        result = datetime.datetime.fromisoformat(value)
+    else:
+        result = datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+    return result if tz is None else result.replace(tzinfo=tz)
+
+
+_M = TypeVar("_M", bound=BaseModel)
+
+# Amount fields of every model, converted to Decimal with exact amounts
+_AMOUNTS: Mapping[type, Tuple[str, ...]] = {
+    Bill: ("amount",),
+    BillCreate: (),
+    BillStatus: ("amount",),
+    BillToggleActivity: ("amount",),
+    Payment: ("amount", "commission", "account_amount"),
+    PaymentStatus: ("amount", "commission", "account_amount"),
+    Balance: ("balance_available", "balance_locked", "balance_hold"),
+    Payout: ("amount", "commission"),
+    PayoutStatus: ("amount", "commission"),
+    Postback: ("out_sum", "commission", "balance_amount"),
+}
+
+
+_FALSE = frozenset(("0", "off", "f", "false", "n", "no"))
+
+
+def _to_bool(value: Any) -> bool:
+    # Same as the pydantic bool validator for the values the API sends: true/false, 1/0 and their strings
+    if isinstance(value, str):
+        return value.lower() not in _FALSE
+    return bool(value)
+
+
+@functools.lru_cache(maxsize=None)
+def _construct_fields(model: Type[BaseModel]) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, Callable[[Any], Any]], ...]]:
+    """
+    Declared fields of a model, and the conversions model.construct needs: booleans and enums.
+    Other values are trusted as they are.
+    """
+
+    conversions = []
+    for name, field in model.__fields__.items():
+        if field.type_ is bool:
+            conversions.append((name, _to_bool))
+        elif isinstance(field.type_, type) and issubclass(field.type_, Enum):
+            conversions.append((name, field.type_.from_value))
+    return tuple(model.__fields__), tuple(conversions)
+
+
+class Decoder:
+    """
+    Turns API responses into models.
+
+    :param validate: bool - Validate every field with pydantic. If False, models are built without validation,
+        which is several times faster but trusts the API to return correct types. Only booleans and enums are
+        converted then, and keys that the model does not declare are dropped. Default: True
+    :param tz: Optional[datetime.tzinfo] - Timezone attached to parsed timestamps. Default: naive datetimes
+    :param exact_amounts: bool - Decode amounts into decimal.Decimal instead of float. Models declare amounts
+        as Union[float, Decimal] with pydantic smart unions, so validation keeps the Decimal. Default: False
+    """
+
+    def __init__(self, validate: bool = True, tz: Optional[datetime.tzinfo] = None, exact_amounts: bool = False):
+        self._validate: bool = validate
+        self._tz: Optional[datetime.tzinfo] = tz
+        self._exact_amounts: bool = exact_amounts
+
+    @property
+    def tz(self) -> Optional[datetime.tzinfo]:
+        return self._tz
+
+    @property
+    def exact_amounts(self) -> bool:
+        return self._exact_amounts
+
+    def _build(self, model: Type[_M], fields: MutableMapping[str, Any]) -> _M:
+        if self._exact_amounts:
+            money.to_decimals(fields, _AMOUNTS[model])
+        if self._validate:
+            return model(**fields)
+
+        # construct keeps whatever it is given, so undeclared keys are dropped and raw booleans and enums converted
+        names, conversions = _construct_fields(model)
+        values = {name: fields[name] for name in names if name in fields}
+        for name, convert in conversions:
+            value = values.get(name)
+            if value is not None and not isinstance(value, (bool, Enum)):
+                values[name] = convert(value)
+        return model.construct(**values)
+
+    def decode_bill_create(self, response: Mapping[str, Any]) -> BillCreate:
+        return self._build(BillCreate, response)
+
+    def decode_bill(self, bill: Mapping[str, Any]) -> Bill:
+        return self._build(Bill, {
+            **bill,
+            "status": Status.from_value(bill["status"]),
+            "type": BillType.from_value(bill["type"]),
+            "created_at": parse_datetime(bill["created_at"], self._tz),
+            "currency_in": Currency.from_value(bill["currency_in"]),
+        })
+
+    def decode_bill_status(self, response: Mapping[str, Any]) -> BillStatus:
+        return self._build(BillStatus, {
+            **response,
+            "status": Status.from_value(response["status"]),
+            "type": BillType.from_value(response["type"]),
+            "created_at": parse_datetime(response["created_at"], self._tz),
+            "currency_in": Currency.from_value(response["currency_in"]),
+        })
+
+    def decode_bill_toggle_activity(self, response: Mapping[str, Any]) -> BillToggleActivity:
+        return self._build(BillToggleActivity, {
+            **response,
+            "status": Status.from_value(response["status"]),
+            "type": BillType.from_value(response["type"]),
+            "created_at": parse_datetime(response["created_at"], self._tz),
+            "currency_in": Currency.from_value(response["currency_in"]),
+        })
+
+    def decode_payment(self, payment: Mapping[str, Any]) -> Payment:
+        return self._build(Payment, {
+            **payment,
+            "status": Status.from_value(payment["status"]),
+            "created_at": parse_datetime(payment["created_at"], self._tz),
+            "currency_in": Currency.from_value(payment["currency_in"]),
+            "account_currency_code": Currency.from_value(payment["account_currency_code"]),
+        })
+
+    def decode_payment_status(self, response: Mapping[str, Any]) -> PaymentStatus:
+        return self._build(PaymentStatus, {
+            **response,
+            "status": Status.from_value(response["status"]),
+            "created_at": parse_datetime(response["created_at"], self._tz),
+            "currency_in": Currency.from_value(response["currency_in"]),
+        })
+
+    def decode_balance(self, balance: Mapping[str, Any]) -> Balance:
+        return self._build(Balance, {
+            **balance,
+            "currency": Currency.from_value(balance["currency"]),
+        })
+
+    def decode_payout(self, payout: Mapping[str, Any]) -> Payout:
+        return self._build(Payout, {
+            **payout,
+            "status": Status.from_value(payout["status"]),
+            "currency": Currency.from_value(payout["currency"]),
+            "created_at": parse_datetime(payout["created_at"], self._tz),
+        })
+
+    def decode_payout_status(self, response: Mapping[str, Any]) -> PayoutStatus:
+        return self._build(PayoutStatus, {
+            **response,
+            "status": Status.from_value(response["status"]),
+            "currency": Currency.from_value(response["currency_in"]),
+            "created_at": parse_datetime(response["created_at"], self._tz),
+        })
+
+    def decode_postback(self, form: Mapping[str, str]) -> Postback:
+        # Postbacks are form-encoded, so every value is a string and empty strings mean missing values
+        def optional(name: str) -> Optional[str]:
+            return form.get(name) or None
+
+        amount = money.to_decimal if self._exact_amounts else float
+        balance_amount, balance_currency, error_code = (
+            optional("BalanceAmount"), optional("BalanceCurrency"), optional("ErrorCode")
+        )
+        return self._build(Postback, {
+            "status": Status.from_value(form["Status"]),
+            "inv_id": form["InvId"],
+            "out_sum": amount(form["OutSum"]),
+            "commission": amount(form.get("Commission") or 0),
+            "currency_in": Currency.from_value(form["CurrencyIn"]),
+            "trs_id": form["TrsId"],
+            "custom": optional("custom"),
+            "account_number": optional("AccountNumber"),
+            "account_type": optional("AccountType"),
+            "balance_amount": amount(balance_amount) if balance_amount is not None else None,
+            "balance_currency": Currency.from_value(balance_currency) if balance_currency is not None else None,
+            "error_code": int(error_code) if error_code is not None else None,
+            "error_message": optional("ErrorMessage"),
+            "signature_value": form["SignatureValue"],
+        })
+
+    def decode_bills(self, response: Mapping[str, Any]) -> List[Bill]:
+        return [self.decode_bill(bill) for bill in response["data"]]
+
+    def decode_payments(self, response: Mapping[str, Any]) -> List[Payment]:
+        return [self.decode_payment(payment) for payment in response["data"]]
+
+    def decode_balances(self, response: Mapping[str, Any]) -> List[Balance]:
+        return [self.decode_balance(balance) for balance in response["balances"]]
+
+    def decode_payouts(self, response: Mapping[str, Any]) -> List[Payout]:
+        return [self.decode_payout(payout) for payout in response["data"]]
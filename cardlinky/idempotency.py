@@ -0,0 +1,175 @@
+import json
+import hashlib
+from typing import Callable, Awaitable, Optional, Mapping, Any
+
+from cardlinky.cache import Cache, MemoryCache
+from cardlinky.singleflight import SingleFlight, AsyncSingleFlight
+
+
+_DONE = "done"
+_UNKNOWN = "unknown"
+_PENDING = "pending"
+
+_Response = Mapping[str, Any]
+
+
+class AmbiguousResultError(Exception):
+    """
+    A previous attempt with the same idempotency key failed after the request was sent,
+    so the operation may or may not have been performed.
+    Check its result in your Cardlink account and call Cardlinky.forget_idempotency_key before trying again.
+    """
+
+    def __init__(self, key: str):
+        super().__init__(f"Result of a previous request with idempotency key {key!r} is unknown")
+        self.key: str = key
+
+
+class InProgressError(AmbiguousResultError):
+    """
+    A request with the same idempotency key is being sent by another process sharing the store,
+    or that process stopped before recording its result. Try again later. If the other process is gone,
+    check the result in your Cardlink account and forget the key before trying again.
+    """
+
+    def __init__(self, key: str):
+        Exception.__init__(self, f"A request with idempotency key {key!r} is in progress")
+        self.key: str = key
+
+
+class IdempotencyKeyMismatchError(ValueError):
+    """
+    The idempotency key was already used for a request with a different body, for example a bill with the same
+    order_id but another amount. The stored result belongs to the other request, so it is not returned.
+    """
+
+    def __init__(self, key: str):
+        super().__init__(f"Idempotency key {key!r} was used for a request with a different body")
+        self.key: str = key
+
+
+def _body_hash(body: Optional[Mapping[str, Any]]) -> Optional[str]:
+    if body is None:
+        return None
+    return hashlib.sha256(json.dumps(body, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+
+class IdempotencyLedger:
+    """
+    Remembers create requests by idempotency key, so a retried or parallel request with the same key
+    is performed at most once.
+    Before a request is sent, its key is reserved in the store with Cache.add. Concurrent requests with one key
+    in one process share one API call; in other processes sharing the store they raise InProgressError.
+    Finished requests return the stored response. Requests that failed with an API error or before connecting
+    release the key and can be retried. Requests that failed after being sent, for example with a read timeout,
+    are marked unknown and raise AmbiguousResultError until they are forgotten.
+    A hash of the request body is stored with the key, reusing the key with another body raises
+    IdempotencyKeyMismatchError.
+
+    :param store: Optional[cache.Cache] - Where results are kept. A backend shared between processes deduplicates
+        between them only if its add() is atomic. Default: cache.MemoryCache(maxsize=100000)
+    :param ttl: Optional[float] - Seconds to remember results and reservations. None remembers until eviction.
+        Default: 86400
+    """
+
+    def __init__(self, store: Optional[Cache] = None, ttl: Optional[float] = 86400):
+        self._store: Cache = store if store is not None else MemoryCache(maxsize=100_000)
+        self._ttl: Optional[float] = ttl
+        self._single_flight: SingleFlight = SingleFlight()
+        self._async_single_flight: AsyncSingleFlight = AsyncSingleFlight()
+
+    def forget(self, key: str) -> None:
+        """
+        Forget a key, so the next request with it is sent again.
+        The clients namespace their keys, use Cardlinky.forget_idempotency_key to forget a key of a client.
+
+        :param key: str - Key as stored, like AmbiguousResultError.key
+        """
+
+        self._store.delete(key)
+
+    def _lookup(self, key: str, body_hash: Optional[str]) -> Optional[_Response]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+
+        state, response, stored_hash = entry
+        if body_hash is not None and stored_hash is not None and body_hash != stored_hash:
+            raise IdempotencyKeyMismatchError(key)
+        if state == _PENDING:
+            raise InProgressError(key)
+        if state == _UNKNOWN:
+            raise AmbiguousResultError(key)
+        return response
+
+    def _reserve(self, key: str, body_hash: Optional[str]) -> Optional[_Response]:
+        # Returns the stored response, or None if the key was reserved for this call
+        while True:
+            response = self._lookup(key, body_hash)
+            if response is not None:
+                return response
+            if self._store.add(key, (_PENDING, None, body_hash), self._ttl):
+                return None
+
+    def _record_error(self, key: str, body_hash: Optional[str], error: Exception,
+                      is_ambiguous: Callable[[Exception], bool]) -> None:
+        if is_ambiguous(error):
+            self._store.set(key, (_UNKNOWN, None, body_hash), self._ttl)
+        else:
+            self._store.delete(key)
+
+    def run(self, key: str, function: Callable[[], _Response],
+            is_ambiguous: Callable[[Exception], bool], body: Optional[Mapping[str, Any]] = None) -> _Response:
+        """
+        :param key: str - Idempotency key
+        :param function: Callable - Sends the request and returns the response
+        :param is_ambiguous: Callable - Tells if an error leaves the result of the request unknown
+        :param body: Optional[Mapping] - Body of the request, compared with the body of earlier requests with the key.
+            Default: not compared
+        :return: Response of this or an earlier request with the key
+        :raises AmbiguousResultError: If an earlier request with the key has an unknown result
+        :raises InProgressError: If a request with the key is being sent by another process
+        :raises IdempotencyKeyMismatchError: If an earlier request with the key had a different body
+        """
+
+        body_hash = _body_hash(body)
+
+        def call() -> _Response:
+            response = self._reserve(key, body_hash)
+            if response is not None:
+                return response
+
+            try:
+                response = function()
+            except BaseException as e:
+                self._record_error(key, body_hash, e, is_ambiguous)
+                raise
+            self._store.set(key, (_DONE, response, body_hash), self._ttl)
+            return response
+
+        # Calls with different bodies are not coalesced, the second one finds the key reserved and raises
+        return self._single_flight.do(f"{key}#{body_hash}", call)
+
+    async def run_async(self, key: str, function: Callable[[], Awaitable[_Response]],
+                        is_ambiguous: Callable[[Exception], bool],
+                        body: Optional[Mapping[str, Any]] = None) -> _Response:
+        """
+        Asynchronous version of run.
+        """
+
+        body_hash = _body_hash(body)
+
+        async def call() -> _Response:
+            response = self._reserve(key, body_hash)
+            if response is not None:
+                return response
+
+            try:
+                response = await function()
+            except BaseException as e:
+                self._record_error(key, body_hash, e, is_ambiguous)
+                raise
+            self._store.set(key, (_DONE, response, body_hash), self._ttl)
+            return response
+
+        return await self._async_single_flight.do(f"{key}#{body_hash}", call)
@@ -0,0 +1,298 @@
+import time
+import bisect
+import threading
+from typing import Sequence, NamedTuple, Dict, List, Tuple, Any
+
+
+# Upper bounds of latency buckets in seconds
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class ResponseEvent(NamedTuple):
+    """
+    :param method: str - HTTP method
+    :param path: str - Endpoint path, like "payment/search"
+    :param status: int - HTTP status
+    :param attempt: int - Number of retries made before this attempt, 0 for the first one
+    :param request_bytes: int - Size of the request body
+    :param response_bytes: int - Size of the response body
+    :param headers_seconds: float - Seconds until the response headers were received: connection, upload
+        and server time
+    :param seconds: float - Seconds until the whole response was received
+    """
+
+    method: str
+    path: str
+    status: int
+    attempt: int
+    request_bytes: int
+    response_bytes: int
+    headers_seconds: float
+    seconds: float
+
+
+class Sink:
+    """
+    Receives events of API calls. Override the methods you need, the others do nothing.
+    Methods are called in the thread or task that makes the request, so they should be fast.
+    """
+
+    def on_request(self, method: str, path: str, body: bytes, attempt: int) -> None:
+        """
+        Called before every attempt to send a request.
+        """
+
+    def on_response(self, event: ResponseEvent) -> None:
+        """
+        Called for every received response, including retried ones.
+        """
+
+    def on_error(self, method: str, path: str, error: Exception) -> None:
+        """
+        Called for failed connections, timeouts, invalid responses and API errors.
+        """
+
+    def on_parse(self, path: str, size: int, seconds: float) -> None:
+        """
+        Called after a response of `size` bytes was parsed from JSON.
+        """
+
+    def on_decode(self, model: str, rows: int, seconds: float) -> None:
+        """
+        Called after a response was decoded to models, `model` is like "payments" or "bill_status".
+        """
+
+
+class Instrumentation(Sink):
+    """
+    Sends events to several sinks.
+
+    :param sinks: Sink - Sinks to send events to
+    """
+
+    def __init__(self, *sinks: Sink):
+        self._sinks: List[Sink] = list(sinks)
+
+    def add(self, sink: Sink) -> None:
+        """
+        :param sink: Sink - Sink to send events to
+        """
+
+        self._sinks.append(sink)
+
+    def on_request(self, method: str, path: str, body: bytes, attempt: int) -> None:
+        for sink in self._sinks:
+            sink.on_request(method, path, body, attempt)
+
+    def on_response(self, event: ResponseEvent) -> None:
+        for sink in self._sinks:
+            sink.on_response(event)
+
+    def on_error(self, method: str, path: str, error: Exception) -> None:
+        for sink in self._sinks:
+            sink.on_error(method, path, error)
+
+    def on_parse(self, path: str, size: int, seconds: float) -> None:
+        for sink in self._sinks:
+            sink.on_parse(path, size, seconds)
+
+    def on_decode(self, model: str, rows: int, seconds: float) -> None:
+        for sink in self._sinks:
+            sink.on_decode(model, rows, seconds)
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed buckets.
+
+    :param buckets: Sequence[float] - Upper bounds of the buckets in ascending order
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets: Tuple[float, ...] = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """
+        :return: List[Tuple[float, int]] - Upper bound and number of observations up to it, the last bound is inf
+        """
+
+        result, total = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+class Metrics(Sink):
+    """
+    Built-in metrics: latency histograms, request, retry and error counters and byte counts by endpoint,
+    and timings of JSON parsing and model decoding. Export them with to_prometheus().
+
+    :param buckets: Sequence[float] - Upper bounds of latency buckets in seconds. Default: DEFAULT_BUCKETS
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._buckets: Tuple[float, ...] = tuple(buckets)
+        self._lock: threading.Lock = threading.Lock()
+        self.counters: Dict[str, Dict[_Labels, float]] = {}
+        self.histograms: Dict[str, Dict[_Labels, Histogram]] = {}
+
+    def _inc(self, name: str, labels: _Labels, value: float = 1) -> None:
+        series = self.counters.setdefault(name, {})
+        series[labels] = series.get(labels, 0) + value
+
+    def _observe(self, name: str, labels: _Labels, value: float) -> None:
+        series = self.histograms.setdefault(name, {})
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = Histogram(self._buckets)
+        histogram.observe(value)
+
+    def on_response(self, event: ResponseEvent) -> None:
+        endpoint = (("method", event.method), ("path", event.path))
+        with self._lock:
+            self._inc("cardlinky_requests_total", endpoint + (("status", str(event.status)),))
+            if event.attempt:
+                self._inc("cardlinky_retries_total", endpoint)
+            self._inc("cardlinky_request_bytes_total", endpoint, event.request_bytes)
+            self._inc("cardlinky_response_bytes_total", endpoint, event.response_bytes)
+            self._observe("cardlinky_request_duration_seconds", endpoint, event.seconds)
+            self._observe("cardlinky_response_headers_seconds", endpoint, event.headers_seconds)
+
+    def on_error(self, method: str, path: str, error: Exception) -> None:
+        with self._lock:
+            self._inc("cardlinky_errors_total", (("method", method), ("path", path), ("error", type(error).__name__)))
+
+    def on_parse(self, path: str, size: int, seconds: float) -> None:
+        with self._lock:
+            self._observe("cardlinky_parse_duration_seconds", (("path", path),), seconds)
+
+    def on_decode(self, model: str, rows: int, seconds: float) -> None:
+        with self._lock:
+            self._inc("cardlinky_decoded_rows_total", (("model", model),), rows)
+            self._observe("cardlinky_decode_duration_seconds", (("model", model),), seconds)
+
+    def clear(self) -> None:
+        """
+        Reset all metrics.
+        """
+
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """
+        :return: str - Metrics in the Prometheus text exposition format
+        """
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(series.items(), key=lambda item: item[0]):
+                    for bound, count in histogram.cumulative():
+                        le = "+Inf" if bound == float("inf") else _format_value(bound)
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: _Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class OpenTelemetrySink(Sink):
+    """
+    Records metrics with an OpenTelemetry meter, for example `opentelemetry.metrics.get_meter("cardlinky")`.
+    Any object with create_counter and create_histogram methods of the OpenTelemetry metrics API works.
+
+    :param meter: Any - Meter to create instruments with
+    """
+
+    def __init__(self, meter: Any):
+        self._requests = meter.create_counter("cardlinky.requests", unit="{request}")
+        self._retries = meter.create_counter("cardlinky.retries", unit="{request}")
+        self._errors = meter.create_counter("cardlinky.errors", unit="{error}")
+        self._request_bytes = meter.create_counter("cardlinky.request.size", unit="By")
+        self._response_bytes = meter.create_counter("cardlinky.response.size", unit="By")
+        self._duration = meter.create_histogram("cardlinky.request.duration", unit="s")
+        self._headers_duration = meter.create_histogram("cardlinky.response.headers.duration", unit="s")
+        self._parse_duration = meter.create_histogram("cardlinky.parse.duration", unit="s")
+        self._decode_duration = meter.create_histogram("cardlinky.decode.duration", unit="s")
+        self._decoded_rows = meter.create_counter("cardlinky.decode.rows", unit="{row}")
+
+    def on_response(self, event: ResponseEvent) -> None:
+        attributes = {"http.request.method": event.method, "cardlinky.path": event.path}
+        self._requests.add(1, {**attributes, "http.response.status_code": event.status})
+        if event.attempt:
+            self._retries.add(1, attributes)
+        self._request_bytes.add(event.request_bytes, attributes)
+        self._response_bytes.add(event.response_bytes, attributes)
+        self._duration.record(event.seconds, attributes)
+        self._headers_duration.record(event.headers_seconds, attributes)
+
+    def on_error(self, method: str, path: str, error: Exception) -> None:
+        self._errors.add(1, {"http.request.method": method, "cardlinky.path": path,
+                             "error.type": type(error).__name__})
+
+    def on_parse(self, path: str, size: int, seconds: float) -> None:
+        self._parse_duration.record(seconds, {"cardlinky.path": path})
+
+    def on_decode(self, model: str, rows: int, seconds: float) -> None:
+        attributes = {"cardlinky.model": model}
+        self._decode_duration.record(seconds, attributes)
+        self._decoded_rows.add(rows, attributes)
+
+
+class TimedDecoder:
+    """
+    Wraps a decoding.Decoder, reporting the time of every decode_* call to a sink.
+    The clients use it only when instrumentation is enabled.
+
+    :param decoder: decoding.Decoder - Decoder to wrap
+    :param sink: Sink - Sink to report to
+    """
+
+    def __init__(self, decoder: Any, sink: Sink):
+        self._decoder: Any = decoder
+        self._sink: Sink = sink
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._decoder, name)
+        if not name.startswith("decode_"):
+            return attribute
+
+        model, sink = name[len("decode_"):], self._sink
+
+        def decode(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            result = attribute(*args, **kwargs)
+            sink.on_decode(model, len(result) if isinstance(result, list) else 1, time.perf_counter() - started)
+            return result
+
+        return decode
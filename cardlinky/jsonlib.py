@@ -0,0 +1,93 @@
+import json
+from typing import Callable, NamedTuple, Union, Any
+
+
+class JSONBackend(NamedTuple):
+    """
+    JSON serializer used for request bodies and responses.
+
+    :param name: str - Name of the backend
+    :param dumps: Callable[[Any], bytes] - Serializes an object to UTF-8 bytes
+    :param loads: Callable[[Union[bytes, str]], Any] - Parses bytes or a string. Raises ValueError on invalid JSON
+    """
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[Union[bytes, str]], Any]
+
+
+def _stdlib() -> JSONBackend:
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    return JSONBackend("json", lambda obj: encoder.encode(obj).encode(), json.loads)
+
+
+def _orjson() -> JSONBackend:
+    import orjson
+    return JSONBackend("orjson", orjson.dumps, orjson.loads)
+
+
+def _ujson() -> JSONBackend:
+    import ujson
+    return JSONBackend("ujson", lambda obj: ujson.dumps(obj, ensure_ascii=False).encode(), ujson.loads)
+
+
+_BACKENDS = {
+    "orjson": _orjson,
+    "ujson": _ujson,
+    "json": _stdlib,
+}
+
+
+def _default() -> JSONBackend:
+    for load in _BACKENDS.values():
+        try:
+            return load()
+        except ImportError:
+            pass
+    return _stdlib()
+
+
+_backend: JSONBackend = _default()
+
+
+def get_backend() -> JSONBackend:
+    """
+    :return: JSONBackend - Backend in use. By default it is orjson or ujson if installed, or the json module
+    """
+
+    return _backend
+
+
+def set_backend(backend: Union[str, JSONBackend]) -> None:
+    """
+    Set the JSON backend of all clients.
+
+    :param backend: Union[str, JSONBackend] - "orjson", "ujson", "json" or a custom JSONBackend
+    :raises ImportError: If the named backend is not installed
+    """
+
+    global _backend
+    if isinstance(backend, str):
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unknown JSON backend {backend!r}")
+        backend = _BACKENDS[backend]()
+    _backend = backend
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    :param obj: Any - Object to serialize
+    :return: bytes - UTF-8 encoded JSON
+    """
+
+    return _backend.dumps(obj)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    :param data: Union[bytes, str] - JSON document, bytes are parsed without decoding them to a string first
+    :return: Any
+    :raises ValueError: If the document is not valid JSON
+    """
+
+    return _backend.loads(data)
@@ -0,0 +1,187 @@
+import datetime
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Mapping, MutableMapping, Sequence, Iterable, Union, Any, Dict, List, Tuple, TYPE_CHECKING
+
+from cardlinky.types.enums.currency import Currency
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cardlinky.columnar import Columns
+
+
+# Digits after the decimal point of amounts in every currency
+MINOR_UNITS: Mapping[str, int] = {
+    Currency.RUB.value: 2,
+    Currency.USD.value: 2,
+    Currency.EUR.value: 2,
+}
+
+_Amount = Union[float, int, str, Decimal]
+
+
+def _exponent(currency: Union[Currency, str, None]) -> int:
+    return MINOR_UNITS.get(currency.value if isinstance(currency, Currency) else currency, 2)
+
+
+def to_decimal(value: _Amount) -> Decimal:
+    """
+    Exact decimal of an amount. JSON numbers are parsed into floats whose repr is the shortest one that
+    round-trips, so converting through str() gives back the digits the API sent.
+
+    :param value: Union[float, int, str, decimal.Decimal] - Amount
+    :return: decimal.Decimal
+    """
+
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def to_minor(value: _Amount, currency: Union[Currency, str, None] = None) -> int:
+    """
+    Amount in minor units of its currency, like kopecks or cents, rounded half to even.
+
+    :param value: Union[float, int, str, decimal.Decimal] - Amount
+    :param currency: Union[enums.Currency, str, None] - Currency of the amount. Default: 2 decimal digits
+    :return: int
+    """
+
+    exponent = _exponent(currency)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value * 10 ** exponent
+    if isinstance(value, float):
+        # Most amounts have at most `exponent` decimal digits and scale to a whole number up to the float error.
+        # Nothing is rounded for them, so they skip Decimal. Floats with more digits are rounded on the digits of
+        # their repr below, like strings and Decimals, so 1.015 gives 102 in every type
+        scaled = value * 10 ** exponent
+        nearest = round(scaled)
+        if abs(scaled - nearest) < 1e-6:
+            return nearest
+    return int(to_decimal(value).scaleb(exponent).to_integral_value(ROUND_HALF_EVEN))
+
+
+def from_minor(units: int, currency: Union[Currency, str, None] = None) -> Decimal:
+    """
+    :param units: int - Amount in minor units
+    :param currency: Union[enums.Currency, str, None] - Currency of the amount. Default: 2 decimal digits
+    :return: decimal.Decimal - Amount in major units, like rubles or dollars
+    """
+
+    return Decimal(units).scaleb(-_exponent(currency))
+
+
+def to_decimals(fields: MutableMapping[str, Any], names: Iterable[str]) -> MutableMapping[str, Any]:
+    """
+    Convert amounts of a decoded response to decimal.Decimal in place. Missing and None amounts are left as is.
+
+    :param fields: MutableMapping[str, Any] - Fields of a model
+    :param names: Iterable[str] - Names of amount fields
+    :return: The same fields
+    """
+
+    for name in names:
+        value = fields.get(name)
+        if value is not None:
+            fields[name] = to_decimal(value)
+    return fields
+
+
+def _key_column(columns: "Columns", name: str, amount: str) -> Tuple[Sequence[Any], List[Any]]:
+    # Returns values of a grouping column and, for enum columns, labels of their codes
+    if name == "day":
+        return [created_at.date() for created_at in columns["created_at"]], []
+    if name == "currency" and "currency" not in columns:
+        # Like columnar.to_columns: account_amount of payments is in the account currency
+        name = "account_currency_code" if amount == "account_amount" else "currency_in"
+    if name in columns.categories:
+        return columns[name], columns.categories[name]
+    return columns[name], []
+
+
+def sum_by(columns: "Columns", by: Union[str, Sequence[str]],
+           amount: str = "amount") -> Dict[Any, Union[int, float]]:
+    """
+    Sum an amount column of search results by groups, for example by currency, status and day.
+    The whole columns are processed with NumPy if it is installed, otherwise in one pass over the arrays.
+    With exact amounts the columns hold minor units, so the sums are exact integers; convert them with from_minor.
+
+    :param columns: columnar.Columns - Result of search_*_columns
+    :param by: Union[str, Sequence[str]] - Column or columns to group by. "day" groups by the date of created_at,
+        "currency" is the currency of the amount column for payments and bills as well. Enum columns are grouped
+        by their values
+    :param amount: str - Column to sum. Default: amount
+    :return: Dict - Sum by group. Keys are values of one column or tuples of values of several columns
+    """
+
+    names = [by] if isinstance(by, str) else list(by)
+    keys = [_key_column(columns, name, amount) for name in names]
+    values = columns[amount]
+
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    if numpy is not None and len(values):
+        groups = _sum_numpy(numpy, [column for column, _ in keys], values)
+    else:
+        groups = {}
+        for key, value in zip(zip(*(column for column, _ in keys)), values):
+            groups[key] = groups.get(key, 0) + value
+
+    result = {}
+    for key, total in groups.items():
+        key = tuple(
+            (labels[value] if value >= 0 else None) if labels else value for value, (_, labels) in zip(key, keys)
+        )
+        result[key[0] if isinstance(by, str) else key] = total
+    return result
+
+
+def _factorize(numpy: Any, key: Sequence[Any]) -> Tuple[Any, Sequence[Any]]:
+    # Enum codes are already small integers, other values are numbered in the order they appear
+    if hasattr(key, "typecode"):
+        unique, inverse = numpy.unique(numpy.asarray(key), return_inverse=True)
+        return inverse.reshape(-1), unique.tolist()
+
+    index = {}
+    inverse = numpy.fromiter((index.setdefault(value, len(index)) for value in key), numpy.int64, len(key))
+    return inverse, list(index)
+
+
+def _sum_numpy(numpy: Any, keys: List[Sequence[Any]], values: Sequence[Union[int, float]]) -> Dict[tuple, Any]:
+    codes, uniques = zip(*(_factorize(numpy, key) for key in keys))
+    shape = [len(unique) for unique in uniques]
+
+    groups, inverse = numpy.unique(numpy.ravel_multi_index(codes, shape), return_inverse=True)
+    values = numpy.asarray(values)
+    totals = numpy.zeros(len(groups), dtype=values.dtype)
+    numpy.add.at(totals, inverse.reshape(-1), values)
+
+    positions = numpy.unravel_index(groups, shape)
+    return {
+        tuple(unique[position[i]] for unique, position in zip(uniques, positions)): totals[i].item()
+        for i in range(len(groups))
+    }
+
+
+def sum_by_currency(columns: "Columns", amount: str = "amount") -> Dict[str, Union[int, float]]:
+    """
+    :return: Dict[str, Union[int, float]] - Sum of the amount column by currency code
+    """
+
+    return sum_by(columns, "currency", amount)
+
+
+def sum_by_status(columns: "Columns", amount: str = "amount") -> Dict[Tuple[str, str], Union[int, float]]:
+    """
+    :return: Dict[Tuple[str, str], Union[int, float]] - Sum of the amount column by currency code and status
+    """
+
+    return sum_by(columns, ("currency", "status"), amount)
+
+
+def sum_by_day(columns: "Columns",
+               amount: str = "amount") -> Dict[Tuple[str, datetime.date], Union[int, float]]:
+    """
+    :return: Dict[Tuple[str, datetime.date], Union[int, float]] - Sum of the amount column by currency code and day
+    """
+
+    return sum_by(columns, ("currency", "day"), amount)
@@ -0,0 +1,109 @@
+import asyncio
+import itertools
+import functools
+import concurrent.futures
+from typing import Mapping, Sequence, Any, List
+
+from cardlinky.decoding import Decoder
+from cardlinky.types.models.bill import Bill
+from cardlinky.types.models.payment import Payment
+from cardlinky.types.models.payout import Payout
+
+
+def _decode_rows(decoder: Decoder, name: str, rows: Sequence[Mapping[str, Any]]) -> List[Any]:
+    # Runs in a worker, so it has to be a module-level function of picklable arguments
+    decode = getattr(decoder, name)
+    return [decode(row) for row in rows]
+
+
+def _split(rows: Sequence[Mapping[str, Any]], size: int) -> List[Sequence[Mapping[str, Any]]]:
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+class OffloadDecoder:
+    """
+    Wraps a decoding.Decoder, building models of large search responses in an executor. Rows are split into chunks
+    that are decoded in parallel, and the models are returned in the original order.
+    Responses with fewer than `min_rows` rows and all other responses are decoded in the calling thread.
+
+    Use a concurrent.futures.ProcessPoolExecutor with spare CPUs: building models holds the GIL, so in threads
+    it would still stall the other threads of the service. Models come back pickled, and unpickling them takes
+    about a third of the time of validating them, so offloading pays off mostly with validation enabled.
+
+    :param decoder: decoding.Decoder - Decoder to wrap. It is pickled and sent to the workers
+    :param executor: concurrent.futures.Executor - Executor to decode in. It is not shut down by the decoder
+    :param min_rows: int - Minimum number of rows of a response to decode in the executor. Default: 2000
+    :param chunk_rows: int - Number of rows decoded by one task. Default: 1000
+    """
+
+    def __init__(self, decoder: Decoder, executor: concurrent.futures.Executor, min_rows: int = 2000,
+                 chunk_rows: int = 1000):
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1")
+        self._decoder: Decoder = decoder
+        self._executor: concurrent.futures.Executor = executor
+        self._min_rows: int = min_rows
+        self._chunk_rows: int = chunk_rows
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._decoder, name)
+
+    def _decode_many(self, name: str, rows: Sequence[Mapping[str, Any]]) -> List[Any]:
+        if len(rows) < self._min_rows:
+            return _decode_rows(self._decoder, name, rows)
+
+        # executor.map keeps the order of chunks and raises the first error of a worker
+        results = self._executor.map(functools.partial(_decode_rows, self._decoder, name),
+                                     _split(rows, self._chunk_rows))
+        return list(itertools.chain.from_iterable(results))
+
+    def decode_bills(self, response: Mapping[str, Any]) -> List[Bill]:
+        return self._decode_many("decode_bill", response["data"])
+
+    def decode_payments(self, response: Mapping[str, Any]) -> List[Payment]:
+        return self._decode_many("decode_payment", response["data"])
+
+    def decode_payouts(self, response: Mapping[str, Any]) -> List[Payout]:
+        return self._decode_many("decode_payout", response["data"])
+
+
+class AsyncOffloadDecoder:
+    """
+    Asynchronous version of OffloadDecoder for AsyncCardlinky. Chunks are awaited with loop.run_in_executor,
+    so the event loop keeps serving other requests while large responses are decoded.
+
+    :param decoder: decoding.Decoder - Decoder to wrap. It is pickled and sent to the workers
+    :param executor: concurrent.futures.Executor - Executor to decode in. It is not shut down by the decoder
+    :param min_rows: int - Minimum number of rows of a response to decode in the executor. Default: 2000
+    :param chunk_rows: int - Number of rows decoded by one task. Default: 1000
+    """
+
+    def __init__(self, decoder: Decoder, executor: concurrent.futures.Executor, min_rows: int = 2000,
+                 chunk_rows: int = 1000):
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1")
+        self._decoder: Decoder = decoder
+        self._executor: concurrent.futures.Executor = executor
+        self._min_rows: int = min_rows
+        self._chunk_rows: int = chunk_rows
+
+    async def _decode_many(self, name: str, rows: Sequence[Mapping[str, Any]]) -> List[Any]:
+        if len(rows) < self._min_rows:
+            return _decode_rows(self._decoder, name, rows)
+
+        loop = asyncio.get_running_loop()
+        # gather keeps the order of chunks and raises the first error of a worker
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, _decode_rows, self._decoder, name, chunk)
+            for chunk in _split(rows, self._chunk_rows)
+        ))
+        return list(itertools.chain.from_iterable(results))
+
+    async def decode_bills(self, response: Mapping[str, Any]) -> List[Bill]:
+        return await self._decode_many("decode_bill", response["data"])
+
+    async def decode_payments(self, response: Mapping[str, Any]) -> List[Payment]:
+        return await self._decode_many("decode_payment", response["data"])
+
+    async def decode_payouts(self, response: Mapping[str, Any]) -> List[Payout]:
+        return await self._decode_many("decode_payout", response["data"])
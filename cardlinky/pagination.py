@@ -0,0 +1,87 @@
+import datetime
+from typing import Callable, Awaitable, Iterator, AsyncIterator, List, Mapping, Any, Optional, Tuple, TypeVar
+
+
+_T = TypeVar("_T")
+_Rows = List[Mapping[str, Any]]
+
+
+def _check_arguments(window_days: int, max_rows: Optional[int]) -> None:
+    if window_days < 1:
+        raise ValueError("window_days must be at least 1")
+    if max_rows is not None and max_rows < 1:
+        raise ValueError("max_rows must be at least 1")
+
+
+def to_date(value: datetime.date) -> datetime.date:
+    return value.date() if isinstance(value, datetime.datetime) else value
+
+
+def _next_window(current: datetime.date, finish: datetime.date, size: int) -> Tuple[datetime.date, datetime.date]:
+    return current, min(current + datetime.timedelta(days=size - 1), finish)
+
+
+def _resize(size: int, rows: int, window_days: int, max_rows: Optional[int]) -> Tuple[int, bool]:
+    """
+    Returns the next window size and whether the current window has to be fetched again with it.
+    A window that reached max_rows is split in half, a window much smaller than the limit grows back.
+    """
+
+    if max_rows is None:
+        return size, False
+    if rows >= max_rows and size > 1:
+        return max(1, size // 2), True
+    if rows < max_rows // 4 and size < window_days:
+        return min(window_days, size * 2), False
+    return size, False
+
+
+def iter_windows(fetch: Callable[[datetime.date, datetime.date], _Rows], decode: Callable[[Mapping[str, Any]], _T],
+                 start_date: datetime.date, finish_date: datetime.date, window_days: int = 1,
+                 max_rows: Optional[int] = None) -> Iterator[_T]:
+    """
+    Walk the date range in windows, fetching one window at a time and decoding rows only when they are yielded.
+
+    :param fetch: Callable - Returns raw rows for the (start, finish) window, both dates inclusive
+    :param decode: Callable - Turns one raw row into a model
+    :param start_date: datetime.date - First day of the range
+    :param finish_date: datetime.date - Last day of the range
+    :param window_days: int - Number of days in one window. Default: 1
+    :param max_rows: Optional[int] - If a window returns at least this many rows, it is split and fetched again
+    :return: Iterator of models
+    """
+
+    _check_arguments(window_days, max_rows)
+    current, size, finish_date = to_date(start_date), window_days, to_date(finish_date)
+    while current <= finish_date:
+        window_start, window_finish = _next_window(current, finish_date, size)
+        rows = fetch(window_start, window_finish)
+        size, retry = _resize(size, len(rows), window_days, max_rows)
+        if retry:
+            continue
+
+        for row in rows:
+            yield decode(row)
+        current = window_finish + datetime.timedelta(days=1)
+
+
+async def aiter_windows(fetch: Callable[[datetime.date, datetime.date], Awaitable[_Rows]],
+                        decode: Callable[[Mapping[str, Any]], _T], start_date: datetime.date,
+                        finish_date: datetime.date, window_days: int = 1,
+                        max_rows: Optional[int] = None) -> AsyncIterator[_T]:
+    """
+    Asynchronous version of iter_windows.
+    """
+
+    _check_arguments(window_days, max_rows)
+    current, size, finish_date = to_date(start_date), window_days, to_date(finish_date)
+    while current <= finish_date:
+        window_start, window_finish = _next_window(current, finish_date, size)
+        rows = await fetch(window_start, window_finish)
+        size, retry = _resize(size, len(rows), window_days, max_rows)
+        if retry:
+            continue
+
+        for row in rows:
+            yield decode(row)
+        current = window_finish + datetime.timedelta(days=1)
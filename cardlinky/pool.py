@@ -0,0 +1,188 @@
+import datetime
+import threading
+import requests
+import requests.adapters
+from typing import Optional, Mapping, Callable, Iterable, Union, Any, List, Dict, Tuple, TypeVar
+
+from cardlinky import bulk
+from cardlinky.cardlinky import Cardlinky
+from cardlinky.ratelimit import RateLimiter
+from cardlinky.types.models.bill import Bill
+from cardlinky.types.models.payment import Payment
+from cardlinky.types.models.payout import Payout
+from cardlinky.types.models.balance import Balance
+
+
+_T = TypeVar("_T")
+
+
+class _PooledCardlinky(Cardlinky):
+    # Holds a slot of its token during every HTTP attempt, so direct calls are limited too.
+    # The slot is released while a retry waits for its backoff or the rate limiter
+    def __init__(self, token: str, semaphore: threading.BoundedSemaphore, **options: Any):
+        super().__init__(token, **options)
+        self._semaphore: threading.BoundedSemaphore = semaphore
+
+    def _send_once(self, method: str, path: str, body: bytes) -> requests.Response:
+        with self._semaphore:
+            return super()._send_once(method, path, body)
+
+
+class CardlinkyPool:
+    """
+    Clients of many shops with separate tokens over one shared connection pool.
+    Each token gets its own rate limit and limit of simultaneous requests. Shops with one token share a client.
+    Use pool[shop_id] to call any method for one shop, or the fan-out methods to call it for all shops at once.
+
+    :param shops: Mapping[str, str] - API token of every shop, by shop ID
+    :param base_url: Optional[str] - Custom base url. Default: https://cardlink.link/api/v1/
+    :param rate_limit: Optional[float] - Maximum number of requests per second of one token. Default: unlimited
+    :param concurrency: int - Maximum number of simultaneous requests of one token. Default: 4
+    :param max_workers: int - Maximum number of simultaneous requests of a fan-out. Default: 10
+    :param pool_maxsize: int - Maximum number of connections kept open. Default: 20
+    :param session: Optional[requests.Session] - Existing session to use. It is not closed by the pool
+    :param options: Any - Other arguments of Cardlinky, like timeout, validate, cache or retry
+    """
+
+    def __init__(self, shops: Mapping[str, str], base_url: Optional[str] = None,
+                 rate_limit: Optional[float] = None, concurrency: int = 4, max_workers: int = 10,
+                 pool_maxsize: int = 20, session: Optional[requests.Session] = None, **options: Any):
+        self._owns_session: bool = session is None
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self._session: requests.Session = session
+        self._max_workers: int = max_workers
+
+        self._shops: Dict[str, str] = dict(shops)
+        self._clients: Dict[str, Cardlinky] = {}
+        for token in dict.fromkeys(self._shops.values()):
+            self._clients[token] = _PooledCardlinky(
+                token,
+                threading.BoundedSemaphore(concurrency),
+                base_url=base_url,
+                session=session,
+                rate_limit=RateLimiter(rate_limit) if rate_limit is not None else None,
+                **options,
+            )
+
+    def __enter__(self) -> "CardlinkyPool":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close all pooled connections. A session passed to the constructor is left open.
+        """
+
+        if self._owns_session:
+            self._session.close()
+
+    def __getitem__(self, shop_id: str) -> Cardlinky:
+        """
+        :param shop_id: str - Unique shop ID
+        :return: Cardlinky - Client of the token of the shop
+        """
+
+        return self._clients[self._shops[shop_id]]
+
+    def __contains__(self, shop_id: str) -> bool:
+        return shop_id in self._shops
+
+    @property
+    def shop_ids(self) -> List[str]:
+        return list(self._shops)
+
+    def map(self, function: Callable[[str, Cardlinky], _T],
+            shop_ids: Optional[Iterable[str]] = None) -> Dict[str, Union[_T, Exception]]:
+        """
+        Call `function(shop_id, client)` for every shop in parallel.
+        An exception raised for one shop is stored as its result and does not stop the others.
+
+        :param function: Callable - Function that is called with a shop ID and its client
+        :param shop_ids: Optional[Iterable[str]] - Shops to call it for. Default: all shops
+        :return: Dict - Result or exception for every shop
+        """
+
+        shop_ids = self._shops if shop_ids is None else shop_ids
+        return bulk.map_concurrently(lambda shop_id: function(shop_id, self[shop_id]), shop_ids, self._max_workers)
+
+    def _map_tokens(self, function: Callable[[Cardlinky], _T]) -> Dict[str, Union[_T, Exception]]:
+        # Called once per token for methods that do not take a shop ID, the result is shared by its shops
+        results = bulk.map_concurrently(lambda token: function(self._clients[token]), self._clients,
+                                        self._max_workers)
+        return {shop_id: results[token] for shop_id, token in self._shops.items()}
+
+    def get_balance(self) -> Dict[str, Union[List[Balance], Exception]]:
+        """
+        Get balances of all tokens. Shops with one token get the same balances.
+
+        :return: Dict[str, Union[List[models.Balance], Exception]] - Balances or an exception by shop ID
+        """
+
+        return self._map_tokens(lambda client: client.get_balance())
+
+    def search_bill(self, start_date: Optional[datetime.datetime] = None,
+                    finish_date: Optional[datetime.datetime] = None) -> Dict[str, Union[List[Bill], Exception]]:
+        """
+        Search bills of all shops.
+
+        :param start_date: Optional[datetime.datetime] - Start date of search
+        :param finish_date: Optional[datetime.datetime] - End date of search
+        :return: Dict[str, Union[List[models.Bill], Exception]] - Bills or an exception by shop ID
+        """
+
+        return self.map(lambda shop_id, client: client.search_bill(shop_id, start_date, finish_date))
+
+    def search_payment(self, start_date: Optional[datetime.datetime] = None,
+                       finish_date: Optional[datetime.datetime] = None) -> Dict[str, Union[List[Payment], Exception]]:
+        """
+        Search payments of all shops.
+
+        :param start_date: Optional[datetime.datetime] - Start date of search
+        :param finish_date: Optional[datetime.datetime] - End date of search
+        :return: Dict[str, Union[List[models.Payment], Exception]] - Payments or an exception by shop ID
+        """
+
+        return self.map(lambda shop_id, client: client.search_payment(shop_id, start_date, finish_date))
+
+    def search_payout(self, start_date: Optional[datetime.datetime] = None,
+                      finish_date: Optional[datetime.datetime] = None) -> Dict[str, Union[List[Payout], Exception]]:
+        """
+        Search payouts of all tokens. Shops with one token get the same payouts.
+
+        :param start_date: Optional[datetime.datetime] - Start date of search
+        :param finish_date: Optional[datetime.datetime] - End date of search
+        :return: Dict[str, Union[List[models.Payout], Exception]] - Payouts or an exception by shop ID
+        """
+
+        return self._map_tokens(lambda client: client.search_payout(start_date, finish_date))
+
+
+def merge(results: Mapping[str, Union[List[_T], Exception]],
+          key: Optional[Callable[[_T], Any]] = None) -> Tuple[List[_T], Dict[str, Exception]]:
+    """
+    Merge lists returned by a fan-out into one. Lists shared by shops with one token are taken once.
+
+    :param results: Mapping - Result of a fan-out method of CardlinkyPool
+    :param key: Optional[Callable] - Sort key of merged items. Default: creation time if items have it
+    :return: Tuple[List, Dict[str, Exception]] - Merged items and the exceptions by shop ID
+    """
+
+    merged, errors, seen = [], {}, set()
+    for shop_id, result in results.items():
+        if isinstance(result, Exception):
+            errors[shop_id] = result
+        elif id(result) not in seen:
+            seen.add(id(result))
+            merged.extend(result)
+
+    if key is None and merged and hasattr(merged[0], "created_at"):
+        key = lambda item: item.created_at  # noqa: E731
+    if key is not None:
+        merged.sort(key=key)
+    return merged, errors
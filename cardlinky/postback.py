@@ -0,0 +1,118 @@
+import hmac
+import hashlib
+import urllib.parse
+from typing import Mapping, Union, Optional, Dict
+
+from cardlinky.cache import Cache, MemoryCache
+from cardlinky.decoding import Decoder
+from cardlinky.types.models.postback import Postback
+
+
+class SignatureError(Exception):
+    """
+    Signature of a postback does not match. The request did not come from Cardlink or was changed.
+    """
+
+
+def signature(out_sum: str, inv_id: str, token: str) -> str:
+    """
+    Signature of a postback: uppercase MD5 of 'OutSum:InvId:token'.
+    https://cardlink.link/en/reference/api#postback
+
+    :param out_sum: str - OutSum field exactly as received
+    :param inv_id: str - InvId field exactly as received
+    :param token: str - Your API token
+    :return: str
+    """
+
+    return hashlib.md5(f"{out_sum}:{inv_id}:{token}".encode()).hexdigest().upper()
+
+
+def parse_form(body: Union[bytes, str]) -> Dict[str, str]:
+    """
+    Parse an application/x-www-form-urlencoded request body.
+
+    :param body: Union[bytes, str] - Raw request body
+    :return: Dict[str, str]
+    """
+
+    if isinstance(body, bytes):
+        body = body.decode()
+    return dict(urllib.parse.parse_qsl(body, keep_blank_values=True))
+
+
+class PostbackHandler:
+    """
+    Verifies and decodes postbacks that Cardlink sends to your Result URL. It does not depend on a web framework:
+    pass it the form of the request, or its raw body.
+
+    :param token: str - Your API token, used to check signatures
+    :param validate: bool - Validate decoded postbacks with pydantic. Default: True
+    :param store: Optional[cache.Cache] - Where delivered postbacks are remembered to drop repeated deliveries.
+        Use a shared backend with an atomic add() if postbacks are received by many processes.
+        Default: cache.MemoryCache(maxsize=100000)
+    :param ttl: Optional[float] - Seconds to remember delivered postbacks. Default: 86400
+    """
+
+    def __init__(self, token: str, validate: bool = True, store: Optional[Cache] = None,
+                 ttl: Optional[float] = 86400):
+        self.__token: str = token
+        self._decoder: Decoder = Decoder(validate=validate)
+        self._store: Cache = store if store is not None else MemoryCache(maxsize=100_000)
+        self._ttl: Optional[float] = ttl
+
+    @staticmethod
+    def _key(postback: Postback) -> str:
+        return f"postback:{postback.trs_id}:{postback.inv_id}:{postback.status}"
+
+    def forget(self, postback: Postback) -> None:
+        """
+        Forget a handled postback, so its next delivery is not dropped.
+
+        :param postback: models.Postback - Postback returned by handle()
+        """
+
+        self._store.delete(self._key(postback))
+
+    def verify(self, form: Mapping[str, str]) -> bool:
+        """
+        :param form: Mapping[str, str] - Fields of the postback
+        :return: bool - Whether the signature is valid
+        """
+
+        try:
+            expected = signature(form["OutSum"], form["InvId"], self.__token)
+            received = form["SignatureValue"].upper()
+        except KeyError:
+            return False
+        return hmac.compare_digest(expected, received)
+
+    def parse(self, form: Union[Mapping[str, str], bytes, str]) -> Postback:
+        """
+        Verify the signature and decode a postback.
+
+        :param form: Union[Mapping[str, str], bytes, str] - Fields of the postback or the raw request body
+        :return: models.Postback
+        :raises SignatureError: If the signature is invalid
+        """
+
+        if isinstance(form, (bytes, str)):
+            form = parse_form(form)
+        if not self.verify(form):
+            raise SignatureError("Invalid postback signature")
+        return self._decoder.decode_postback(form)
+
+    def handle(self, form: Union[Mapping[str, str], bytes, str]) -> Optional[Postback]:
+        """
+        Verify and decode a postback, dropping repeated deliveries of the same payment status.
+        If processing of the postback fails, call forget() so that a repeated delivery is handled again.
+
+        :param form: Union[Mapping[str, str], bytes, str] - Fields of the postback or the raw request body
+        :return: Optional[models.Postback] - The postback, or None if it was already handled
+        :raises SignatureError: If the signature is invalid
+        """
+
+        postback = self.parse(form)
+        if not self._store.add(self._key(postback), True, self._ttl):
+            return None
+        return postback
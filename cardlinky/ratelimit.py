@@ -0,0 +1,51 @@
+import time
+import asyncio
+import threading
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter. It is safe to share one limiter between threads and coroutines.
+
+    :param rate: float - Number of requests allowed per second
+    :param burst: Optional[int] - Number of requests that can be sent at once after idle time. Default: 1
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self._rate: float = rate
+        self._capacity: float = float(burst if burst is not None else 1)
+        self._tokens: float = self._capacity
+        self._updated_at: float = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        # Takes a token, possibly going into debt, and returns how long the caller has to wait for it
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+            self._updated_at = now
+            self._tokens -= 1
+
+            return -self._tokens / self._rate if self._tokens < 0 else 0.0
+
+    def acquire(self) -> None:
+        """
+        Block until a request is allowed.
+        """
+
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """
+        Wait until a request is allowed without blocking the event loop.
+        """
+
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,333 @@
+import datetime
+import itertools
+from decimal import Decimal
+from typing import Optional, Union, Iterable, Sequence, Mapping, Any, Dict, List, Tuple
+
+from cardlinky import bulk, money, pagination
+from cardlinky.cache import Cache, MemoryCache
+from cardlinky.columnar import Columns
+from cardlinky.cardlinky import Cardlinky
+from cardlinky.pool import CardlinkyPool
+from cardlinky.types.enums.status import Status
+
+
+SHOP = "shop"
+CURRENCY = "currency"
+STATUS = "status"
+DAY = "day"
+BIN = "bin"
+
+DIMENSIONS: Tuple[str, ...] = (SHOP, CURRENCY, STATUS, DAY, BIN)
+
+PAYMENTS = "payments"
+PAYOUTS = "payouts"
+
+# Statuses that count in success rates, pending payments are left out
+_FINISHED: Tuple[str, ...] = (Status.SUCCESS.value, Status.FAIL.value, Status.DECLINED.value)
+
+_Key = Tuple[Any, ...]
+
+
+class Aggregate:
+    """
+    Totals of a group. Amounts are kept as exact integers in minor units of the currency.
+
+    :param currency: str - Currency code
+    :param count: int - Number of payments or payouts
+    :param amount_minor: int - Sum of amounts in minor units
+    :param commission_minor: int - Sum of commissions in minor units
+    """
+
+    __slots__ = ("currency", "count", "amount_minor", "commission_minor")
+
+    def __init__(self, currency: str, count: int = 0, amount_minor: int = 0, commission_minor: int = 0):
+        self.currency: str = currency
+        self.count: int = count
+        self.amount_minor: int = amount_minor
+        self.commission_minor: int = commission_minor
+
+    def __repr__(self) -> str:
+        return f"Aggregate(currency={self.currency!r}, count={self.count}, amount={self.amount}, " \
+               f"commission={self.commission})"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Aggregate) and (self.currency, self.count, self.amount_minor,
+                                                 self.commission_minor) == (other.currency, other.count,
+                                                                            other.amount_minor, other.commission_minor)
+
+    @property
+    def amount(self) -> Decimal:
+        return money.from_minor(self.amount_minor, self.currency)
+
+    @property
+    def commission(self) -> Decimal:
+        return money.from_minor(self.commission_minor, self.currency)
+
+    def add(self, count: int, amount_minor: int, commission_minor: int) -> None:
+        self.count += count
+        self.amount_minor += amount_minor
+        self.commission_minor += commission_minor
+
+
+class Report:
+    """
+    Aggregates of payments or payouts by every combination of dimensions that occurred.
+
+    :param dimensions: Tuple[str, ...] - Dimensions of the keys of groups, always including CURRENCY
+    :param groups: Dict[tuple, Aggregate] - Aggregates by values of the dimensions
+    """
+
+    def __init__(self, dimensions: Sequence[str], groups: Optional[Dict[_Key, Aggregate]] = None):
+        self.dimensions: Tuple[str, ...] = tuple(dimensions)
+        self.groups: Dict[_Key, Aggregate] = groups if groups is not None else {}
+
+    def _merge(self, partial: Mapping[_Key, List[int]]) -> None:
+        currency = self.dimensions.index(CURRENCY)
+        for key, (count, amount_minor, commission_minor) in partial.items():
+            aggregate = self.groups.get(key)
+            if aggregate is None:
+                aggregate = self.groups[key] = Aggregate(key[currency])
+            aggregate.add(count, amount_minor, commission_minor)
+
+    def group(self, *dimensions: str) -> Dict[_Key, Aggregate]:
+        """
+        Roll the groups up to fewer dimensions. Amounts of different currencies are never added,
+        so CURRENCY is put first if it is not listed.
+
+        :param dimensions: str - Dimensions to keep, like DAY or SHOP, STATUS
+        :return: Dict[tuple, Aggregate] - Aggregates by values of (currency, *dimensions)
+        """
+
+        if CURRENCY not in dimensions:
+            dimensions = (CURRENCY,) + dimensions
+        for dimension in dimensions:
+            if dimension not in self.dimensions:
+                raise ValueError(f"The report is not grouped by {dimension!r}")
+
+        positions = [self.dimensions.index(dimension) for dimension in dimensions]
+        currency = dimensions.index(CURRENCY)
+        result: Dict[_Key, Aggregate] = {}
+        for key, aggregate in self.groups.items():
+            rolled = tuple(key[position] for position in positions)
+            target = result.get(rolled)
+            if target is None:
+                target = result[rolled] = Aggregate(rolled[currency])
+            target.add(aggregate.count, aggregate.amount_minor, aggregate.commission_minor)
+        return result
+
+    def turnover(self, *dimensions: str) -> Dict[_Key, Aggregate]:
+        """
+        Successful payments or payouts only, rolled up like group().
+        """
+
+        if STATUS not in self.dimensions:
+            raise ValueError(f"The report is not grouped by {STATUS!r}")
+        status = self.dimensions.index(STATUS)
+        successful = Report(self.dimensions, {
+            key: aggregate for key, aggregate in self.groups.items() if key[status] == Status.SUCCESS.value
+        })
+        return successful.group(*dimensions)
+
+    def success_rate(self, *dimensions: str) -> Dict[_Key, float]:
+        """
+        Share of successful payments or payouts among finished ones (SUCCESS, FAIL or DECLINED),
+        rolled up like group().
+
+        :param dimensions: str - Dimensions to keep, STATUS must not be one of them
+        :return: Dict[tuple, float] - Success rate by values of (currency, *dimensions)
+        """
+
+        if STATUS not in self.dimensions:
+            raise ValueError(f"The report is not grouped by {STATUS!r}")
+        if STATUS in dimensions:
+            raise ValueError("Success rate can not be grouped by status")
+
+        by_status = self.group(*dimensions, STATUS)
+        successful: Dict[_Key, int] = {}
+        finished: Dict[_Key, int] = {}
+        for key, aggregate in by_status.items():
+            rolled, status = key[:-1], key[-1]
+            if status in _FINISHED:
+                finished[rolled] = finished.get(rolled, 0) + aggregate.count
+                if status == Status.SUCCESS.value:
+                    successful[rolled] = successful.get(rolled, 0) + aggregate.count
+        return {key: successful.get(key, 0) / count for key, count in finished.items() if count}
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """
+        :return: List[Dict[str, Any]] - One dict per group with its dimensions, count, amount and commission,
+            ready for csv.DictWriter or pandas.DataFrame
+        """
+
+        return [
+            {**dict(zip(self.dimensions, key)), "count": aggregate.count, "amount": aggregate.amount,
+             "commission": aggregate.commission}
+            for key, aggregate in self.groups.items()
+        ]
+
+
+def _bin(card: Optional[str]) -> Optional[str]:
+    # Cards are masked like 220220******1234, other accounts have no BIN
+    prefix = card[:6] if card else ""
+    return prefix if len(prefix) == 6 and prefix.isdigit() else None
+
+
+def _minor(values: Sequence[Union[int, float]], currencies: Sequence[str]) -> Sequence[int]:
+    if getattr(values, "typecode", None) == "q":
+        return values
+    return [money.to_minor(value, currency) for value, currency in zip(values, currencies)]
+
+
+def _fold(columns: Columns, kind: str, shop_id: Optional[str], dimensions: Sequence[str]) -> Dict[_Key, List[int]]:
+    """
+    Aggregate the columns of one search by the dimensions.
+    """
+
+    rows = columns.rows
+    currency_column = "currency_in" if kind == PAYMENTS else "currency"
+    currency_labels, status_labels = columns.categories[currency_column], columns.categories["status"]
+    currencies = [currency_labels[code] if code >= 0 else None for code in columns[currency_column]]
+
+    values = {
+        SHOP: lambda: itertools.repeat(shop_id, rows),
+        CURRENCY: lambda: currencies,
+        STATUS: lambda: [status_labels[code] if code >= 0 else None for code in columns["status"]],
+        DAY: lambda: [created_at.date() for created_at in columns["created_at"]],
+        BIN: lambda: [_bin(card) for card in columns["from_card" if kind == PAYMENTS else "account_identifier"]],
+    }
+    keys = zip(*(values[dimension]() for dimension in dimensions))
+
+    partial: Dict[_Key, List[int]] = {}
+    for key, amount, commission in zip(keys, _minor(columns["amount"], currencies),
+                                       _minor(columns["commission"], currencies)):
+        totals = partial.get(key)
+        if totals is None:
+            partial[key] = [1, amount, commission]
+        else:
+            totals[0] += 1
+            totals[1] += amount
+            totals[2] += commission
+    return partial
+
+
+class ReportEngine:
+    """
+    Builds reports of payments and payouts from search results. Searches are made one day and shop at a time,
+    and every day is folded into grouped aggregates right away, so memory does not grow with the number of rows.
+    Aggregates of closed days are cached, so later reports fetch only the days that can still change.
+
+    :param client: Union[Cardlinky, pool.CardlinkyPool] - Client, or a pool for shops with different tokens
+    :param shop_ids: Optional[Iterable[str]] - Shops to report payments of. Default: all shops of the pool
+    :param cache: Optional[cache.Cache] - Where aggregates of closed days are kept. Use a persistent backend
+        to reuse them between runs. Default: cache.MemoryCache()
+    :param ttl: Optional[float] - Seconds to keep aggregates of closed days. Default: until eviction
+    :param dimensions: Sequence[str] - Dimensions to group by, out of SHOP, CURRENCY, STATUS, DAY and BIN.
+        CURRENCY is always added. Default: all of them
+    :param settle_days: int - Days after which a past day is considered closed. Raise it if payments of
+        yesterday may still change status. Default: 0, every day before today is closed
+    :param max_workers: int - Maximum number of simultaneous searches. Default: 4
+    """
+
+    def __init__(self, client: Union[Cardlinky, CardlinkyPool], shop_ids: Optional[Iterable[str]] = None,
+                 cache: Optional[Cache] = None, ttl: Optional[float] = None, dimensions: Sequence[str] = DIMENSIONS,
+                 settle_days: int = 0, max_workers: int = 4):
+        for dimension in dimensions:
+            if dimension not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension {dimension!r}")
+        if shop_ids is None:
+            if not isinstance(client, CardlinkyPool):
+                raise ValueError("shop_ids are required for a single client")
+            shop_ids = client.shop_ids
+
+        self._client: Union[Cardlinky, CardlinkyPool] = client
+        self._shop_ids: List[str] = list(shop_ids)
+        self._cache: Cache = cache if cache is not None else MemoryCache()
+        self._ttl: Optional[float] = ttl
+        self._dimensions: Tuple[str, ...] = tuple(dimensions) if CURRENCY in dimensions \
+            else (CURRENCY,) + tuple(dimensions)
+        self._settle_days: int = settle_days
+        self._max_workers: int = max_workers
+
+    def _client_of(self, shop_id: str) -> Cardlinky:
+        return self._client[shop_id] if isinstance(self._client, CardlinkyPool) else self._client
+
+    def _key(self, kind: str, client: Cardlinky, shop_id: Optional[str], day: datetime.date) -> str:
+        return f"report:{kind}:{client.cache_namespace}:{shop_id or ''}:{day.isoformat()}:" \
+               f"{','.join(self._dimensions)}"
+
+    def _dump(self, partial: Mapping[_Key, List[int]]) -> List[list]:
+        # Plain lists and strings, so that any cache backend can serialize them
+        day = self._dimensions.index(DAY) if DAY in self._dimensions else None
+        return [[[value.isoformat() if i == day else value for i, value in enumerate(key)], *totals]
+                for key, totals in partial.items()]
+
+    def _load(self, entries: List[list]) -> Dict[_Key, List[int]]:
+        day = self._dimensions.index(DAY) if DAY in self._dimensions else None
+        return {
+            tuple(datetime.date.fromisoformat(value) if i == day else value for i, value in enumerate(key)): totals
+            for key, *totals in entries
+        }
+
+    def _day(self, kind: str, client: Cardlinky, shop_id: Optional[str], day: datetime.date,
+             closed: bool) -> Dict[_Key, List[int]]:
+        key = self._key(kind, client, shop_id, day)
+        if closed:
+            entries = self._cache.get(key)
+            if entries is not None:
+                return self._load(entries)
+
+        if kind == PAYMENTS:
+            columns = client.search_payment_columns(shop_id, day, day)
+        else:
+            columns = client.search_payout_columns(day, day)
+        partial = _fold(columns, kind, shop_id, self._dimensions)
+
+        if closed:
+            self._cache.set(key, self._dump(partial), self._ttl)
+        return partial
+
+    def _build(self, kind: str, sources: List[Tuple[Cardlinky, Optional[str]]], start_date: datetime.date,
+               finish_date: datetime.date, today: Optional[datetime.date]) -> Report:
+        start_date, finish_date = pagination.to_date(start_date), pagination.to_date(finish_date)
+        today = pagination.to_date(today) if today is not None else datetime.date.today()
+        last_closed = today - datetime.timedelta(days=self._settle_days + 1)
+
+        days = (start_date + datetime.timedelta(days=i) for i in range((finish_date - start_date).days + 1))
+        tasks = ((client, shop_id, day) for day in days for client, shop_id in sources)
+
+        report = Report(self._dimensions)
+        for result in bulk.run_as_completed(
+            lambda task: self._day(kind, task[0], task[1], task[2], task[2] <= last_closed), tasks, self._max_workers,
+        ):
+            if result.error is not None:
+                raise result.error
+            report._merge(result.result)
+        return report
+
+    def payments(self, start_date: datetime.date, finish_date: datetime.date,
+                 today: Optional[datetime.date] = None) -> Report:
+        """
+        Report of payments of all shops.
+
+        :param start_date: datetime.date - First day of the report
+        :param finish_date: datetime.date - Last day of the report, inclusive
+        :param today: Optional[datetime.date] - Current day by the clock of the API. Default: local date
+        :return: Report
+        """
+
+        return self._build(PAYMENTS, [(self._client_of(shop_id), shop_id) for shop_id in self._shop_ids],
+                           start_date, finish_date, today)
+
+    def payouts(self, start_date: datetime.date, finish_date: datetime.date,
+                today: Optional[datetime.date] = None) -> Report:
+        """
+        Report of payouts of all tokens. Payouts do not belong to shops, so their SHOP is None.
+
+        :param start_date: datetime.date - First day of the report
+        :param finish_date: datetime.date - Last day of the report, inclusive
+        :param today: Optional[datetime.date] - Current day by the clock of the API. Default: local date
+        :return: Report
+        """
+
+        clients = {id(client): client for client in map(self._client_of, self._shop_ids)}
+        return self._build(PAYOUTS, [(client, None) for client in clients.values()], start_date, finish_date, today)
@@ -0,0 +1,64 @@
+import random
+import datetime
+import email.utils
+from typing import Optional, Iterable, FrozenSet
+
+
+class Retry:
+    """
+    Retry policy for transient failures: connection errors, timeouts and responses with retryable statuses.
+    Delays grow exponentially with full jitter. A Retry-After header of the response is honoured.
+
+    :param total: int - Maximum number of retries. 0 disables retries. Default: 3
+    :param backoff_factor: float - Base delay in seconds, the n-th retry waits up to backoff_factor * 2 ** n.
+        Default: 0.5
+    :param max_backoff: float - Maximum delay in seconds. Default: 30
+    :param statuses: Iterable[int] - Retryable HTTP statuses. Default: 429, 500, 502, 503, 504
+    :param methods: Iterable[str] - Methods that are safe to retry. POST requests create bills and payouts,
+        so they are not retried by default. Default: GET
+    """
+
+    def __init__(self, total: int = 3, backoff_factor: float = 0.5, max_backoff: float = 30,
+                 statuses: Iterable[int] = (429, 500, 502, 503, 504), methods: Iterable[str] = ("GET",)):
+        self.total: int = total
+        self.backoff_factor: float = backoff_factor
+        self.max_backoff: float = max_backoff
+        self.statuses: FrozenSet[int] = frozenset(statuses)
+        self.methods: FrozenSet[str] = frozenset(method.upper() for method in methods)
+
+    def allows(self, method: str, attempt: int) -> bool:
+        """
+        :param method: str - HTTP method
+        :param attempt: int - Number of retries already made
+        :return: bool - Whether one more retry is allowed
+        """
+
+        return attempt < self.total and method.upper() in self.methods
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        :param attempt: int - Number of retries already made
+        :param retry_after: Optional[str] - Value of the Retry-After header, in seconds or as an HTTP date
+        :return: float - Seconds to wait before the next retry
+        """
+
+        if retry_after is not None:
+            seconds = _parse_retry_after(retry_after)
+            if seconds is not None:
+                return min(seconds, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+
+def _parse_retry_after(value: str) -> Optional[float]:
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (date - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from typing import Callable, Awaitable, Dict, Optional, Any, TypeVar
+
+
+_T = TypeVar("_T")
+
+
+class _Call:
+    def __init__(self):
+        self.event: threading.Event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call with some key is running,
+    other threads calling with the same key wait for it and get its result or exception.
+    """
+
+    def __init__(self):
+        self._lock: threading.Lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, function: Callable[[], _T]) -> _T:
+        """
+        :param key: str - Key of the call
+        :param function: Callable - Called only if no call with this key is running
+        :return: Result of the running or the new call
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.result
+
+
+class AsyncSingleFlight:
+    """
+    Asynchronous version of SingleFlight for coroutines of one event loop.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Future[Any]"] = {}
+
+    async def do(self, key: str, function: Callable[[], Awaitable[_T]]) -> _T:
+        """
+        :param key: str - Key of the call
+        :param function: Callable - Coroutine function called only if no call with this key is running
+        :return: Result of the running or the new call
+        """
+
+        future = self._calls.get(key)
+        if future is not None:
+            # shield keeps a cancelled waiter from cancelling the call shared with others
+            return await asyncio.shield(future)
+
+        future = self._calls[key] = asyncio.ensure_future(function())
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return await asyncio.shield(future)
+
+    def _forget(self, key: str, future: "asyncio.Future[Any]") -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
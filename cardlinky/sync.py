@@ -0,0 +1,305 @@
+import abc
+import sqlite3
+import datetime
+import threading
+from typing import Optional, Mapping, Any, List, Iterable, Dict, Sequence, NamedTuple, Tuple
+
+from cardlinky import bulk, pagination
+from cardlinky.cardlinky import Cardlinky, _search_body
+from cardlinky.decoding import Decoder
+from cardlinky.types.enums.status import Status
+from cardlinky.types.models.bill import Bill
+from cardlinky.types.models.payment import Payment
+from cardlinky.types.models.payout import Payout
+
+
+# Objects with these statuses can still change, so they are refreshed on every sync
+PENDING_STATUSES: Sequence[Status] = (Status.NEW, Status.PROCESS, Status.MODERATING)
+
+BILLS = "bills"
+PAYMENTS = "payments"
+PAYOUTS = "payouts"
+
+_COLUMNS: Mapping[str, Sequence[str]] = {
+    BILLS: ("id", "status", "active", "amount", "type", "currency_in", "created_at"),
+    PAYMENTS: ("id", "bill_id", "status", "amount", "commission", "currency_in", "account_amount",
+               "account_currency_code", "from_card", "created_at", "error_code", "error_message"),
+    PAYOUTS: ("id", "status", "amount", "commission", "account_identifier", "currency", "created_at"),
+}
+
+_Row = Mapping[str, Any]
+
+
+class Store(abc.ABC):
+    """
+    Local storage of bills, payments and payouts for SyncEngine.
+    Rows are kept in the format of the API, so they are decoded into models like API responses.
+    """
+
+    @abc.abstractmethod
+    def upsert(self, kind: str, rows: Iterable[_Row]) -> int:
+        """
+        Insert rows. Stored rows with the same ID get the fields present in the new rows, other fields are kept.
+
+        :param kind: str - BILLS, PAYMENTS or PAYOUTS
+        :param rows: Iterable[Mapping[str, Any]] - Rows in the format of the API
+        :return: int - Number of rows
+        """
+
+    @abc.abstractmethod
+    def select(self, kind: str, bill_id: Optional[str] = None, statuses: Optional[Iterable[Status]] = None,
+               start_date: Optional[datetime.date] = None, finish_date: Optional[datetime.date] = None) -> List[_Row]:
+        """
+        Find rows. All filters are optional.
+
+        :param kind: str - BILLS, PAYMENTS or PAYOUTS
+        :param bill_id: Optional[str] - Bill of payments
+        :param statuses: Optional[Iterable[enums.Status]] - Statuses
+        :param start_date: Optional[datetime.date] - First day of creation
+        :param finish_date: Optional[datetime.date] - Last day of creation, inclusive
+        :return: List[Mapping[str, Any]] - Rows in the format of the API, ordered by creation time
+        """
+
+    @abc.abstractmethod
+    def get_state(self, name: str) -> Optional[str]:
+        """
+        :param name: str - Name of a sync state value
+        :return: Optional[str] - Stored value
+        """
+
+    @abc.abstractmethod
+    def set_state(self, name: str, value: str) -> None:
+        """
+        :param name: str - Name of a sync state value
+        :param value: str - Value to store
+        """
+
+
+class SQLiteStore(Store):
+    """
+    Store in an SQLite database, indexed by ID, bill ID, status and creation time. Safe to use from many threads.
+
+    :param path: str - Path of the database file. Default: in-memory database
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock: threading.Lock = threading.Lock()
+
+        with self._lock, self._connection:
+            for kind, columns in _COLUMNS.items():
+                self._connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {kind} ({', '.join(columns)}, PRIMARY KEY (id))"
+                )
+                self._connection.execute(f"CREATE INDEX IF NOT EXISTS {kind}_status ON {kind} (status)")
+                self._connection.execute(f"CREATE INDEX IF NOT EXISTS {kind}_created_at ON {kind} (created_at)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS payments_bill_id ON payments (bill_id)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS sync_state (name PRIMARY KEY, value)")
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def upsert(self, kind: str, rows: Iterable[_Row]) -> int:
+        # Status responses lack some fields of search results, so rows are grouped by the columns they have
+        groups: Dict[Tuple[str, ...], List[tuple]] = {}
+        count = 0
+        for row in rows:
+            columns = tuple(column for column in _COLUMNS[kind] if column in row)
+            groups.setdefault(columns, []).append(tuple(row[column] for column in columns))
+            count += 1
+
+        with self._lock, self._connection:
+            for columns, values in groups.items():
+                updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != "id")
+                self._connection.executemany(
+                    f"INSERT INTO {kind} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                    f"ON CONFLICT (id) DO {'UPDATE SET ' + updates if updates else 'NOTHING'}",
+                    values,
+                )
+        return count
+
+    def select(self, kind: str, bill_id: Optional[str] = None, statuses: Optional[Iterable[Status]] = None,
+               start_date: Optional[datetime.date] = None, finish_date: Optional[datetime.date] = None) -> List[_Row]:
+        conditions, parameters = [], []
+        if bill_id is not None:
+            conditions.append("bill_id = ?")
+            parameters.append(bill_id)
+        if statuses is not None:
+            statuses = [status.value for status in statuses]
+            conditions.append(f"status IN ({', '.join('?' * len(statuses))})")
+            parameters.extend(statuses)
+        if start_date is not None:
+            conditions.append("created_at >= ?")
+            parameters.append(start_date.strftime("%Y-%m-%d"))
+        if finish_date is not None:
+            # Timestamps are 'YYYY-MM-DD HH:MM:SS', so the whole last day is before the next one
+            conditions.append("created_at < ?")
+            parameters.append((finish_date + datetime.timedelta(days=1)).strftime("%Y-%m-%d"))
+
+        query = f"SELECT * FROM {kind}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            return [dict(row) for row in self._connection.execute(query + " ORDER BY created_at", parameters)]
+
+    def get_state(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM sync_state WHERE name = ?", (name,)).fetchone()
+        return row["value"] if row is not None else None
+
+    def set_state(self, name: str, value: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)", (name, value))
+
+
+class SyncResult(NamedTuple):
+    """
+    :param kind: str - BILLS, PAYMENTS or PAYOUTS
+    :param fetched: int - Number of rows fetched by search requests
+    :param refreshed: int - Number of pending objects whose status was requested
+    :param errors: Dict[str, Exception] - Errors of status requests by object ID
+    """
+
+    kind: str
+    fetched: int
+    refreshed: int
+    errors: Dict[str, Exception]
+
+
+class SyncEngine:
+    """
+    Keeps a local store of bills, payments and payouts up to date with few requests.
+    Every sync searches only the days since the previous sync (the last synced day is searched again,
+    because it could have been incomplete), then requests statuses of objects that are still pending.
+
+    :param client: Cardlinky - Client
+    :param store: Store - Local store, for example SQLiteStore("cardlink.db"). Use one store per shop
+    :param shop_id: str - Unique shop ID for bills and payments
+    :param start_date: datetime.date - First day to fetch on the first sync
+    :param window_days: int - Number of days fetched with one search request. Default: 1
+    :param max_workers: int - Maximum number of simultaneous status requests. Default: 10
+    :param validate: bool - Validate models returned by queries with pydantic. Default: True
+    """
+
+    def __init__(self, client: Cardlinky, store: Store, shop_id: str, start_date: datetime.date,
+                 window_days: int = 1, max_workers: int = 10, validate: bool = True):
+        self._client: Cardlinky = client
+        self._store: Store = store
+        self._shop_id: str = shop_id
+        self._start_date: datetime.date = pagination.to_date(start_date)
+        self._window_days: int = window_days
+        self._max_workers: int = max_workers
+        self._decoder: Decoder = Decoder(validate=validate, tz=client.tz)
+
+    def _state_name(self, kind: str) -> str:
+        return f"{kind}:{self._shop_id if kind != PAYOUTS else ''}:synced_until"
+
+    def _fetch_new(self, kind: str, path: str, today: datetime.date) -> int:
+        synced_until = self._store.get_state(self._state_name(kind))
+        start_date = datetime.date.fromisoformat(synced_until) if synced_until is not None else self._start_date
+        shop_id = self._shop_id if kind != PAYOUTS else None
+
+        def fetch(window_start: datetime.date, window_finish: datetime.date) -> List[_Row]:
+            return self._client.get_raw(path, _search_body(shop_id, window_start, window_finish))["data"]
+
+        fetched = 0
+        for window in _chunks(pagination.iter_windows(fetch, dict, start_date, today, self._window_days), 1000):
+            fetched += self._store.upsert(kind, window)
+        self._store.set_state(self._state_name(kind), today.isoformat())
+        return fetched
+
+    def _refresh_pending(self, kind: str, path: str) -> Tuple[int, Dict[str, Exception]]:
+        ids = [row["id"] for row in self._store.select(kind, statuses=PENDING_STATUSES)]
+        responses = bulk.map_concurrently(lambda id_: self._client.get_raw(path, {"id": id_}), ids, self._max_workers)
+
+        rows, errors = [], {}
+        for id_, response in responses.items():
+            if isinstance(response, Exception):
+                errors[id_] = response
+            elif kind == PAYOUTS and "currency" not in response:
+                rows.append({**response, "currency": response.get("currency_in")})
+            else:
+                rows.append(response)
+        self._store.upsert(kind, rows)
+        return len(ids), errors
+
+    def _sync(self, kind: str, search_path: str, status_path: str, today: Optional[datetime.date]) -> SyncResult:
+        today = today if today is not None else datetime.date.today()
+        fetched = self._fetch_new(kind, search_path, today)
+        refreshed, errors = self._refresh_pending(kind, status_path)
+        return SyncResult(kind, fetched, refreshed, errors)
+
+    def sync_bills(self, today: Optional[datetime.date] = None) -> SyncResult:
+        return self._sync(BILLS, "bill/search", "bill/status", today)
+
+    def sync_payments(self, today: Optional[datetime.date] = None) -> SyncResult:
+        return self._sync(PAYMENTS, "payment/search", "payment/status", today)
+
+    def sync_payouts(self, today: Optional[datetime.date] = None) -> SyncResult:
+        return self._sync(PAYOUTS, "payout/search", "payout/status", today)
+
+    def sync(self, today: Optional[datetime.date] = None) -> List[SyncResult]:
+        """
+        Sync bills, payments and payouts.
+
+        :param today: Optional[datetime.date] - Last day to fetch. Default: today
+        :return: List[SyncResult]
+        """
+
+        return [self.sync_bills(today), self.sync_payments(today), self.sync_payouts(today)]
+
+    def bills(self, statuses: Optional[Iterable[Status]] = None, start_date: Optional[datetime.date] = None,
+              finish_date: Optional[datetime.date] = None) -> List[Bill]:
+        """
+        Find stored bills.
+
+        :param statuses: Optional[Iterable[enums.Status]] - Statuses
+        :param start_date: Optional[datetime.date] - First day of creation
+        :param finish_date: Optional[datetime.date] - Last day of creation, inclusive
+        :return: List[models.Bill]
+        """
+
+        return [self._decoder.decode_bill(row) for row in self._store.select(BILLS, None, statuses, start_date,
+                                                                              finish_date)]
+
+    def payments(self, bill_id: Optional[str] = None, statuses: Optional[Iterable[Status]] = None,
+                 start_date: Optional[datetime.date] = None,
+                 finish_date: Optional[datetime.date] = None) -> List[Payment]:
+        """
+        Find stored payments.
+
+        :param bill_id: Optional[str] - Unique bill ID
+        :param statuses: Optional[Iterable[enums.Status]] - Statuses
+        :param start_date: Optional[datetime.date] - First day of creation
+        :param finish_date: Optional[datetime.date] - Last day of creation, inclusive
+        :return: List[models.Payment]
+        """
+
+        return [self._decoder.decode_payment(row) for row in self._store.select(PAYMENTS, bill_id, statuses,
+                                                                                 start_date, finish_date)]
+
+    def payouts(self, statuses: Optional[Iterable[Status]] = None, start_date: Optional[datetime.date] = None,
+                finish_date: Optional[datetime.date] = None) -> List[Payout]:
+        """
+        Find stored payouts.
+
+        :param statuses: Optional[Iterable[enums.Status]] - Statuses
+        :param start_date: Optional[datetime.date] - First day of creation
+        :param finish_date: Optional[datetime.date] - Last day of creation, inclusive
+        :return: List[models.Payout]
+        """
+
+        return [self._decoder.decode_payout(row) for row in self._store.select(PAYOUTS, None, statuses, start_date,
+                                                                                finish_date)]
+
+
+def _chunks(rows: Iterable[_Row], size: int) -> Iterable[List[_Row]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
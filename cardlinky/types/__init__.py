@@ -1,8 +1,41 @@
-from cardlinky.types.enums.status import *
-from cardlinky.types.enums.currency import *
-from cardlinky.types.enums.bill_type import *
-from cardlinky.types.enums.account_type import *
-from cardlinky.types.models.bill import *
-from cardlinky.types.models.payout import *
-from cardlinky.types.models.payment import *
-from cardlinky.types.models.balance import *
+import importlib
+from typing import Any, List
+
+from cardlinky._lazy import import_submodule
+
+
+# Enums are cheap to import, models load pydantic, so every name is imported on first access
+_LAZY = {
+    "Enum": "cardlinky.types.enums.enum",
+    "UnknownValuePolicy": "cardlinky.types.enums.enum",
+    "set_unknown_value_policy": "cardlinky.types.enums.enum",
+    "Status": "cardlinky.types.enums.status",
+    "Currency": "cardlinky.types.enums.currency",
+    "BillType": "cardlinky.types.enums.bill_type",
+    "AccountType": "cardlinky.types.enums.account_type",
+    "Bill": "cardlinky.types.models.bill",
+    "BillCreate": "cardlinky.types.models.bill",
+    "BillStatus": "cardlinky.types.models.bill",
+    "BillToggleActivity": "cardlinky.types.models.bill",
+    "Payout": "cardlinky.types.models.payout",
+    "PayoutStatus": "cardlinky.types.models.payout",
+    "Payment": "cardlinky.types.models.payment",
+    "PaymentStatus": "cardlinky.types.models.payment",
+    "Balance": "cardlinky.types.models.balance",
+    "Postback": "cardlinky.types.models.postback",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        return import_submodule(__name__, name)
+
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
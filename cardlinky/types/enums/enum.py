@@ -1,13 +1,63 @@
 from __future__ import annotations
 import enum
-from typing import Optional
+from typing import Optional, Dict
+
+
+class UnknownValuePolicy(enum.Enum):
+    """
+    What Enum.from_value does with a value that is not a member.
+    'none' returns None, 'raise' raises ValueError.
+    """
+    NONE: str = "none"
+    RAISE: str = "raise"
+
+
+_unknown_value_policy: UnknownValuePolicy = UnknownValuePolicy.NONE
+_indexes: Dict[type, Dict[str, Enum]] = {}
+
+
+def set_unknown_value_policy(policy: UnknownValuePolicy) -> None:
+    """
+    Set the default policy for unknown values of all enums.
+
+    :param policy: UnknownValuePolicy - New default policy
+    """
+
+    global _unknown_value_policy
+    _unknown_value_policy = UnknownValuePolicy(policy)
 
 
 class Enum(enum.Enum):
     @classmethod
-    def from_value(cls, value: str) -> Optional[Enum]:
-        value = value.lower()
-        for i in cls:
-            if i.value.lower() == value:
-                return i
-        return None
+    def _index(cls) -> Dict[str, Enum]:
+        # Built once per class. Original values are stored too, so exact matches skip lower()
+        try:
+            return _indexes[cls]
+        except KeyError:
+            index = {}
+            for i in cls:
+                index[i.value.lower()] = i
+                index[i.value] = i
+            _indexes[cls] = index
+            return index
+
+    @classmethod
+    def from_value(cls, value: str, unknown: Optional[UnknownValuePolicy] = None) -> Optional[Enum]:
+        """
+        Case-insensitive lookup of a member by its value.
+
+        :param value: str - Value of the member
+        :param unknown: Optional[UnknownValuePolicy] - What to do if there is no such member.
+            Default: the policy set with set_unknown_value_policy, which is UnknownValuePolicy.NONE
+        :return: Optional[Enum]
+        """
+
+        index = cls._index()
+        member = index.get(value)
+        if member is None:
+            member = index.get(value.lower())
+            if member is None:
+                policy = unknown if unknown is not None else _unknown_value_policy
+                if policy is UnknownValuePolicy.RAISE:
+                    raise ValueError(f"{value!r} is not a valid {cls.__name__}")
+        return member
@@ -0,0 +1,8 @@
+from typing import Any
+
+from cardlinky._lazy import import_submodule
+
+
+def __getattr__(name: str) -> Any:
+    # Modules of models are imported on first access
+    return import_submodule(__name__, name)
@@ -1,3 +1,5 @@
+from typing import Union
+from decimal import Decimal
 from pydantic import BaseModel
 
 from cardlinky.types.enums.currency import Currency
@@ -6,12 +8,15 @@ from cardlinky.types.enums.currency import Currency
 class Balance(BaseModel):
     """
     :param currency: Currency - Currency of balance
-    :param balance_available: float - Available balance
-    :param balance_locked: float - Locked balance for payout
-    :param balance_hold: float - Fees
+    :param balance_available: Union[float, decimal.Decimal] - Available balance
+    :param balance_locked: Union[float, decimal.Decimal] - Locked balance for payout
+    :param balance_hold: Union[float, decimal.Decimal] - Fees
     """
 
     currency: Currency
-    balance_available: float
-    balance_locked: float
-    balance_hold: float
+    balance_available: Union[float, Decimal]
+    balance_locked: Union[float, Decimal]
+    balance_hold: Union[float, Decimal]
+
+    class Config:
+        smart_union = True
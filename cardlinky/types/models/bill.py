@@ -1,4 +1,6 @@
 import datetime
+from typing import Union
+from decimal import Decimal
 from pydantic import BaseModel
 
 from cardlinky.types.enums.status import Status
@@ -11,7 +13,7 @@ class Bill(BaseModel):
     :param id: str - Unique bill id
     :param status: enums.Status - Bill status
     :param active: boll - Is bill active
-    :param amount: float - Bill amount
+    :param amount: Union[float, decimal.Decimal] - Bill amount
     :param type: enums.BillType - Bill type. 'Normal' type accepts only one payment.
         'Multi' type accepts unlimited number of payments.
     :param currency_in: enums.Currency - Payment currency
@@ -21,11 +23,14 @@ class Bill(BaseModel):
     id: str
     status: Status
     active: bool
-    amount: float
+    amount: Union[float, Decimal]
     type: BillType
     currency_in: Currency
     created_at: datetime.datetime
 
+    class Config:
+        smart_union = True
+
 
 class BillCreate(BaseModel):
     """
@@ -46,7 +51,7 @@ class BillStatus(BaseModel):
     :param id: str - Unique bill id
     :param status: enums.Status - Bill status
     :param active: boll - Is bill active
-    :param amount: float - Bill amount
+    :param amount: Union[float, decimal.Decimal] - Bill amount
     :param type: enums.BillType - Bill type. 'Normal' type accepts only one payment.
         'Multi' type accepts unlimited number of payments
     :param currency_in: enums.Currency - Payment currency
@@ -58,19 +63,22 @@ class BillStatus(BaseModel):
     id: str
     status: Status
     active: bool
-    amount: float
+    amount: Union[float, Decimal]
     type: BillType
     currency_in: Currency
     created_at: datetime.datetime
     success: bool
 
+    class Config:
+        smart_union = True
+
 
 class BillToggleActivity(BaseModel):
     """
     :param id: str - Unique bill id
     :param active: bool - Bill activity flag
     :param status: enums.Status - Bill status
-    :param amount: float - Bill amount
+    :param amount: Union[float, decimal.Decimal] - Bill amount
     :param type: enums.BillType - Type of bill. NORMAL is for onetime payments and
         MULTI is for infinity number of payments
     :param created_at: datetime.datetime - Bill creation date and time
@@ -81,8 +89,11 @@ class BillToggleActivity(BaseModel):
     id: str
     active: bool
     status: Status
-    amount: float
+    amount: Union[float, Decimal]
     type: BillType
     created_at: datetime.datetime
     currency_in: Currency
     success: bool
+
+    class Config:
+        smart_union = True
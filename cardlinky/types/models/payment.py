@@ -1,5 +1,6 @@
 import datetime
-from typing import Optional
+from typing import Optional, Union
+from decimal import Decimal
 from pydantic import BaseModel
 
 from cardlinky.types.enums.status import Status
@@ -11,10 +12,10 @@ class Payment(BaseModel):
     :param id: str - Unique payment ID
     :param bill_id: str - Unique bill ID
     :param status: enums.Status - Status of payment
-    :param amount: float - Total payment amount
-    :param commission: float - Total payment commission
+    :param amount: Union[float, decimal.Decimal] - Total payment amount
+    :param commission: Union[float, decimal.Decimal] - Total payment commission
     :param currency_in: enums.Currency - Payment currency
-    :param account_amount: float - Total account amount
+    :param account_amount: Union[float, decimal.Decimal] - Total account amount
     :param account_currency_code: enums.Currency - Account currency
     :param from_card: str - Payer's card
     :param created_at: datetime.datetime - Creation date and time
@@ -25,26 +26,29 @@ class Payment(BaseModel):
     id: str
     bill_id: str
     status: Status
-    amount: float
-    commission: float
+    amount: Union[float, Decimal]
+    commission: Union[float, Decimal]
     currency_in: Currency
-    account_amount: float
+    account_amount: Union[float, Decimal]
     account_currency_code: Currency
     from_card: str
     created_at: datetime.datetime
     error_code: Optional[int] = None
     error_message: Optional[str] = None
 
+    class Config:
+        smart_union = True
+
 
 class PaymentStatus(BaseModel):
     """
     :param id: str - Unique payment ID
     :param bill_id: str - Unique bill ID
     :param status: enums.Status - Status of payment
-    :param amount: float - Bill amount
-    :param commission: float - Commission amount
+    :param amount: Union[float, decimal.Decimal] - Bill amount
+    :param commission: Union[float, decimal.Decimal] - Commission amount
     :param currency_in: enums.Currency - Payment currency
-    :param account_amount: float - Total account amount
+    :param account_amount: Union[float, decimal.Decimal] - Total account amount
     :param account_currency_code: enums.Currency - Account currency
     :param from_card: str - Payer's card number
     :param created_at: datetime.datetime - Creation date and time
@@ -55,11 +59,14 @@ class PaymentStatus(BaseModel):
     id: str
     bill_id: str
     status: Status
-    amount: float
-    commission: float
+    amount: Union[float, Decimal]
+    commission: Union[float, Decimal]
     currency_in: Currency
-    account_amount: float
+    account_amount: Union[float, Decimal]
     account_currency_code: Currency
     from_card: str
     created_at: datetime.datetime
     success: bool
+
+    class Config:
+        smart_union = True
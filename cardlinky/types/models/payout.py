@@ -1,4 +1,6 @@
 import datetime
+from typing import Union
+from decimal import Decimal
 from pydantic import BaseModel
 
 from cardlinky.types.enums.status import Status
@@ -9,8 +11,8 @@ class Payout(BaseModel):
     """
     :param id: str - Unique ID of payout
     :param status: enums.Status - Payout status
-    :param amount: float - Payout amount
-    :param commission: float - Fees
+    :param amount: Union[float, decimal.Decimal] - Payout amount
+    :param commission: Union[float, decimal.Decimal] - Fees
     :param account_identifier: str - Account to which money will be sent
     :param currency: enums.Currency - Currency
     :param created_at: datetime.datetime - Date and time
@@ -18,19 +20,22 @@ class Payout(BaseModel):
 
     id: str
     status: Status
-    amount: float
-    commission: float
+    amount: Union[float, Decimal]
+    commission: Union[float, Decimal]
     account_identifier: str
     currency: Currency
     created_at: datetime.datetime
 
+    class Config:
+        smart_union = True
+
 
 class PayoutStatus(BaseModel):
     """
     :param id: str - Unique ID of payout
     :param status: enums.Status - Payout status
-    :param amount: float - Payout amount
-    :param commission: float - Fees
+    :param amount: Union[float, decimal.Decimal] - Payout amount
+    :param commission: Union[float, decimal.Decimal] - Fees
     :param account_identifier: str - Account to which money will be sent
     :param currency: enums.Currency - Currency
     :param created_at: datetime.datetime - Date and time
@@ -39,9 +44,12 @@ class PayoutStatus(BaseModel):
 
     id: str
     status: Status
-    amount: float
-    commission: float
+    amount: Union[float, Decimal]
+    commission: Union[float, Decimal]
     account_identifier: str
     currency: Currency
     created_at: datetime.datetime
     success: bool
+
+    class Config:
+        smart_union = True
@@ -0,0 +1,43 @@
+from typing import Optional, Union
+from decimal import Decimal
+from pydantic import BaseModel
+
+from cardlinky.types.enums.status import Status
+from cardlinky.types.enums.currency import Currency
+
+
+class Postback(BaseModel):
+    """
+    :param status: enums.Status - Payment status. SUCCESS or FAIL
+    :param inv_id: str - Order ID of the bill
+    :param out_sum: Union[float, decimal.Decimal] - Payment amount
+    :param commission: Union[float, decimal.Decimal] - Payment commission
+    :param currency_in: enums.Currency - Payment currency
+    :param trs_id: str - Unique payment ID
+    :param custom: Optional[str] - Custom field of the bill
+    :param account_number: Optional[str] - Payer's card
+    :param account_type: Optional[str] - Type of the payer's account
+    :param balance_amount: Optional[Union[float, decimal.Decimal]] - Amount credited to the balance
+    :param balance_currency: Optional[enums.Currency] - Currency of the balance
+    :param error_code: Optional[int] - Error code
+    :param error_message: Optional[str] - Error message
+    :param signature_value: str - Signature of the postback
+    """
+
+    status: Status
+    inv_id: str
+    out_sum: Union[float, Decimal]
+    commission: Union[float, Decimal]
+    currency_in: Currency
+    trs_id: str
+    custom: Optional[str] = None
+    account_number: Optional[str] = None
+    account_type: Optional[str] = None
+    balance_amount: Optional[Union[float, Decimal]] = None
+    balance_currency: Optional[Currency] = None
+    error_code: Optional[int] = None
+    error_message: Optional[str] = None
+    signature_value: str
+
+    class Config:
+        smart_union = True
@@ -0,0 +1,290 @@
+import time
+import heapq
+import asyncio
+import threading
+import itertools
+from typing import Optional, Callable, Iterable, Iterator, AsyncIterator, Dict, List, Tuple, NamedTuple, Any, \
+    FrozenSet
+
+from cardlinky import bulk
+from cardlinky.cardlinky import Cardlinky
+from cardlinky.async_cardlinky import AsyncCardlinky
+from cardlinky.types.enums.status import Status
+
+
+# Objects with these statuses do not change anymore and are not polled
+TERMINAL_STATUSES: FrozenSet[Status] = frozenset({Status.SUCCESS, Status.FAIL, Status.DECLINED})
+
+BILL = "bill"
+PAYMENT = "payment"
+PAYOUT = "payout"
+
+_METHODS = {
+    BILL: "get_bill_status",
+    PAYMENT: "get_payment_status",
+    PAYOUT: "get_payout_status",
+}
+
+_Key = Tuple[str, str]
+
+
+class Transition(NamedTuple):
+    """
+    A status change, or a failed status request if `error` is set. Failed requests keep the status unchanged.
+
+    :param kind: str - BILL, PAYMENT or PAYOUT
+    :param id: str - Unique ID of the object
+    :param previous: Optional[enums.Status] - Previous status, None on the first poll
+    :param status: Optional[enums.Status] - New status, None if no request of the object succeeded yet
+    :param result: Any - Response of the status method, for example models.BillStatus. None on errors
+    :param error: Optional[Exception] - Error of the status request
+    """
+
+    kind: str
+    id: str
+    previous: Optional[Status]
+    status: Optional[Status]
+    result: Any
+    error: Optional[Exception] = None
+
+
+class _Watched:
+    def __init__(self, interval: float):
+        self.interval: float = interval
+        self.status: Optional[Status] = None
+        self.sequence: int = 0
+        self.errors: int = 0
+
+
+class _Schedule:
+    """
+    Priority queue of watched objects by the time of their next poll.
+    Every poll without changes makes the interval `backoff` times longer, up to max_interval.
+    A status change resets it to min_interval. Objects are dropped after max_errors failed polls in a row.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float, backoff: float,
+                 terminal_statuses: Iterable[Status], max_errors: Optional[int]):
+        self._max_errors: Optional[int] = max_errors
+        self._min_interval: float = min_interval
+        self._max_interval: float = max_interval
+        self._backoff: float = backoff
+        self._terminal_statuses: FrozenSet[Status] = frozenset(terminal_statuses)
+        self._watched: Dict[_Key, _Watched] = {}
+        self._queue: List[Tuple[float, int, _Key]] = []
+        self._counter: Iterator[int] = itertools.count()
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._watched)
+
+    def _push(self, key: _Key, watched: _Watched, at: float) -> None:
+        watched.sequence = next(self._counter)
+        heapq.heappush(self._queue, (at, watched.sequence, key))
+
+    def watch(self, kind: str, id_: str) -> None:
+        """
+        Start watching an object. It is polled on the next poll.
+
+        :param kind: str - BILL, PAYMENT or PAYOUT
+        :param id_: str - Unique ID of the object
+        """
+
+        if kind not in _METHODS:
+            raise ValueError(f"Unknown kind {kind!r}")
+        with self._lock:
+            if (kind, id_) not in self._watched:
+                watched = self._watched[(kind, id_)] = _Watched(self._min_interval)
+                self._push((kind, id_), watched, time.monotonic())
+
+    def watch_bill(self, bill_id: str) -> None:
+        self.watch(BILL, bill_id)
+
+    def watch_payment(self, payment_id: str) -> None:
+        self.watch(PAYMENT, payment_id)
+
+    def watch_payout(self, payout_id: str) -> None:
+        self.watch(PAYOUT, payout_id)
+
+    def unwatch(self, kind: str, id_: str) -> None:
+        """
+        Stop watching an object.
+
+        :param kind: str - BILL, PAYMENT or PAYOUT
+        :param id_: str - Unique ID of the object
+        """
+
+        with self._lock:
+            self._watched.pop((kind, id_), None)
+
+    def _due(self) -> List[_Key]:
+        now, due = time.monotonic(), []
+        with self._lock:
+            while self._queue and self._queue[0][0] <= now:
+                _, sequence, key = heapq.heappop(self._queue)
+                watched = self._watched.get(key)
+                # Entries of unwatched or rescheduled objects are dropped lazily
+                if watched is not None and watched.sequence == sequence:
+                    due.append(key)
+        return due
+
+    def _delay(self) -> Optional[float]:
+        with self._lock:
+            if not self._watched:
+                return None
+            return max(0.0, self._queue[0][0] - time.monotonic()) if self._queue else 0.0
+
+    def _update(self, results: Dict[_Key, Any]) -> List[Transition]:
+        transitions, now = [], time.monotonic()
+        with self._lock:
+            for key, result in results.items():
+                watched = self._watched.get(key)
+                if watched is None:
+                    continue
+
+                if isinstance(result, Exception):
+                    transitions.append(Transition(key[0], key[1], watched.status, watched.status, None, result))
+                    watched.errors += 1
+                    watched.interval = min(self._max_interval, watched.interval * self._backoff)
+                elif result.status != watched.status:
+                    transitions.append(Transition(key[0], key[1], watched.status, result.status, result))
+                    watched.status, watched.interval, watched.errors = result.status, self._min_interval, 0
+                else:
+                    watched.errors = 0
+                    watched.interval = min(self._max_interval, watched.interval * self._backoff)
+
+                if watched.status in self._terminal_statuses or (
+                    self._max_errors is not None and watched.errors >= self._max_errors
+                ):
+                    del self._watched[key]
+                else:
+                    self._push(key, watched, now + watched.interval)
+        return transitions
+
+
+class StatusWatcher(_Schedule):
+    """
+    Polls statuses of bills, payments and payouts until they reach a terminal status.
+    Objects are kept in a priority queue by the time of their next poll, so only due objects are requested.
+    Fresh objects are polled every min_interval seconds, the interval grows while the status does not change.
+
+    :param client: Cardlinky - Client
+    :param callback: Optional[Callable[[Transition], Any]] - Called for every status change and failed poll
+    :param min_interval: float - Seconds between polls of a fresh or just changed object. Default: 5
+    :param max_interval: float - Maximum seconds between polls. Default: 300
+    :param backoff: float - How many times the interval grows after a poll without changes. Default: 1.5
+    :param terminal_statuses: Iterable[enums.Status] - Statuses after which objects are dropped.
+        Default: SUCCESS, FAIL, DECLINED
+    :param max_workers: int - Maximum number of simultaneous requests. Default: 10
+    :param max_errors: Optional[int] - Failed polls in a row after which an object is dropped, for example
+        an unknown ID. Every failed poll is reported as a transition with `error`. None never drops. Default: 10
+    """
+
+    def __init__(self, client: Cardlinky, callback: Optional[Callable[[Transition], Any]] = None,
+                 min_interval: float = 5, max_interval: float = 300, backoff: float = 1.5,
+                 terminal_statuses: Iterable[Status] = TERMINAL_STATUSES, max_workers: int = 10,
+                 max_errors: Optional[int] = 10):
+        super().__init__(min_interval, max_interval, backoff, terminal_statuses, max_errors)
+        self._client: Cardlinky = client
+        self._callback: Optional[Callable[[Transition], Any]] = callback
+        self._max_workers: int = max_workers
+
+    def poll(self) -> List[Transition]:
+        """
+        Request statuses of all due objects once, without waiting.
+
+        :return: List[Transition] - Status changes and failed polls. The callback is called for each of them
+        """
+
+        due = self._due()
+        if not due:
+            return []
+
+        results = bulk.map_concurrently(lambda key: getattr(self._client, _METHODS[key[0]])(key[1]),
+                                        due, self._max_workers)
+        transitions = self._update(results)
+        if self._callback is not None:
+            for transition in transitions:
+                self._callback(transition)
+        return transitions
+
+    def transitions(self, stop: Optional[threading.Event] = None) -> Iterator[Transition]:
+        """
+        Poll until all objects reach terminal statuses or are dropped, yielding status changes and failed polls.
+
+        :param stop: Optional[threading.Event] - Set it to stop polling
+        :return: Iterator[Transition]
+        """
+
+        stop = stop if stop is not None else threading.Event()
+        while not stop.is_set():
+            yield from self.poll()
+            delay = self._delay()
+            if delay is None:
+                return
+            stop.wait(delay)
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        """
+        Poll until all objects reach terminal statuses or are dropped, delivering transitions to the callback.
+
+        :param stop: Optional[threading.Event] - Set it to stop polling
+        """
+
+        for _ in self.transitions(stop):
+            pass
+
+
+class AsyncStatusWatcher(_Schedule):
+    """
+    Asynchronous version of StatusWatcher for AsyncCardlinky. Iterate over it with `async for`
+    to receive status changes and failed polls until all objects reach terminal statuses or are dropped.
+
+    :param client: AsyncCardlinky - Client
+    :param callback: Optional[Callable[[Transition], Any]] - Called for every status change and failed poll
+    :param min_interval: float - Seconds between polls of a fresh or just changed object. Default: 5
+    :param max_interval: float - Maximum seconds between polls. Default: 300
+    :param backoff: float - How many times the interval grows after a poll without changes. Default: 1.5
+    :param terminal_statuses: Iterable[enums.Status] - Statuses after which objects are dropped.
+        Default: SUCCESS, FAIL, DECLINED
+    :param concurrency: int - Maximum number of simultaneous requests. Default: 10
+    :param max_errors: Optional[int] - Failed polls in a row after which an object is dropped, for example
+        an unknown ID. Every failed poll is reported as a transition with `error`. None never drops. Default: 10
+    """
+
+    def __init__(self, client: AsyncCardlinky, callback: Optional[Callable[[Transition], Any]] = None,
+                 min_interval: float = 5, max_interval: float = 300, backoff: float = 1.5,
+                 terminal_statuses: Iterable[Status] = TERMINAL_STATUSES, concurrency: int = 10,
+                 max_errors: Optional[int] = 10):
+        super().__init__(min_interval, max_interval, backoff, terminal_statuses, max_errors)
+        self._client: AsyncCardlinky = client
+        self._callback: Optional[Callable[[Transition], Any]] = callback
+        self._concurrency: int = concurrency
+
+    async def poll(self) -> List[Transition]:
+        """
+        Request statuses of all due objects once, without waiting.
+
+        :return: List[Transition] - Status changes and failed polls. The callback is called for each of them
+        """
+
+        due = self._due()
+        if not due:
+            return []
+
+        results = await bulk.gather_concurrently(lambda key: getattr(self._client, _METHODS[key[0]])(key[1]),
+                                                 due, self._concurrency)
+        transitions = self._update(results)
+        if self._callback is not None:
+            for transition in transitions:
+                self._callback(transition)
+        return transitions
+
+    async def __aiter__(self) -> AsyncIterator[Transition]:
+        while True:
+            for transition in await self.poll():
+                yield transition
+            delay = self._delay()
+            if delay is None:
+                return
+            await asyncio.sleep(delay)
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from cardlinky.async_cardlinky import AsyncCardlinky  # noqa: E402
+
+
+class Session:
+    """
+    Stand-in for an aiohttp.ClientSession passed by the caller.
+    """
+
+    closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def test_close_keeps_caller_session():
+    session = Session()
+    client = AsyncCardlinky("TOKEN", session=session)
+
+    asyncio.run(client.close())
+    assert not session.closed
+    assert client._get_session() is session
+
+
+def test_close_drops_own_session():
+    async def run() -> None:
+        client = AsyncCardlinky("TOKEN")
+        session = client._get_session()
+        await client.close()
+        assert session.closed
+        assert client._get_session() is not session
+        await client.close()
+
+    asyncio.run(run())
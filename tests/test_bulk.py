@@ -0,0 +1,42 @@
+import time
+import threading
+
+from cardlinky import bulk
+
+
+def test_map_concurrently_keeps_order_of_keys():
+    keys = [5, 3, 9, 1, 7, 3, 5]
+
+    results = bulk.map_concurrently(lambda key: key * 10, keys, max_workers=4)
+
+    assert list(results) == [5, 3, 9, 1, 7]
+    assert list(results.values()) == [50, 30, 90, 10, 70]
+
+
+def test_map_concurrently_isolates_errors():
+    error = ValueError("Bill not found")
+
+    def get(key: str) -> str:
+        if key == "BAD":
+            raise error
+        return key.lower()
+
+    results = bulk.map_concurrently(get, ["A", "BAD", "B"], max_workers=3)
+
+    assert results == {"A": "a", "BAD": error, "B": "b"}
+
+
+def test_map_concurrently_limits_workers():
+    lock, running, peak = threading.Lock(), [0], [0]
+
+    def call(key: int) -> int:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return key
+
+    assert list(bulk.map_concurrently(call, range(12), max_workers=3).values()) == list(range(12))
+    assert peak[0] <= 3
@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+
+from cardlinky import cache as caching
+from cardlinky.cache import MemoryCache
+from cardlinky.cardlinky import Cardlinky
+
+
+BILL_STATUS = {
+    "success": True, "id": "BILL-ID", "status": "NEW", "active": True, "amount": 100, "type": "normal",
+    "currency_in": "RUB", "created_at": "2023-04-01 10:00:00",
+}
+
+
+class Clock:
+    """
+    Replaces time.monotonic of the cache.
+    """
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(caching.time, "monotonic", clock)
+    return clock
+
+
+def test_values_expire_after_ttl(clock):
+    cache = MemoryCache()
+    cache.set("short", 1, 5)
+    cache.set("forever", 2, None)
+
+    clock.now += 4.9
+    assert cache.get("short") == 1
+    clock.now += 0.1
+    assert cache.get("short") is None
+    assert cache.get("forever") == 2
+
+
+def test_least_recently_used_is_evicted():
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", 1, None)
+    cache.set("b", 2, None)
+    cache.get("a")
+    cache.set("c", 3, None)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_add_stores_only_missing_or_expired_keys(clock):
+    cache = MemoryCache()
+
+    assert cache.add("key", 1, 5)
+    assert not cache.add("key", 2, 5)
+    clock.now += 5
+    assert cache.add("key", 3, 5)
+    assert cache.get("key") == 3
+
+
+def test_add_is_atomic():
+    cache, start = MemoryCache(), threading.Barrier(16)
+    added = []
+
+    def add(i: int) -> None:
+        start.wait(5)
+        if cache.add("key", i, None):
+            added.append(i)
+
+    threads = [threading.Thread(target=add, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(added) == 1
+    assert cache.get("key") == added[0]
+
+
+def test_clients_with_different_tokens_do_not_share_responses(monkeypatch):
+    cache = MemoryCache()
+    first, second = Cardlinky("TOKEN-1", cache=cache), Cardlinky("TOKEN-2", cache=cache)
+    monkeypatch.setattr(first, "_request", lambda method, path, json: {"balances": ["FIRST"]})
+    monkeypatch.setattr(second, "_request", lambda method, path, json: {"balances": ["SECOND"]})
+
+    assert first.get_raw("merchant/balance", {}) == {"balances": ["FIRST"]}
+    assert second.get_raw("merchant/balance", {}) == {"balances": ["SECOND"]}
+    assert "TOKEN-1" not in first.cache_namespace
+    assert first.cache_namespace == Cardlinky("TOKEN-1").cache_namespace != second.cache_namespace
+
+
+def test_toggle_activity_invalidates_bill_status(monkeypatch):
+    client = Cardlinky("TOKEN", cache=MemoryCache())
+    responses = {"bill/status": dict(BILL_STATUS), "bill/toggle_activity": {**BILL_STATUS, "active": False}}
+    sent = []
+
+    def request(method: str, path: str, json: dict) -> dict:
+        sent.append(path)
+        return responses[path]
+
+    monkeypatch.setattr(client, "_request", request)
+    assert client.get_bill_status("BILL-ID").active is True
+    assert client.get_bill_status("BILL-ID").active is True
+    assert sent == ["bill/status"]
+
+    client.toggle_bill_activity("BILL-ID", False)
+    responses["bill/status"]["active"] = False
+    assert client.get_bill_status("BILL-ID").active is False
+    assert sent == ["bill/status", "bill/toggle_activity", "bill/status"]
@@ -0,0 +1,56 @@
+import datetime
+
+import pytest
+
+from cardlinky import columnar
+
+
+ROWS = [
+    {"id": "1", "status": "SUCCESS", "active": True, "amount": 100.1, "type": "normal", "currency_in": "RUB",
+     "created_at": "2023-04-01 10:00:00"},
+    {"id": "2", "status": "fail", "active": False, "amount": 0.29, "type": "MULTI", "currency_in": "USD",
+     "created_at": "2023-04-02 11:30:00"},
+    {"id": "3", "status": "REFUNDED", "active": 1, "amount": 5, "type": "normal", "currency_in": "EUR",
+     "created_at": "2023-04-03 12:00:00"},
+]
+
+
+def test_enums_are_codes_into_categories():
+    columns = columnar.to_columns(ROWS, columnar.BILL_SCHEMA)
+    statuses = columns.categories["status"]
+
+    assert columns.rows == 3
+    assert [statuses[code] for code in columns["status"][:2]] == ["SUCCESS", "FAIL"]
+    # Unknown values get -1
+    assert columns["status"][2] == -1
+    assert [columns.categories["type"][code] for code in columns["type"]] == ["normal", "multi", "normal"]
+    assert list(columns["active"]) == [1, 0, 1]
+    assert columns["created_at"][1] == datetime.datetime(2023, 4, 2, 11, 30)
+
+
+def test_amounts_in_minor_units():
+    floats = columnar.to_columns(ROWS, columnar.BILL_SCHEMA)
+    minor = columnar.to_columns(ROWS, columnar.BILL_SCHEMA, minor_units=True)
+
+    assert list(floats["amount"]) == [100.1, 0.29, 5.0]
+    assert minor["amount"].typecode == "q"
+    assert list(minor["amount"]) == [10010, 29, 500]
+
+
+def test_to_numpy():
+    numpy = pytest.importorskip("numpy")
+
+    result = columnar.to_columns(ROWS, columnar.BILL_SCHEMA).to_numpy()
+
+    assert result["amount"].dtype == numpy.float64
+    assert list(result["status"]) == list(columnar.to_columns(ROWS, columnar.BILL_SCHEMA)["status"])
+    assert result["created_at"][0] == numpy.datetime64("2023-04-01T10:00:00")
+
+
+def test_to_pandas():
+    pytest.importorskip("pandas")
+
+    frame = columnar.to_columns(ROWS, columnar.BILL_SCHEMA).to_pandas()
+
+    assert list(frame["status"].astype(object).fillna("?")) == ["SUCCESS", "FAIL", "?"]
+    assert list(frame["active"]) == [True, False, True]
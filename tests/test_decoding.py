@@ -0,0 +1,58 @@
+import datetime
+
+import pytest
+
+from cardlinky.decoding import Decoder, parse_datetime
+from cardlinky.types.enums.status import Status
+from cardlinky.types.enums.currency import Currency
+
+
+BILL = {
+    "id": "BILL-ID",
+    "status": "SUCCESS",
+    "active": 1,
+    "amount": 100.5,
+    "type": "normal",
+    "currency_in": "RUB",
+    "created_at": "2023-04-01 10:00:00",
+    "unexpected": "value",
+}
+
+
+@pytest.mark.parametrize("validate", [True, False])
+def test_models_are_same_with_and_without_validation(validate):
+    bill = Decoder(validate=validate).decode_bill(BILL)
+
+    assert bill.active is True
+    assert bill.status is Status.SUCCESS
+    assert bill.currency_in is Currency.RUB
+    assert bill.created_at == datetime.datetime(2023, 4, 1, 10)
+    assert not hasattr(bill, "unexpected")
+    assert bill.dict() == Decoder().decode_bill(BILL).dict()
+
+
+@pytest.mark.parametrize("active", [0, "0", "false", False])
+def test_construct_converts_false_booleans(active):
+    assert Decoder(validate=False).decode_bill({**BILL, "active": active}).active is False
+
+
+@pytest.mark.parametrize("value", ["2023-04-01 10:00:00", "2023-12-31 23:59:59", "2024-02-29 00:00:01"])
+def test_fast_path_matches_strptime(value):
+    # Values of the fixed format go through fromisoformat
+    assert parse_datetime(value) == datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+
+
+def test_other_formats_fall_back_to_strptime():
+    assert parse_datetime("2023-4-1 9:05:00") == datetime.datetime(2023, 4, 1, 9, 5)
+    with pytest.raises(ValueError):
+        parse_datetime("2023-04-01T10:00:00+03:00")
+
+
+def test_timezone_is_attached():
+    tz = datetime.timezone(datetime.timedelta(hours=3))
+
+    naive, aware = parse_datetime("2023-04-01 10:00:00"), parse_datetime("2023-04-01 10:00:00", tz)
+
+    assert naive.tzinfo is None
+    assert aware.tzinfo is tz and aware.replace(tzinfo=None) == naive
+    assert parse_datetime("2023-4-1 10:00:00", tz).tzinfo is tz
@@ -0,0 +1,51 @@
+import pytest
+
+from cardlinky.types.enums import enum
+from cardlinky.types.enums.enum import UnknownValuePolicy, set_unknown_value_policy
+from cardlinky.types.enums.status import Status
+from cardlinky.types.enums.currency import Currency
+from cardlinky.types.enums.bill_type import BillType
+
+
+@pytest.fixture(autouse=True)
+def default_policy():
+    yield
+    set_unknown_value_policy(UnknownValuePolicy.NONE)
+
+
+@pytest.mark.parametrize("value", ["SUCCESS", "success", "Success"])
+def test_lookup_is_case_insensitive(value):
+    assert Status.from_value(value) is Status.SUCCESS
+
+
+def test_index_is_built_once_per_class():
+    Status.from_value("NEW")
+    Currency.from_value("RUB")
+    index = enum._indexes[Status]
+
+    Status.from_value("FAIL")
+    assert enum._indexes[Status] is index
+    # Every class has its own index, so equal values of different enums do not mix
+    assert "RUB" not in index and enum._indexes[Currency]["RUB"] is Currency.RUB
+    assert BillType.from_value("NORMAL") is BillType.NORMAL
+
+
+def test_unknown_value_is_none_by_default():
+    assert Status.from_value("REFUNDED") is None
+
+
+def test_unknown_value_policy_raise():
+    with pytest.raises(ValueError):
+        Status.from_value("REFUNDED", UnknownValuePolicy.RAISE)
+
+    set_unknown_value_policy(UnknownValuePolicy.RAISE)
+    with pytest.raises(ValueError):
+        Status.from_value("REFUNDED")
+    # An explicit policy overrides the default
+    assert Status.from_value("REFUNDED", UnknownValuePolicy.NONE) is None
+
+
+def test_policy_is_set_by_value():
+    set_unknown_value_policy("raise")
+    with pytest.raises(ValueError):
+        Currency.from_value("XXX")
@@ -0,0 +1,181 @@
+import threading
+
+import pytest
+import requests
+import urllib3
+
+from cardlinky.cache import MemoryCache
+from cardlinky.cardlinky import Cardlinky, CardlinkyAPIError, _is_ambiguous
+from cardlinky.idempotency import IdempotencyLedger, AmbiguousResultError, InProgressError, \
+    IdempotencyKeyMismatchError
+
+
+PAYOUT = {"success": True, "data": [{"id": "PAYOUT-ID"}]}
+
+
+class Calls:
+    """
+    Request function that counts its calls and raises the queued errors first.
+    """
+
+    def __init__(self, *errors: Exception):
+        self.count = 0
+        self._errors = list(errors)
+
+    def __call__(self) -> dict:
+        self.count += 1
+        if self._errors:
+            raise self._errors.pop(0)
+        return PAYOUT
+
+
+def test_done_returns_stored_response():
+    ledger, send = IdempotencyLedger(), Calls()
+
+    assert ledger.run("KEY", send, _is_ambiguous) is PAYOUT
+    assert ledger.run("KEY", send, _is_ambiguous) is PAYOUT
+    assert send.count == 1
+
+
+def test_unknown_result_blocks_until_forgotten():
+    ledger, send = IdempotencyLedger(), Calls(requests.exceptions.ReadTimeout())
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        ledger.run("KEY", send, _is_ambiguous)
+    with pytest.raises(AmbiguousResultError) as error:
+        ledger.run("KEY", send, _is_ambiguous)
+    assert send.count == 1
+
+    ledger.forget(error.value.key)
+    assert ledger.run("KEY", send, _is_ambiguous) is PAYOUT
+    assert send.count == 2
+
+
+@pytest.mark.parametrize("error", [
+    CardlinkyAPIError("Not enough money"),
+    requests.exceptions.ConnectTimeout(),
+    requests.exceptions.ConnectionError(urllib3.exceptions.MaxRetryError(
+        None, "/", urllib3.exceptions.NewConnectionError(None, "Connection refused"),
+    )),
+])
+def test_error_before_performing_can_be_retried(error):
+    ledger, send = IdempotencyLedger(), Calls(error)
+
+    with pytest.raises(type(error)):
+        ledger.run("KEY", send, _is_ambiguous)
+    assert ledger.run("KEY", send, _is_ambiguous) is PAYOUT
+    assert send.count == 2
+
+
+def test_dropped_connection_is_ambiguous():
+    error = requests.exceptions.ConnectionError(urllib3.exceptions.ProtocolError("Connection aborted"))
+    assert _is_ambiguous(error)
+
+
+def test_concurrent_calls_with_one_key_send_once():
+    ledger, started, release = IdempotencyLedger(), threading.Event(), threading.Event()
+    count = []
+
+    def send() -> dict:
+        count.append(1)
+        started.set()
+        release.wait(5)
+        return PAYOUT
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(ledger.run("KEY", send, _is_ambiguous)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(count) == 1
+    assert results == [PAYOUT] * 8
+
+
+def test_key_reserved_in_shared_store_is_in_progress():
+    # Two ledgers over one store stand for two processes sharing a backend
+    store = MemoryCache()
+    first, second = IdempotencyLedger(store), IdempotencyLedger(store)
+    started, release = threading.Event(), threading.Event()
+
+    def send() -> dict:
+        started.set()
+        release.wait(5)
+        return PAYOUT
+
+    thread = threading.Thread(target=first.run, args=("KEY", send, _is_ambiguous))
+    thread.start()
+    started.wait(5)
+
+    second_send = Calls()
+    with pytest.raises(InProgressError):
+        second.run("KEY", second_send, _is_ambiguous)
+    release.set()
+    thread.join(5)
+
+    assert second.run("KEY", second_send, _is_ambiguous) is PAYOUT
+    assert second_send.count == 0
+
+
+def test_client_forgets_namespaced_keys(monkeypatch):
+    client = Cardlinky("TOKEN")
+    send = Calls(requests.exceptions.ReadTimeout())
+    monkeypatch.setattr(client, "_post", lambda path, json: send())
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.create_personal_payout(10, "ACCOUNT", idempotency_key="PAYOUT-1")
+    with pytest.raises(AmbiguousResultError):
+        client.create_personal_payout(10, "ACCOUNT", idempotency_key="PAYOUT-1")
+
+    client.forget_idempotency_key("PAYOUT-1")
+    monkeypatch.setattr(client._decoder, "decode_payouts", lambda response: response["data"])
+    assert client.create_personal_payout(10, "ACCOUNT", idempotency_key="PAYOUT-1") == PAYOUT["data"]
+    assert send.count == 2
+
+    with pytest.raises(ValueError):
+        client.forget_idempotency_key("PAYOUT-1", shop_id="SHOP")
+
+
+def test_key_reused_with_another_body_raises():
+    ledger, send = IdempotencyLedger(), Calls()
+    body = {"amount": 10, "account_no": "ACCOUNT"}
+
+    assert ledger.run("KEY", send, _is_ambiguous, body) is PAYOUT
+    assert ledger.run("KEY", send, _is_ambiguous, dict(reversed(body.items()))) is PAYOUT
+    with pytest.raises(IdempotencyKeyMismatchError):
+        ledger.run("KEY", send, _is_ambiguous, {**body, "amount": 20})
+    assert send.count == 1
+
+
+def test_concurrent_call_with_another_body_is_not_coalesced():
+    ledger, started, release = IdempotencyLedger(), threading.Event(), threading.Event()
+
+    def send() -> dict:
+        started.set()
+        release.wait(5)
+        return PAYOUT
+
+    thread = threading.Thread(target=ledger.run, args=("KEY", send, _is_ambiguous, {"amount": 10}))
+    thread.start()
+    started.wait(5)
+    with pytest.raises(IdempotencyKeyMismatchError):
+        ledger.run("KEY", Calls(), _is_ambiguous, {"amount": 20})
+    release.set()
+    thread.join(5)
+
+
+def test_client_rejects_bill_with_same_order_and_another_amount(monkeypatch):
+    client = Cardlinky("TOKEN")
+    send = Calls()
+    monkeypatch.setattr(client, "_post", lambda path, json: send())
+    monkeypatch.setattr(client._decoder, "decode_bill_create", lambda response: response)
+
+    client.create_bill(100, "SHOP", order_id="ORDER-1")
+    client.create_bill(100, "SHOP", order_id="ORDER-1")
+    with pytest.raises(IdempotencyKeyMismatchError):
+        client.create_bill(200, "SHOP", order_id="ORDER-1")
+    assert send.count == 1
@@ -0,0 +1,38 @@
+import sys
+import subprocess
+
+import pytest
+
+
+# Public names of the package before imports became lazy. Typing helpers and third-party modules that star imports
+# used to leak, like cardlinky.requests or cardlinky.types.BaseModel, are not part of it
+BASELINE = {
+    "cardlinky": [
+        "AccountType", "Balance", "Bill", "BillCreate", "BillStatus", "BillToggleActivity", "BillType", "Cardlinky",
+        "Currency", "Payment", "PaymentStatus", "Payout", "PayoutStatus", "Status", "cardlinky", "types",
+    ],
+    "cardlinky.types": [
+        "AccountType", "Balance", "Bill", "BillCreate", "BillStatus", "BillToggleActivity", "BillType", "Currency",
+        "Enum", "Payment", "PaymentStatus", "Payout", "PayoutStatus", "Status", "enums", "models",
+    ],
+    "cardlinky.types.enums": ["account_type", "bill_type", "currency", "status"],
+    "cardlinky.types.models": ["balance", "bill", "payment", "payout"],
+}
+
+
+def run(code: str) -> None:
+    # A fresh interpreter, so submodules imported by other tests do not hide a missing attribute
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.parametrize("package, names", BASELINE.items())
+def test_baseline_names_resolve_after_import(package, names):
+    run(f"import cardlinky\nfor name in {names!r}:\n    getattr({package}, name)")
+
+
+def test_import_does_not_load_dependencies():
+    run("import sys, cardlinky\nassert not {'requests', 'pydantic', 'aiohttp'} & set(sys.modules)")
+
+
+def test_missing_name_raises_attribute_error():
+    run("import cardlinky\nassert not hasattr(cardlinky, 'missing') and not hasattr(cardlinky.types, 'missing')")
@@ -0,0 +1,58 @@
+from cardlinky.instrumentation import Metrics, ResponseEvent
+
+
+def test_prometheus_output():
+    metrics = Metrics(buckets=(0.1, 1))
+    metrics.on_response(ResponseEvent("GET", "merchant/balance", 200, 0, 2, 120, 0.03, 0.05))
+    metrics.on_response(ResponseEvent("GET", "merchant/balance", 503, 1, 2, 20, 0.5, 0.5))
+    metrics.on_error("POST", "bill/create", TimeoutError())
+    metrics.on_decode("Payment", 1000, 2)
+
+    assert metrics.to_prometheus().splitlines() == [
+        "# TYPE cardlinky_decoded_rows_total counter",
+        'cardlinky_decoded_rows_total{model="Payment"} 1000',
+        "# TYPE cardlinky_errors_total counter",
+        'cardlinky_errors_total{method="POST",path="bill/create",error="TimeoutError"} 1',
+        "# TYPE cardlinky_request_bytes_total counter",
+        'cardlinky_request_bytes_total{method="GET",path="merchant/balance"} 4',
+        "# TYPE cardlinky_requests_total counter",
+        'cardlinky_requests_total{method="GET",path="merchant/balance",status="200"} 1',
+        'cardlinky_requests_total{method="GET",path="merchant/balance",status="503"} 1',
+        "# TYPE cardlinky_response_bytes_total counter",
+        'cardlinky_response_bytes_total{method="GET",path="merchant/balance"} 140',
+        "# TYPE cardlinky_retries_total counter",
+        'cardlinky_retries_total{method="GET",path="merchant/balance"} 1',
+        "# TYPE cardlinky_decode_duration_seconds histogram",
+        'cardlinky_decode_duration_seconds_bucket{model="Payment",le="0.1"} 0',
+        'cardlinky_decode_duration_seconds_bucket{model="Payment",le="1"} 0',
+        'cardlinky_decode_duration_seconds_bucket{model="Payment",le="+Inf"} 1',
+        'cardlinky_decode_duration_seconds_sum{model="Payment"} 2',
+        'cardlinky_decode_duration_seconds_count{model="Payment"} 1',
+        "# TYPE cardlinky_request_duration_seconds histogram",
+        'cardlinky_request_duration_seconds_bucket{method="GET",path="merchant/balance",le="0.1"} 1',
+        'cardlinky_request_duration_seconds_bucket{method="GET",path="merchant/balance",le="1"} 2',
+        'cardlinky_request_duration_seconds_bucket{method="GET",path="merchant/balance",le="+Inf"} 2',
+        'cardlinky_request_duration_seconds_sum{method="GET",path="merchant/balance"} 0.55',
+        'cardlinky_request_duration_seconds_count{method="GET",path="merchant/balance"} 2',
+        "# TYPE cardlinky_response_headers_seconds histogram",
+        'cardlinky_response_headers_seconds_bucket{method="GET",path="merchant/balance",le="0.1"} 1',
+        'cardlinky_response_headers_seconds_bucket{method="GET",path="merchant/balance",le="1"} 2',
+        'cardlinky_response_headers_seconds_bucket{method="GET",path="merchant/balance",le="+Inf"} 2',
+        'cardlinky_response_headers_seconds_sum{method="GET",path="merchant/balance"} 0.53',
+        'cardlinky_response_headers_seconds_count{method="GET",path="merchant/balance"} 2',
+    ]
+
+
+def test_label_values_are_escaped():
+    metrics = Metrics()
+    metrics.on_error("GET", 'bill/"status"\n', ValueError())
+
+    assert 'path="bill/\\"status\\"\\n"' in metrics.to_prometheus()
+
+
+def test_clear():
+    metrics = Metrics()
+    metrics.on_decode("Bill", 1, 0.1)
+    metrics.clear()
+
+    assert metrics.to_prometheus() == "\n"
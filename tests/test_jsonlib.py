@@ -0,0 +1,43 @@
+import pytest
+
+from cardlinky import jsonlib
+from cardlinky.jsonlib import JSONBackend
+
+
+DOCUMENT = {"amount": 100.5, "description": "Заказ №1", "payer_pays_commission": True, "custom": None}
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    backend = jsonlib.get_backend()
+    yield
+    jsonlib.set_backend(backend)
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "ujson"])
+def test_backends_round_trip(name):
+    try:
+        jsonlib.set_backend(name)
+    except ImportError:
+        pytest.skip(f"{name} is not installed")
+
+    assert jsonlib.get_backend().name == name
+    data = jsonlib.dumps(DOCUMENT)
+    assert isinstance(data, bytes)
+    assert jsonlib.loads(data) == jsonlib.loads(data.decode()) == DOCUMENT
+    with pytest.raises(ValueError):
+        jsonlib.loads(b'{"success": ')
+
+
+def test_custom_backend_is_used():
+    calls = []
+    jsonlib.set_backend(JSONBackend("custom", lambda obj: calls.append(obj) or b"{}", lambda data: {"parsed": data}))
+
+    assert jsonlib.dumps(DOCUMENT) == b"{}" and calls == [DOCUMENT]
+    assert jsonlib.loads(b"[]") == {"parsed": b"[]"}
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        jsonlib.set_backend("simplejson")
+    assert jsonlib.get_backend().name in ("orjson", "ujson", "json")
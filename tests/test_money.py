@@ -0,0 +1,39 @@
+import decimal
+
+import pytest
+
+from cardlinky import columnar, money
+
+
+PAYMENTS = [
+    {"id": "PAYMENT-1", "bill_id": "BILL-1", "status": "SUCCESS", "amount": 10.0, "commission": 0.4,
+     "currency_in": "USD", "account_amount": 900.5, "account_currency_code": "RUB", "from_card": "220220******1234",
+     "created_at": "2023-04-01 10:00:00", "error_code": None, "error_message": None},
+    {"id": "PAYMENT-2", "bill_id": "BILL-2", "status": "SUCCESS", "amount": 100.1, "commission": 4.0,
+     "currency_in": "RUB", "account_amount": 96.1, "account_currency_code": "RUB", "from_card": "220220******1234",
+     "created_at": "2023-04-01 11:00:00", "error_code": None, "error_message": None},
+]
+
+
+def test_account_amounts_are_grouped_by_account_currency():
+    columns = columnar.to_columns(PAYMENTS, columnar.PAYMENT_SCHEMA, minor_units=True)
+
+    assert money.sum_by_currency(columns) == {"USD": 1000, "RUB": 10010}
+    assert money.sum_by_currency(columns, "account_amount") == {"RUB": 99660}
+
+
+@pytest.mark.parametrize("amount", ["1.005", "1.015", "2.675", "0.125", "0.135", "-1.015", "100.10", "0.29",
+                                    "96.1", "12345678.99", "0.3000000001", "7"])
+def test_float_and_decimal_amounts_round_alike(amount):
+    expected = money.to_minor(decimal.Decimal(amount))
+
+    assert money.to_minor(float(amount)) == expected
+    assert money.to_minor(amount) == expected
+
+
+def test_half_way_amounts_round_half_to_even():
+    for cents in range(0, 100_000, 7):
+        amount = f"{cents // 100}.{cents % 100:02d}5"
+        assert money.to_minor(float(amount)) == money.to_minor(decimal.Decimal(amount)), amount
+
+    assert money.to_minor(1.015) == 102 and money.to_minor(1.025) == 102
@@ -0,0 +1,27 @@
+import asyncio
+import concurrent.futures
+
+from cardlinky.decoding import Decoder
+from cardlinky.offload import OffloadDecoder, AsyncOffloadDecoder
+
+
+RESPONSE = {"success": True, "data": [
+    {"id": f"PAYOUT-{i}", "status": "SUCCESS", "amount": 100.0 + i, "commission": 4.0,
+     "account_identifier": "220220******1234", "currency": "RUB", "created_at": "2023-04-01 10:00:00"}
+    for i in range(25)
+]}
+
+
+def test_chunks_are_decoded_in_order():
+    expected = Decoder().decode_payouts(RESPONSE)
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        decoder = OffloadDecoder(Decoder(), executor, min_rows=10, chunk_rows=3)
+        assert decoder.decode_payouts(RESPONSE) == expected
+
+
+def test_async_chunks_are_decoded_in_order():
+    expected = Decoder().decode_payouts(RESPONSE)
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        decoder = AsyncOffloadDecoder(Decoder(), executor, min_rows=10, chunk_rows=3)
+        assert asyncio.run(decoder.decode_payouts(RESPONSE)) == expected
+        assert asyncio.run(decoder.decode_payouts({"data": RESPONSE["data"][:5]})) == expected[:5]
@@ -0,0 +1,94 @@
+import datetime
+
+import pytest
+
+from cardlinky import pagination
+from cardlinky.cache import MemoryCache
+from cardlinky.cardlinky import Cardlinky
+
+
+START = datetime.date(2023, 1, 1)
+
+
+class Search:
+    """
+    Fetch function over a fixed number of rows per day that records the requested windows.
+    """
+
+    def __init__(self, rows_per_day: dict):
+        self.windows = []
+        self._rows_per_day = rows_per_day
+
+    def __call__(self, start: datetime.date, finish: datetime.date) -> list:
+        self.windows.append((start, finish))
+        days = (finish - start).days + 1
+        return [{"day": start + datetime.timedelta(days=i), "n": n}
+                for i in range(days) for n in range(self._rows_per_day.get(start + datetime.timedelta(days=i), 0))]
+
+
+def covered(windows: list) -> list:
+    # Windows that were yielded, the last fetch of every start day
+    last = {}
+    for start, finish in windows:
+        last[start] = finish
+    return sorted(last.items())
+
+
+def test_window_with_max_rows_is_split():
+    search = Search({START + datetime.timedelta(days=1): 10})
+
+    rows = list(pagination.iter_windows(search, dict, START, START + datetime.timedelta(days=3),
+                                        window_days=4, max_rows=10))
+
+    assert len(rows) == 10
+    assert search.windows[:3] == [
+        (START, START + datetime.timedelta(days=3)),
+        (START, START + datetime.timedelta(days=1)),
+        (START, START),
+    ]
+
+
+def test_windows_grow_after_short_windows():
+    search = Search({START: 8})
+
+    list(pagination.iter_windows(search, dict, START, START + datetime.timedelta(days=9), window_days=4,
+                                 max_rows=8))
+
+    sizes = [(finish - start).days + 1 for start, finish in search.windows]
+    # Split down to the busy day, then doubled back up after each empty window, the last one cut at the finish
+    assert sizes == [4, 2, 1, 1, 2, 4, 2]
+
+
+@pytest.mark.parametrize("window_days, max_rows", [(1, None), (3, None), (7, 5), (30, 2)])
+def test_windows_cover_range_without_gaps_or_overlaps(window_days, max_rows):
+    finish = START + datetime.timedelta(days=40)
+    rows_per_day = {START + datetime.timedelta(days=i): i % 4 for i in range(41)}
+    search = Search(rows_per_day)
+
+    rows = list(pagination.iter_windows(search, dict, START, finish, window_days, max_rows))
+
+    windows = covered(search.windows)
+    assert windows[0][0] == START and windows[-1][1] == finish
+    for (_, previous_finish), (next_start, _) in zip(windows, windows[1:]):
+        assert next_start == previous_finish + datetime.timedelta(days=1)
+    assert len(rows) == sum(rows_per_day.values())
+    assert [row["day"] for row in rows] == sorted(row["day"] for row in rows)
+
+
+def test_iterators_bypass_cache(monkeypatch):
+    client = Cardlinky("TOKEN", cache=MemoryCache())
+    requests = []
+
+    def request(method: str, path: str, json: dict) -> dict:
+        requests.append(path)
+        return {"success": True, "data": []}
+
+    monkeypatch.setattr(client, "_request", request)
+    for _ in range(2):
+        list(client.iter_payments("SHOP", START, START + datetime.timedelta(days=2)))
+    assert len(requests) == 6
+
+    # Searches are still cached
+    client.search_payment("SHOP", START, START)
+    client.search_payment("SHOP", START, START)
+    assert len(requests) == 7
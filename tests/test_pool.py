@@ -0,0 +1,95 @@
+import json
+import time
+import datetime
+import threading
+
+import requests
+
+from cardlinky import cardlinky
+from cardlinky.pool import CardlinkyPool, merge
+from cardlinky.retry import Retry
+
+
+SHOPS = {"SHOP-1": "TOKEN-1", "SHOP-2": "TOKEN-2", "SHOP-3": "TOKEN-2"}
+
+
+def payment(shop_id: str, day: int) -> dict:
+    return {
+        "id": f"{shop_id}-{day}", "bill_id": "BILL", "status": "SUCCESS", "amount": 100, "commission": 4,
+        "currency_in": "RUB", "account_amount": 96, "account_currency_code": "RUB", "from_card": "220220******0000",
+        "created_at": f"2023-04-{day:02d} 10:00:00", "error_code": None, "error_message": None,
+    }
+
+
+class Session:
+    """
+    requests.Session that answers searches of a shop after a delay and records the peak number of
+    simultaneous requests of every token. Requests of the token in `failing` get 503 once.
+    """
+
+    def __init__(self, delay: float = 0.02, failing: str = None):
+        self.peak = {}
+        self._running = {}
+        self._delay = delay
+        self._failing = failing
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, headers: dict, data: bytes, timeout: float) -> requests.Response:
+        token = headers["Authorization"].split()[1]
+        with self._lock:
+            self._running[token] = self._running.get(token, 0) + 1
+            self.peak[token] = max(self.peak.get(token, 0), self._running[token])
+        if self._delay:
+            time.sleep(self._delay)
+        with self._lock:
+            self._running[token] -= 1
+
+        response = requests.Response()
+        response.status_code, response.elapsed = 200, datetime.timedelta(0)
+        if token == self._failing:
+            self._failing = None
+            response.status_code = 503
+        shop_id = json.loads(data)["shop_id"]
+        days = (2, 1) if shop_id == "SHOP-1" else (3,)
+        response._content = json.dumps({"success": True, "data": [payment(shop_id, day) for day in days]}).encode()
+        return response
+
+
+def test_each_token_is_limited_to_its_concurrency():
+    session = Session()
+    with CardlinkyPool(SHOPS, concurrency=1, session=session) as pool:
+        results = pool.map(lambda shop_id, client: [client.search_payment(shop_id) for _ in range(4)])
+
+    assert all(not isinstance(result, Exception) for result in results.values())
+    # SHOP-2 and SHOP-3 share TOKEN-2, so their requests never overlap
+    assert session.peak == {"TOKEN-1": 1, "TOKEN-2": 1}
+
+
+def test_slot_is_released_while_retry_waits(monkeypatch):
+    session, waiting = Session(delay=0, failing="TOKEN-2"), threading.Event()
+    released = []
+
+    with CardlinkyPool(SHOPS, concurrency=1, session=session, retry=Retry(total=1)) as pool:
+        def sleep(seconds: float) -> None:
+            # Another request of the token gets the slot while the first one waits for its retry
+            acquired = pool["SHOP-3"]._semaphore.acquire(blocking=False)
+            released.append(acquired)
+            if acquired:
+                pool["SHOP-3"]._semaphore.release()
+            waiting.set()
+
+        monkeypatch.setattr(cardlinky.time, "sleep", sleep)
+        assert len(pool["SHOP-2"].search_payment("SHOP-2")) == 1
+
+    assert waiting.is_set() and released == [True]
+
+
+def test_results_are_merged_by_creation_time():
+    with CardlinkyPool(SHOPS, session=Session(delay=0)) as pool:
+        results = pool.search_payment()
+
+    results["SHOP-3"] = ValueError("Shop is blocked")
+    payments, errors = merge(results)
+
+    assert [item.id for item in payments] == ["SHOP-1-1", "SHOP-1-2", "SHOP-2-3"]
+    assert errors == {"SHOP-3": results["SHOP-3"]}
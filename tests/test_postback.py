@@ -0,0 +1,43 @@
+import threading
+
+from cardlinky.cache import MemoryCache
+from cardlinky.postback import PostbackHandler, signature
+
+
+FORM = {
+    "Status": "SUCCESS",
+    "InvId": "BILL-1",
+    "OutSum": "100.00",
+    "Commission": "4.00",
+    "CurrencyIn": "RUB",
+    "TrsId": "PAYMENT-1",
+    "SignatureValue": signature("100.00", "BILL-1", "TOKEN"),
+}
+
+
+def test_concurrent_deliveries_are_handled_once():
+    # Two handlers over one store stand for two processes sharing a backend
+    store = MemoryCache()
+    handlers = [PostbackHandler("TOKEN", store=store), PostbackHandler("TOKEN", store=store)]
+    barrier, results = threading.Barrier(8), []
+
+    def deliver(handler: PostbackHandler) -> None:
+        barrier.wait(5)
+        results.append(handler.handle(FORM))
+
+    threads = [threading.Thread(target=deliver, args=(handlers[i % 2],)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert sum(result is not None for result in results) == 1
+
+
+def test_forgotten_postback_is_handled_again():
+    handler = PostbackHandler("TOKEN")
+    postback = handler.handle(FORM)
+
+    assert handler.handle(FORM) is None
+    handler.forget(postback)
+    assert handler.handle(FORM) == postback
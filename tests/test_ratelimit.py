@@ -0,0 +1,70 @@
+import pytest
+
+from cardlinky import ratelimit
+from cardlinky.ratelimit import RateLimiter
+
+
+class Clock:
+    """
+    Replaces time.monotonic and time.sleep of the limiter, sleeping moves the clock forward.
+    """
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(ratelimit.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_burst_is_sent_at_once(clock):
+    limiter = RateLimiter(rate=10, burst=3)
+
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.slept == []
+
+    limiter.acquire()
+    assert clock.slept == [pytest.approx(0.1)]
+
+
+def test_tokens_refill_with_time(clock):
+    limiter = RateLimiter(rate=4, burst=2)
+    limiter.acquire()
+    limiter.acquire()
+
+    clock.now += 0.25
+    limiter.acquire()
+    assert clock.slept == []
+
+    # Idle time does not refill more than the burst
+    clock.now += 10
+    for _ in range(2):
+        limiter.acquire()
+    assert clock.slept == []
+    limiter.acquire()
+    assert clock.slept == [pytest.approx(0.25)]
+
+
+def test_waiting_callers_are_spaced_by_rate(clock):
+    limiter = RateLimiter(rate=5)
+
+    # Each reservation goes further into debt, so callers that come at once wait 0, 0.2, 0.4 seconds
+    assert [limiter._reserve() for _ in range(3)] == [0.0, pytest.approx(0.2), pytest.approx(0.4)]
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        RateLimiter(0)
@@ -0,0 +1,100 @@
+import datetime
+
+import pytest
+
+from cardlinky import columnar, money
+from cardlinky.cardlinky import Cardlinky
+from cardlinky.reports import Report, ReportEngine, Aggregate, DIMENSIONS, SHOP, CURRENCY, STATUS, DAY, BIN
+
+
+DAY_1, DAY_2 = datetime.date(2023, 4, 1), datetime.date(2023, 4, 2)
+
+# (shop, currency, status, day, bin): count, amount and commission in minor units
+GROUPS = {
+    ("SHOP-1", "RUB", "SUCCESS", DAY_1, "220220"): (2, 20000, 800),
+    ("SHOP-1", "RUB", "FAIL", DAY_1, "220220"): (1, 5000, 0),
+    ("SHOP-1", "RUB", "NEW", DAY_2, "220220"): (4, 1000, 0),
+    ("SHOP-2", "RUB", "SUCCESS", DAY_2, "510000"): (1, 10010, 400),
+    ("SHOP-2", "USD", "DECLINED", DAY_2, "510000"): (3, 300, 0),
+    ("SHOP-2", "USD", "SUCCESS", DAY_2, "510000"): (1, 1000, 40),
+}
+
+
+def report() -> Report:
+    return Report(DIMENSIONS, {key: Aggregate(key[1], *totals) for key, totals in GROUPS.items()})
+
+
+def test_group_rolls_up_by_currency_first():
+    assert report().group(DAY) == {
+        ("RUB", DAY_1): Aggregate("RUB", 3, 25000, 800),
+        ("RUB", DAY_2): Aggregate("RUB", 5, 11010, 400),
+        ("USD", DAY_2): Aggregate("USD", 4, 1300, 40),
+    }
+    shops = report().group(SHOP, CURRENCY)
+    assert shops[("SHOP-2", "RUB")].amount == money.from_minor(10010, "RUB")
+
+
+def test_group_by_missing_dimension_raises():
+    with pytest.raises(ValueError):
+        Report((CURRENCY, DAY)).group(SHOP)
+
+
+def test_turnover_counts_successful_only():
+    assert report().turnover(SHOP) == {
+        ("RUB", "SHOP-1"): Aggregate("RUB", 2, 20000, 800),
+        ("RUB", "SHOP-2"): Aggregate("RUB", 1, 10010, 400),
+        ("USD", "SHOP-2"): Aggregate("USD", 1, 1000, 40),
+    }
+
+
+def test_success_rate_among_finished():
+    # NEW payments are not finished, DECLINED ones are
+    assert report().success_rate(BIN) == {
+        ("RUB", "220220"): pytest.approx(2 / 3),
+        ("RUB", "510000"): 1.0,
+        ("USD", "510000"): 0.25,
+    }
+    with pytest.raises(ValueError):
+        report().success_rate(STATUS)
+
+
+class Client(Cardlinky):
+    """
+    Client whose payment searches return fixed rows of a day and are counted.
+    """
+
+    def __init__(self, rows: dict):
+        super().__init__("TOKEN")
+        self.searches = []
+        self._rows = rows
+
+    def search_payment_columns(self, shop_id, start_date, finish_date) -> columnar.Columns:
+        self.searches.append(start_date)
+        return columnar.to_columns(self._rows.get(start_date, []), columnar.PAYMENT_SCHEMA)
+
+
+def payment(status: str, created_at: str, amount: float) -> dict:
+    return {
+        "id": "PAYMENT", "bill_id": "BILL", "status": status, "amount": amount, "commission": 0.4,
+        "currency_in": "RUB", "account_amount": amount, "account_currency_code": "RUB",
+        "from_card": "220220******1234", "created_at": created_at, "error_code": None, "error_message": None,
+    }
+
+
+def test_engine_folds_days_and_caches_closed_ones():
+    client = Client({
+        DAY_1: [payment("SUCCESS", "2023-04-01 10:00:00", 100.1), payment("FAIL", "2023-04-01 11:00:00", 5)],
+        DAY_2: [payment("SUCCESS", "2023-04-02 10:00:00", 0.3)],
+    })
+    engine = ReportEngine(client, ["SHOP-1"], dimensions=(STATUS, DAY))
+
+    first = engine.payments(DAY_1, DAY_2, today=DAY_2)
+    second = engine.payments(DAY_1, DAY_2, today=DAY_2)
+
+    assert first.groups == second.groups == {
+        ("RUB", "SUCCESS", DAY_1): Aggregate("RUB", 1, 10010, 40),
+        ("RUB", "FAIL", DAY_1): Aggregate("RUB", 1, 500, 40),
+        ("RUB", "SUCCESS", DAY_2): Aggregate("RUB", 1, 30, 40),
+    }
+    # Today is fetched every time, the closed day once
+    assert sorted(client.searches) == [DAY_1, DAY_2, DAY_2]
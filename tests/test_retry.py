@@ -0,0 +1,94 @@
+import datetime
+import email.utils
+
+import pytest
+import requests
+
+from cardlinky import cardlinky
+from cardlinky.retry import Retry
+
+
+class Session:
+    """
+    requests.Session that returns queued statuses, the last one for all further requests.
+    """
+
+    def __init__(self, *statuses: int, headers: dict = None):
+        self.methods = []
+        self._statuses = list(statuses)
+        self._headers = headers or {}
+
+    def request(self, method: str, **kwargs) -> requests.Response:
+        self.methods.append(method)
+        response = requests.Response()
+        response.status_code = self._statuses.pop(0) if len(self._statuses) > 1 else self._statuses[0]
+        response.headers.update(self._headers)
+        response._content = b'{"success": true, "balances": []}'
+        response.elapsed = datetime.timedelta(0)
+        return response
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list:
+    sleeps = []
+    monkeypatch.setattr(cardlinky.time, "sleep", sleeps.append)
+    return sleeps
+
+
+@pytest.mark.parametrize("attempt", range(8))
+def test_delay_has_full_jitter_under_cap(attempt, monkeypatch):
+    retry = Retry(backoff_factor=0.5, max_backoff=10)
+    cap = min(10, 0.5 * 2 ** attempt)
+
+    monkeypatch.setattr("random.uniform", lambda low, high: (low, high))
+    assert retry.delay(attempt) == (0, cap)
+    monkeypatch.undo()
+
+    for _ in range(100):
+        assert 0 <= retry.delay(attempt) <= cap
+
+
+def test_retry_after_in_seconds_is_used_and_capped():
+    retry = Retry(max_backoff=30)
+
+    assert retry.delay(0, "7") == 7
+    assert retry.delay(0, "120") == 30
+    assert retry.delay(0, "-1") == 0
+
+
+def test_retry_after_as_http_date():
+    date = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=20)
+
+    assert 15 < Retry().delay(0, email.utils.format_datetime(date, usegmt=True)) <= 20
+
+
+def test_invalid_retry_after_falls_back_to_backoff():
+    assert 0 <= Retry(backoff_factor=0.1).delay(0, "soon") <= 0.1
+
+
+def test_get_is_retried_on_retryable_status(sleeps):
+    session = Session(503, 429, 200, headers={"Retry-After": "2"})
+    client = cardlinky.Cardlinky("TOKEN", session=session, retry=Retry(total=3))
+
+    assert client.get_raw("merchant/balance", {}) == {"success": True, "balances": []}
+    assert session.methods == ["GET"] * 3
+    assert sleeps == [2, 2]
+
+
+def test_retries_stop_after_total(sleeps):
+    session = Session(503)
+    client = cardlinky.Cardlinky("TOKEN", session=session, retry=Retry(total=2))
+
+    assert client._send("GET", "merchant/balance", {}).status_code == 503
+    assert len(session.methods) == 3
+    assert len(sleeps) == 2
+
+
+def test_post_is_not_retried_by_default(sleeps):
+    session = Session(503, 200)
+    client = cardlinky.Cardlinky("TOKEN", session=session)
+
+    assert client._send("POST", "payout/personal/create", {}).status_code == 503
+    assert session.methods == ["POST"]
+    assert sleeps == []
+    assert not Retry().allows("post", 0) and Retry(methods=["GET", "POST"]).allows("post", 0)
@@ -0,0 +1,119 @@
+import time
+import asyncio
+import threading
+from typing import Callable
+
+import pytest
+
+from cardlinky.singleflight import SingleFlight, AsyncSingleFlight
+
+
+WAITERS = 8
+
+
+def run_threads(single_flight: SingleFlight, function: Callable[[], dict], release: threading.Event) -> list:
+    # Every thread stores its result or exception. The call is released once all threads have called do()
+    results, entered = [None] * WAITERS, threading.Barrier(WAITERS + 1)
+
+    def call(i: int) -> None:
+        entered.wait(5)
+        try:
+            results[i] = single_flight.do("KEY", function)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(WAITERS)]
+    for thread in threads:
+        thread.start()
+    entered.wait(5)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_calls_are_coalesced():
+    single_flight, release = SingleFlight(), threading.Event()
+    calls = []
+
+    def function() -> dict:
+        calls.append(1)
+        release.wait(5)
+        return {"balances": []}
+
+    results = run_threads(single_flight, function, release)
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_error_reaches_every_waiter():
+    single_flight, release = SingleFlight(), threading.Event()
+    error = ConnectionError("Connection refused")
+
+    def function() -> dict:
+        release.wait(5)
+        raise error
+
+    results = run_threads(single_flight, function, release)
+
+    assert results == [error] * WAITERS
+
+
+def test_next_call_after_finish_runs_again():
+    single_flight, calls = SingleFlight(), []
+
+    for i in range(2):
+        assert single_flight.do("KEY", lambda: calls.append(i) or i) == i
+    assert calls == [0, 1]
+
+
+def test_async_concurrent_calls_are_coalesced():
+    single_flight, calls = AsyncSingleFlight(), []
+
+    async def function() -> dict:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"balances": []}
+
+    async def run() -> list:
+        return await asyncio.gather(*(single_flight.do("KEY", function) for _ in range(WAITERS)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert not single_flight._calls
+
+
+def test_async_error_reaches_every_waiter():
+    single_flight, error = AsyncSingleFlight(), ConnectionError("Connection refused")
+
+    async def function() -> dict:
+        await asyncio.sleep(0.01)
+        raise error
+
+    async def run() -> list:
+        return await asyncio.gather(*(single_flight.do("KEY", function) for _ in range(WAITERS)),
+                                    return_exceptions=True)
+
+    assert asyncio.run(run()) == [error] * WAITERS
+
+
+def test_async_cancelled_waiter_does_not_cancel_call():
+    single_flight = AsyncSingleFlight()
+
+    async def function() -> str:
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run() -> str:
+        first = asyncio.ensure_future(single_flight.do("KEY", function))
+        second = asyncio.ensure_future(single_flight.do("KEY", function))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "done"
@@ -0,0 +1,36 @@
+from cardlinky.sync import SQLiteStore, PAYMENTS
+
+
+PAYMENT = {
+    "id": "PAYMENT-1",
+    "bill_id": "BILL-1",
+    "status": "PROCESS",
+    "amount": 100.0,
+    "commission": 4.0,
+    "currency_in": "RUB",
+    "account_amount": 96.0,
+    "account_currency_code": "RUB",
+    "from_card": "220220******1234",
+    "created_at": "2023-04-01 10:00:00",
+    "error_code": 12,
+    "error_message": "Insufficient funds",
+}
+
+
+def test_status_response_keeps_fields_it_does_not_return():
+    store = SQLiteStore()
+    store.upsert(PAYMENTS, [PAYMENT])
+
+    # payment/status returns no error fields, but has a success flag that is not stored
+    status = {key: value for key, value in PAYMENT.items() if not key.startswith("error_")}
+    store.upsert(PAYMENTS, [{**status, "status": "FAIL", "success": True}])
+
+    assert store.select(PAYMENTS) == [{**PAYMENT, "status": "FAIL"}]
+
+
+def test_search_rows_replace_all_fields():
+    store = SQLiteStore()
+    store.upsert(PAYMENTS, [PAYMENT])
+    store.upsert(PAYMENTS, [{**PAYMENT, "status": "SUCCESS", "error_code": None, "error_message": None}])
+
+    assert store.select(PAYMENTS) == [{**PAYMENT, "status": "SUCCESS", "error_code": None, "error_message": None}]
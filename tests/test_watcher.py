@@ -0,0 +1,48 @@
+import types
+
+from cardlinky.cardlinky import CardlinkyAPIError
+from cardlinky.types.enums.status import Status
+from cardlinky.watcher import StatusWatcher, PAYMENT
+
+
+class Client:
+    """
+    Returns queued statuses of payments, or raises queued errors.
+    """
+
+    def __init__(self, *results):
+        self._results = list(results)
+
+    def get_payment_status(self, payment_id):
+        result = self._results.pop(0) if len(self._results) > 1 else self._results[0]
+        if isinstance(result, Exception):
+            raise result
+        return types.SimpleNamespace(id=payment_id, status=result)
+
+
+def test_errors_are_reported_and_object_is_dropped():
+    error = CardlinkyAPIError("Payment not found")
+    received = []
+    watcher = StatusWatcher(Client(error), received.append, min_interval=0, max_interval=0, max_errors=3)
+    watcher.watch(PAYMENT, "PAYMENT-1")
+
+    transitions = list(watcher.transitions())
+
+    assert [transition.error for transition in transitions] == [error] * 3
+    assert transitions[0].status is None and transitions[0].result is None
+    assert received == transitions
+    assert len(watcher) == 0
+
+
+def test_success_resets_error_count():
+    error = CardlinkyAPIError("Temporary error")
+    client = Client(error, error, Status.PROCESS, error, error, Status.SUCCESS)
+    watcher = StatusWatcher(client, min_interval=0, max_interval=0, max_errors=3)
+    watcher.watch(PAYMENT, "PAYMENT-1")
+
+    transitions = list(watcher.transitions())
+
+    assert [(transition.status, transition.error is not None) for transition in transitions] == [
+        (None, True), (None, True), (Status.PROCESS, False), (Status.PROCESS, True), (Status.PROCESS, True),
+        (Status.SUCCESS, False),
+    ]